@@ -4,22 +4,18 @@ Handles intelligent conversations with Google Gemini or local Ollama
 """
 
 import os
+import queue
+import threading
+import time
 import webbrowser
+from contextlib import nullcontext
 from datetime import datetime
 from config import Config
+from voice.stats import LatencyStats
+from tracing import get_tracer
+from metrics import LLM_LATENCY, LLM_FIRST_TOKEN, PROVIDER_REQUESTS
 
-# Try importing AI providers
-try:
-    import google.generativeai as genai
-    GEMINI_AVAILABLE = True
-except:
-    GEMINI_AVAILABLE = False
-
-try:
-    import ollama
-    OLLAMA_AVAILABLE = True
-except:
-    OLLAMA_AVAILABLE = False
+FALLBACK_GREETING = "Good day, sir. JARVIS is online and ready to assist."
 
 
 class JarvisAI:
@@ -29,6 +25,11 @@ class JarvisAI:
         """Initialize AI based on configured provider"""
         self.provider = Config.AI_PROVIDER
         self.conversation_history = []
+        self.response_latency = LatencyStats()  # provider round-trip per reply
+        self.first_token_latency = LatencyStats()  # streaming only
+        # Calls that read and extend the conversation (history / Gemini chat session) take turns;
+        # stateless ones (pre-generated greetings) run alongside them
+        self._conversation_lock = threading.Lock()
         
         # System prompt for JARVIS personality
         self.system_prompt = """You are JARVIS, an advanced AI assistant inspired by Iron Man's AI companion.
@@ -53,20 +54,26 @@ When the user asks to open something or execute a command, acknowledge it briefl
             self._init_ollama()
         elif self.provider == "gemini":
             self._init_gemini()
+        elif self.provider == "fake":
+            self._init_fake()
         else:
             raise ValueError(f"Unknown AI provider: {self.provider}")
     
     def _init_ollama(self):
         """Initialize Ollama local AI"""
-        if not OLLAMA_AVAILABLE:
+        # Provider SDKs are slow to import, so only the configured one is loaded
+        try:
+            import ollama
+        except ImportError:
             raise ImportError("Ollama package not installed. Run: pip install ollama")
         
         self.model = Config.OLLAMA_MODEL
-        print(f"✅ Using Ollama with model: {self.model}")
+        self.client = ollama.Client(host=Config.OLLAMA_BASE_URL, timeout=Config.OLLAMA_TIMEOUT)
+        print(f"✅ Using Ollama with model: {self.model} ({Config.OLLAMA_BASE_URL})")
         
         # Test connection
         try:
-            ollama.chat(
+            self.client.chat(
                 model=self.model,
                 messages=[{"role": "user", "content": "Hi"}],
                 options={"num_predict": 10}
@@ -79,7 +86,9 @@ When the user asks to open something or execute a command, acknowledge it briefl
     
     def _init_gemini(self):
         """Initialize Google Gemini"""
-        if not GEMINI_AVAILABLE:
+        try:
+            import google.generativeai as genai
+        except ImportError:
             raise ImportError("google-generativeai not installed")
         
         if not Config.GEMINI_API_KEY:
@@ -99,41 +108,64 @@ When the user asks to open something or execute a command, acknowledge it briefl
         self.chat.send_message(self.system_prompt)
         print(f"✅ Using Google Gemini: {Config.AI_MODEL}")
     
-    def process_command(self, user_input):
+    def _init_fake(self):
+        """Initialize the offline fake provider (canned replies for replay and tests)"""
+        self.model = "fake"
+        print("✅ Using fake AI provider (offline)")
+    
+    def process_command(self, user_input, on_chunk=None):
         """
         Process user input - detect if it's a system command or conversation
         
+        Args:
+            user_input: What the user said
+            on_chunk: Optional callable(text) fed response chunks as they stream in
+        
         Returns:
             tuple: (response_text, command_executed)
         """
         user_input_lower = user_input.lower().strip()
         
         # Check for system commands first
-        command_executed = self._execute_system_command(user_input_lower)
+        with get_tracer().span("intent_match") as span:
+            command_executed = self._execute_system_command(user_input_lower)
+            span.set(matched=command_executed)
         
         # Get AI response
         try:
             if command_executed:
                 # Command was executed, get brief confirmation from AI
                 prompt = f"User said: '{user_input}'. I've executed the command. Give a brief 1-sentence confirmation."
-                response = self._get_ai_response(prompt)
+                response = self._get_ai_response(prompt, on_chunk)
                 return response, True
             else:
                 # Regular conversation
-                response = self._get_ai_response(user_input)
+                response = self._get_ai_response(user_input, on_chunk)
                 return response, False
         except Exception as e:
             print(f"AI response error: {e}")
             return f"I apologize, sir. I encountered an error: {str(e)}", False
     
-    def _get_ai_response(self, prompt):
+    def _get_ai_response(self, prompt, on_chunk=None, remember=True):
         """Get response from configured AI provider"""
-        if self.provider == "ollama":
-            return self._get_ollama_response(prompt)
-        elif self.provider == "gemini":
-            return self._get_gemini_response(prompt)
+        started = time.monotonic()
+        try:
+            with self._conversation_lock if remember else nullcontext():
+                with get_tracer().span("llm", provider=self.provider):
+                    if self.provider == "ollama":
+                        response = self._get_ollama_response(prompt, on_chunk, remember)
+                    elif self.provider == "gemini":
+                        response = self._get_gemini_response(prompt, remember)
+                    elif self.provider == "fake":
+                        response = self._get_fake_response(prompt, remember)
+        except Exception:
+            PROVIDER_REQUESTS.inc(provider=self.provider, outcome="error")
+            raise
+        PROVIDER_REQUESTS.inc(provider=self.provider, outcome="ok")
+        LLM_LATENCY.observe(time.monotonic() - started, provider=self.provider)
+        return response
     
-    def _get_ollama_response(self, prompt):
+    def _get_ollama_response(self, prompt, on_chunk=None, remember=True):
         """Get response from Ollama"""
         # Build messages with history
         messages = [{"role": "system", "content": self.system_prompt}]
@@ -146,28 +178,67 @@ When the user asks to open something or execute a command, acknowledge it briefl
         messages.append({"role": "user", "content": prompt})
         
         # Get response
-        response = ollama.chat(
-            model=self.model,
-            messages=messages,
-            options={
-                "temperature": Config.AI_TEMPERATURE,
-                "num_predict": Config.AI_MAX_TOKENS
-            }
-        )
-        
-        response_text = response['message']['content']
+        options = {
+            "temperature": Config.AI_TEMPERATURE,
+            "num_predict": Config.AI_MAX_TOKENS
+        }
+        started = time.monotonic()
+        if Config.OLLAMA_STREAM:
+            parts = []
+            for chunk in self.client.chat(model=self.model, messages=messages, options=options, stream=True):
+                content = chunk['message']['content']
+                if content and not any(parts):
+                    first_token = time.monotonic() - started
+                    self.first_token_latency.record(first_token)
+                    LLM_FIRST_TOKEN.observe(first_token, provider=self.provider)
+                    get_tracer().current().mark("ttft")
+                parts.append(content)
+                if content and on_chunk:
+                    on_chunk(content)
+            response_text = "".join(parts)
+        else:
+            response = self.client.chat(model=self.model, messages=messages, options=options)
+            response_text = response['message']['content']
+        self.response_latency.record(time.monotonic() - started)
         
         # Update history
-        self.conversation_history.append({"role": "user", "content": prompt})
-        self.conversation_history.append({"role": "assistant", "content": response_text})
+        if remember:
+            self._remember(prompt, response_text)
         
         return response_text
     
-    def _get_gemini_response(self, prompt):
-        """Get response from Gemini"""
-        response = self.chat.send_message(prompt)
+    def _get_gemini_response(self, prompt, remember=True):
+        """Get response from Gemini (outside the chat session unless remembered)"""
+        if remember:
+            response = self.chat.send_message(prompt)
+            # Keep the system prompt exchange plus the most recent turns
+            history = self.chat.history
+            if len(history) > 2 + Config.CONVERSATION_HISTORY_LIMIT:
+                self.chat.history = history[:2] + history[-Config.CONVERSATION_HISTORY_LIMIT:]
+        else:
+            response = self.model.generate_content([self.system_prompt, prompt])
         return response.text
     
+    def _get_fake_response(self, prompt, remember=True):
+        """Get a deterministic reply without any model"""
+        if Config.FAKE_PROVIDER_LATENCY > 0:
+            time.sleep(Config.FAKE_PROVIDER_LATENCY)
+        
+        if prompt.startswith("User said:"):
+            response_text = "Right away, sir."
+        else:
+            response_text = f"Certainly, sir. You asked: {prompt}"
+        
+        if remember:
+            self._remember(prompt, response_text)
+        return response_text
+    
+    def _remember(self, prompt, response_text):
+        """Add an exchange to the history, keeping only what the next prompt can use (lock held by caller)"""
+        self.conversation_history.append({"role": "user", "content": prompt})
+        self.conversation_history.append({"role": "assistant", "content": response_text})
+        del self.conversation_history[:-Config.CONVERSATION_HISTORY_LIMIT]
+    
     def _execute_system_command(self, command):
         """
         Execute system commands based on user input
@@ -209,15 +280,69 @@ When the user asks to open something or execute a command, acknowledge it briefl
     
     def reset_conversation(self):
         """Reset conversation history"""
-        self.conversation_history = []
-        if self.provider == "gemini":
-            self.chat = self.model.start_chat(history=[])
-            self.chat.send_message(self.system_prompt)
+        with self._conversation_lock:
+            self.conversation_history = []
+            if self.provider == "gemini":
+                self.chat = self.model.start_chat(history=[])
+                self.chat.send_message(self.system_prompt)
     
-    def get_greeting(self):
-        """Get AI greeting message"""
+    def get_greeting(self, remember=True):
+        """
+        Get AI greeting message
+        
+        Args:
+            remember: Keep the exchange in the conversation history / chat session
+                      (False makes a stateless call that can run alongside a reply)
+        """
         try:
-            response = self._get_ai_response("Greet the user as JARVIS when the system starts. Keep it to 1 sentence.")
+            response = self._get_ai_response("Greet the user as JARVIS when the system starts. Keep it to 1 sentence.",
+                                             remember=remember)
             return response
         except:
-            return "Good day, sir. JARVIS is online and ready to assist."
+            return FALLBACK_GREETING
+
+
+class GreetingPool:
+    """Greetings generated ahead of time in the background, so showing JARVIS never waits on the model"""
+    
+    def __init__(self, brain, size=None):
+        """
+        Args:
+            brain: JarvisAI used to generate greetings
+            size: Greetings kept ready (defaults to Config.GREETING_POOL_SIZE)
+        """
+        self.brain = brain
+        self.size = size or Config.GREETING_POOL_SIZE
+        self._greetings = queue.Queue(maxsize=self.size)
+        self._refill = threading.Event()
+        self._thread = None
+    
+    def start(self):
+        """Start filling the pool (idempotent)"""
+        if self._thread is None:
+            self._refill.set()
+            self._thread = threading.Thread(target=self._run, name="greeting-pool", daemon=True)
+            self._thread.start()
+        return self
+    
+    def _run(self):
+        while True:
+            self._refill.wait()
+            self._refill.clear()
+            while not self._greetings.full():
+                # Keep pre-generated greetings out of the conversation history
+                self._greetings.put(self.brain.get_greeting(remember=False))
+    
+    def take(self):
+        """
+        Get a greeting without blocking
+        
+        Returns:
+            str: A pre-generated greeting, or the fallback if the pool is empty
+        """
+        try:
+            return self._greetings.get_nowait()
+        except queue.Empty:
+            return FALLBACK_GREETING
+        finally:
+            self._refill.set()
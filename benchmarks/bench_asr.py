@@ -0,0 +1,86 @@
+"""
+JARVIS ASR Latency Benchmark
+Measures per-utterance recognition latency of each speech backend
+
+Usage:
+    python -m benchmarks.bench_asr recording1.wav recording2.wav --backends stub vosk google
+"""
+
+import argparse
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import speech_recognition as sr
+from voice.recognizers import create_recognizer, UnknownSpeechError, RecognitionServiceError
+
+
+def load_wav(path):
+    """Load a WAV file as AudioData"""
+    with sr.AudioFile(path) as source:
+        return sr.Recognizer().record(source)
+
+
+def _ms(seconds):
+    """Format seconds as a millisecond column"""
+    return f"{seconds * 1000:9.1f}" if seconds is not None else f"{'-':>9}"
+
+
+def run(backend, clips, repeats):
+    """
+    Benchmark one backend
+    
+    Returns:
+        dict: Backend name, load time and latency summary
+    """
+    start = time.perf_counter()
+    try:
+        recognizer = create_recognizer(backend)
+    except Exception as e:
+        return {"backend": backend, "error": str(e)}
+    load_time = time.perf_counter() - start
+    
+    failures = 0
+    for _ in range(repeats):
+        for audio in clips:
+            try:
+                recognizer.recognize(audio)
+            except (UnknownSpeechError, RecognitionServiceError):
+                failures += 1
+    
+    return {
+        "backend": backend,
+        "load": load_time,
+        "failures": failures,
+        **recognizer.latency.summary(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark JARVIS ASR backends")
+    parser.add_argument("wavs", nargs="+", help="WAV recordings to transcribe")
+    parser.add_argument("--backends", nargs="+", default=["stub", "vosk", "google"])
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+    
+    clips = [load_wav(path) for path in args.wavs]
+    audio_seconds = sum(len(c.frame_data) / (c.sample_rate * c.sample_width) for c in clips)
+    print(f"{len(clips)} clip(s), {audio_seconds:.1f}s of audio, {args.repeats} repeat(s)\n")
+    
+    print("Latencies in milliseconds")
+    print(f"{'backend':<10}{'load':>9}{'mean':>9}{'p50':>9}{'p95':>9}{'max':>9}{'fail':>6}")
+    for backend in args.backends:
+        result = run(backend, clips, args.repeats)
+        if "error" in result:
+            print(f"{backend:<10}  unavailable: {result['error']}")
+            continue
+        print(
+            f"{backend:<10}{_ms(result['load'])}{_ms(result['mean'])}{_ms(result['p50'])}"
+            f"{_ms(result['p95'])}{_ms(result['max'])}{result['failures']:>6}"
+        )
+
+
+if __name__ == "__main__":
+    main()
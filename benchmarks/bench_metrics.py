@@ -0,0 +1,90 @@
+"""
+JARVIS Metrics Benchmark
+Measures the cost of recording a counter increment and a histogram
+observation (single thread and contended) against a plain locked counter
+
+Usage:
+    python -m benchmarks.bench_metrics
+    python -m benchmarks.bench_metrics --ops 500000 --threads 1,4,16
+"""
+
+import argparse
+import sys
+import os
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from metrics import MetricsRegistry
+
+
+class LockedCounter:
+    """Baseline: one shared dict behind a lock"""
+    
+    def __init__(self):
+        self.values = {}
+        self.lock = threading.Lock()
+    
+    def inc(self, amount=1, **labels):
+        key = (self, *map(labels.get, ("route",)))
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+
+def run(record, threads, ops):
+    """
+    Call ``record`` ops times spread over ``threads`` threads
+    
+    Returns:
+        float: Nanoseconds per call (wall clock / total calls)
+    """
+    per_thread = ops // threads
+    barrier = threading.Barrier(threads + 1)
+    
+    def worker():
+        barrier.wait()
+        for index in range(per_thread):
+            record(index)
+    
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in workers:
+        thread.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    return (time.perf_counter() - started) / (per_thread * threads) * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark metric recording overhead")
+    parser.add_argument("--ops", type=int, default=200000, help="Calls per measurement")
+    parser.add_argument("--threads", default="1,4,16", help="Comma separated thread counts")
+    args = parser.parse_args()
+    
+    registry = MetricsRegistry()
+    counter = registry.counter("bench_total", "Benchmark counter", ("route",))
+    histogram = registry.histogram("bench_seconds", "Benchmark histogram", ("route",))
+    locked = LockedCounter()
+    cases = [
+        ("locked dict", lambda i: locked.inc(route="/api/command")),
+        ("counter.inc", lambda i: counter.inc(route="/api/command")),
+        ("histogram.observe", lambda i: histogram.observe((i % 1000) / 1000.0, route="/api/command")),
+    ]
+    
+    levels = [int(level) for level in args.threads.split(",")]
+    print("Nanoseconds per call")
+    print(f"{'case':<20}" + "".join(f"{f'{level} thr':>10}" for level in levels))
+    for name, record in cases:
+        print(f"{name:<20}" + "".join(f"{run(record, level, args.ops):10.0f}" for level in levels))
+    
+    # Shards of finished threads must have been merged, not lost
+    expected = sum(args.ops // level * level for level in levels)
+    total = registry.value(counter, route="/api/command")
+    print(f"\n{'✅' if total == expected else '❌'} Counter total {total} of {expected} calls")
+    print(f"✅ Scrape: {len(registry.render().splitlines())} lines")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+JARVIS Audio Preprocessing Benchmark
+Runs a recording through the preprocessing stage utterance by utterance and
+reports throughput as a real-time factor (processing time / audio time)
+
+Usage:
+    python -m benchmarks.bench_preprocess session.wav
+    python -m benchmarks.bench_preprocess session_44k_stereo.wav --utterance 3 --repeat 20
+"""
+
+import argparse
+import sys
+import os
+import wave
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from voice.preprocess import AudioPreprocessor
+
+
+def _ms(seconds):
+    return f"{seconds * 1000:.2f} ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the JARVIS audio preprocessing stage")
+    parser.add_argument("recording", help="16-bit WAV (any sample rate, mono or stereo)")
+    parser.add_argument("--utterance", type=float, default=4.0, help="Seconds of audio per call")
+    parser.add_argument("--repeat", type=int, default=10, help="Passes over the recording")
+    parser.add_argument("--threshold", type=float, default=Config.NOISE_DEFAULT_THRESHOLD,
+                        help="Fixed noise gate threshold (RMS)")
+    args = parser.parse_args()
+    
+    with wave.open(args.recording, "rb") as wav:
+        if wav.getsampwidth() != 2:
+            parser.error("expected a 16-bit WAV")
+        channels = wav.getnchannels()
+        sample_rate = wav.getframerate()
+        samples = np.frombuffer(wav.readframes(wav.getnframes()), dtype=np.int16)
+    
+    preprocessor = AudioPreprocessor(noise_threshold=lambda: args.threshold)
+    block = int(args.utterance * sample_rate) * channels
+    blocks = [samples[i:i + block] for i in range(0, samples.size, block)]
+    duration = samples.size / channels / sample_rate
+    
+    # Copying path: any rate / channel count, output at the ASR rate
+    out_samples = 0
+    for _ in range(args.repeat):
+        for chunk in blocks:
+            out_samples += preprocessor.process_samples(chunk, sample_rate, channels).size
+    copy_rtf = preprocessor.real_time_factor
+    copy_worst = preprocessor.latency.summary()["max"]
+    
+    print(f"Audio:        {duration:.1f}s, {sample_rate} Hz, {channels} channel(s), "
+          f"{len(blocks)} x {args.utterance:.1f}s utterances, {args.repeat} passes")
+    print(f"Output:       {preprocessor.target_rate} Hz mono, "
+          f"{out_samples / args.repeat / preprocessor.target_rate:.1f}s after trimming")
+    print(f"Copy path:    RTF {copy_rtf:.5f} ({1 / copy_rtf:,.0f}x real time), worst call {_ms(copy_worst)}")
+    
+    # In-place path: capture-rate mono audio cleaned up inside its own buffer
+    if channels == 1 and sample_rate == preprocessor.target_rate:
+        inplace = AudioPreprocessor(noise_threshold=lambda: args.threshold)
+        buffers = [bytearray(chunk.tobytes()) for chunk in blocks]
+        for _ in range(args.repeat):
+            for buffer, chunk in zip(buffers, blocks):
+                buffer[:] = chunk.tobytes()
+                inplace.process_buffer(buffer, sample_rate)
+        rtf = inplace.real_time_factor
+        print(f"In-place:     RTF {rtf:.5f} ({1 / rtf:,.0f}x real time), "
+              f"worst call {_ms(inplace.latency.summary()['max'])}")
+
+
+if __name__ == "__main__":
+    main()
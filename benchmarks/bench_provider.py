@@ -0,0 +1,159 @@
+"""
+JARVIS Provider Benchmark
+Measures JarvisAI's Ollama round-trip (and time to first token when
+streaming) at increasing concurrency. By default it runs against a bundled
+fake Ollama server, so results are offline and reproducible
+
+Usage:
+    python -m benchmarks.bench_provider
+    python -m benchmarks.bench_provider --concurrency 1,8,32 --ttft 0.3 --tokens-per-second 30
+    python -m benchmarks.bench_provider --url http://localhost:11434 --requests 20
+"""
+
+import argparse
+import json
+import sys
+import os
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from voice.stats import LatencyStats
+from tools.fake_ollama import FakeModel, FakeOllamaServer
+
+
+def _ms(seconds):
+    return f"{seconds * 1000:8.1f}" if seconds is not None else f"{'-':>8}"
+
+
+def _connect(attempts=5):
+    """Create a JarvisAI, retrying connection checks hit by injected errors"""
+    from ai_brain import JarvisAI
+    
+    for attempt in range(attempts):
+        try:
+            return JarvisAI()
+        except Exception:
+            if attempt == attempts - 1:
+                raise
+
+
+def run_level(concurrency, requests, warmup, stream):
+    """
+    Run one load level: ``concurrency`` clients, each with its own JarvisAI
+    
+    Returns:
+        dict: throughput, latency / TTFT summaries and error count
+    """
+    Config.OLLAMA_STREAM = stream
+    brains = [_connect() for _ in range(concurrency)]
+    for brain in brains:
+        for index in range(warmup):
+            try:
+                brain._get_ai_response(f"warm up {index}")
+            except Exception:
+                pass
+        brain.reset_conversation()
+        brain.response_latency = LatencyStats(window=requests)
+        brain.first_token_latency = LatencyStats(window=requests)
+    
+    latency = LatencyStats(window=requests)
+    first_token = LatencyStats(window=requests)
+    errors = []
+    remaining = [requests]
+    lock = threading.Lock()
+    
+    def client(brain):
+        while True:
+            with lock:
+                if remaining[0] <= 0:
+                    return
+                remaining[0] -= 1
+                index = remaining[0]
+            started = time.monotonic()
+            try:
+                brain._get_ai_response(f"benchmark question number {index}")
+                latency.record(time.monotonic() - started)
+            except Exception as e:
+                errors.append(str(e))
+    
+    threads = [threading.Thread(target=client, args=(brain,)) for brain in brains]
+    started = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - started
+    
+    for brain in brains:
+        for sample in brain.first_token_latency.samples():
+            first_token.record(sample)
+    return {
+        "concurrency": concurrency,
+        "stream": stream,
+        "requests": requests,
+        "errors": len(errors),
+        "seconds": elapsed,
+        "throughput": latency.count / elapsed if elapsed else 0.0,
+        "latency": latency.summary(),
+        "first_token": first_token.summary(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the JARVIS Ollama provider")
+    parser.add_argument("--url", help="Existing Ollama server (default: start a fake one)")
+    parser.add_argument("--concurrency", default="1,4,16", help="Comma separated client counts")
+    parser.add_argument("--requests", type=int, default=50, help="Requests per level")
+    parser.add_argument("--warmup", type=int, default=1, help="Warm-up requests per client")
+    parser.add_argument("--mode", choices=["both", "stream", "plain"], default="both")
+    parser.add_argument("--ttft", type=float, default=0.15, help="Fake server time to first token")
+    parser.add_argument("--tokens-per-second", type=float, default=50.0, help="Fake server token rate")
+    parser.add_argument("--reply-tokens", type=int, default=24, help="Fake server reply length")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fake server HTTP 500 rate")
+    parser.add_argument("--stream-error-rate", type=float, default=0.0, help="Fake server mid-stream failure rate")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+    
+    server = None
+    if args.url:
+        Config.OLLAMA_BASE_URL = args.url
+    else:
+        model = FakeModel(Config.OLLAMA_MODEL, args.ttft, args.tokens_per_second, args.reply_tokens,
+                          args.error_rate, args.stream_error_rate)
+        server = FakeOllamaServer(model).start()
+        Config.OLLAMA_BASE_URL = server.url
+    Config.AI_PROVIDER = "ollama"
+    
+    modes = {"both": [False, True], "stream": [True], "plain": [False]}[args.mode]
+    levels = [int(level) for level in args.concurrency.split(",")]
+    results = []
+    try:
+        for stream in modes:
+            for concurrency in levels:
+                results.append(run_level(concurrency, args.requests, args.warmup, stream))
+    finally:
+        if server:
+            server.stop()
+    
+    print(f"\nProvider: {Config.OLLAMA_BASE_URL} ({'fake' if server else 'real'} Ollama, model {Config.OLLAMA_MODEL})")
+    print("Latencies in milliseconds")
+    print(f"{'mode':<8}{'clients':>8}{'req/s':>8}{'errors':>8}{'p50':>9}{'p95':>9}{'p99':>9}{'ttft p50':>9}{'ttft p95':>9}")
+    for result in results:
+        latency, first = result["latency"], result["first_token"]
+        print(
+            f"{'stream' if result['stream'] else 'plain':<8}{result['concurrency']:>8}"
+            f"{result['throughput']:>8.1f}{result['errors']:>8} {_ms(latency['p50'])} {_ms(latency['p95'])}"
+            f" {_ms(latency['p99'])} {_ms(first['p50'])} {_ms(first['p95'])}"
+        )
+    
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"url": Config.OLLAMA_BASE_URL, "fake": server is not None, "results": results}, f, indent=2)
+        print(f"✅ Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
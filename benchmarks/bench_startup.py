@@ -0,0 +1,128 @@
+"""
+JARVIS Startup Benchmark
+Cold start time of main.py in fresh interpreters, with the per-phase and
+per-import breakdown from --profile-startup. Exits non-zero when the median
+cold start exceeds the budget, so it can run as a regression check
+
+Usage:
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --runs 10 --budget-ms 2500 --json startup.json
+    python -m benchmarks.bench_startup --imports-only    # no display / microphone needed
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from config import Config
+
+# Module-level cost of the entry point only: everything main.py imports before JarvisApp runs
+IMPORTS_ONLY = """
+import sys
+from startup import get_startup_profiler
+profiler = get_startup_profiler().enable()
+with profiler.phase("import main"):
+    import main
+profiler.finish()
+profiler.write_json(sys.argv[1])
+"""
+
+
+def run_once(imports_only, env):
+    """
+    Start JARVIS in a fresh interpreter
+    
+    Returns:
+        dict: Wall time (ms, includes interpreter start) and the startup profile
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        profile_path = os.path.join(tmp, "profile.json")
+        if imports_only:
+            command = [sys.executable, "-c", IMPORTS_ONLY, profile_path]
+        else:
+            command = [sys.executable, "main.py", "--exit-after-startup", "--profile-json", profile_path]
+        started = time.perf_counter()
+        result = subprocess.run(command, cwd=ROOT, env=env, stdin=subprocess.DEVNULL,
+                                stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, timeout=120)
+        wall = time.perf_counter() - started
+        if result.returncode != 0 or not os.path.exists(profile_path):
+            sys.exit(f"❌ Startup failed (exit {result.returncode}):\n{result.stdout[-2000:]}")
+        with open(profile_path) as f:
+            profile = json.load(f)
+    return {"wall_ms": wall * 1000, "profile": profile}
+
+
+def summarize(runs):
+    """Median wall time, median per phase and the imports that were slowest on average"""
+    phases = {}
+    for run in runs:
+        for phase in run["profile"]["phases"]:
+            phases.setdefault(phase["name"], []).append(phase["ms"])
+    imports = {}
+    for run in runs:
+        for entry in run["profile"]["imports"]:
+            imports.setdefault(entry["module"], []).append(entry["self_ms"])
+    slowest = sorted(imports.items(), key=lambda item: sum(item[1]) / len(runs), reverse=True)[:15]
+    return {
+        "wall_ms": statistics.median(run["wall_ms"] for run in runs),
+        "profiled_ms": statistics.median(run["profile"]["total_ms"] for run in runs),
+        "phases": {name: statistics.median(values) for name, values in phases.items()},
+        "imports": {module: sum(values) / len(runs) for module, values in slowest},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark JARVIS cold start")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters to start")
+    parser.add_argument("--budget-ms", type=float, default=Config.STARTUP_BUDGET_MS,
+                        help="Fail if the median cold start takes longer")
+    parser.add_argument("--provider", default="fake", help="AI_PROVIDER for the runs (fake needs no model)")
+    parser.add_argument("--imports-only", action="store_true",
+                        help="Only time importing main.py (no window, microphone or hotkey)")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+    
+    env = dict(os.environ, AI_PROVIDER=args.provider, PYTHONDONTWRITEBYTECODE="1")
+    xvfb = None
+    if not args.imports_only:
+        from benchmarks.bench_widgets import start_xvfb
+        xvfb = start_xvfb()
+        env["DISPLAY"] = os.environ["DISPLAY"]
+    try:
+        runs = [run_once(args.imports_only, env) for _ in range(args.runs)]
+    finally:
+        if xvfb:
+            xvfb.terminate()
+    summary = summarize(runs)
+    
+    mode = "import main" if args.imports_only else "main.py --exit-after-startup"
+    print(f"\nCold start of {mode} over {args.runs} runs (median)")
+    print(f"{'wall (incl. interpreter)':<32}{summary['wall_ms']:10.1f} ms")
+    print(f"{'profiled startup':<32}{summary['profiled_ms']:10.1f} ms")
+    for name, ms in summary["phases"].items():
+        print(f"  {name:<30}{ms:10.1f} ms")
+    print("\nSlowest imports (mean self time)")
+    for module, ms in summary["imports"].items():
+        print(f"  {module:<40}{ms:10.1f} ms")
+    
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"mode": mode, "budget_ms": args.budget_ms, "summary": summary, "runs": runs}, f, indent=2)
+        print(f"✅ Results written to {args.json}")
+    
+    if summary["wall_ms"] > args.budget_ms:
+        print(f"\n❌ Cold start {summary['wall_ms']:.0f} ms exceeds the {args.budget_ms:.0f} ms budget")
+        sys.exit(1)
+    print(f"\n✅ Cold start {summary['wall_ms']:.0f} ms is within the {args.budget_ms:.0f} ms budget")
+
+
+if __name__ == "__main__":
+    main()
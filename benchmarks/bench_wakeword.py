@@ -0,0 +1,65 @@
+"""
+JARVIS Wake Word CPU Benchmark
+Streams a recording through the wake word spotter exactly like the live
+listener does and reports the CPU cost as a percentage of one core
+
+Usage:
+    python -m benchmarks.bench_wakeword session.wav --model models/wakeword/hey_jarvis.npz
+    python -m benchmarks.bench_wakeword session.wav --enroll hey1.wav hey2.wav hey3.wav
+"""
+
+import argparse
+import sys
+import os
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from voice.wakeword import WakeWordModel, WakeWordSpotter, read_wav
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the JARVIS wake word spotter")
+    parser.add_argument("recording", help="16 kHz mono WAV of a session (ambient audio + wake words)")
+    parser.add_argument("--model", default=Config.WAKEWORD_MODEL_PATH, help="Enrolled model (.npz)")
+    parser.add_argument("--enroll", nargs="+", help="Build the model from these WAVs instead")
+    parser.add_argument("--budget", type=float, default=5.0, help="Allowed CPU %% of one core")
+    args = parser.parse_args()
+    
+    samples, sample_rate = read_wav(args.recording)
+    if args.enroll:
+        model = WakeWordModel.enroll([read_wav(path)[0] for path in args.enroll], sample_rate)
+    else:
+        model = WakeWordModel.load(args.model)
+    
+    # Fixed speech threshold from the quiet part of the recording, like a settled noise tracker
+    spotter = WakeWordSpotter(model, sample_rate)
+    energy = spotter.vad.frame_energy(samples)
+    threshold = max(Config.NOISE_MIN_THRESHOLD, np.percentile(energy, 20) * Config.NOISE_THRESHOLD_RATIO)
+    spotter.noise_threshold = lambda: threshold
+    
+    block = spotter.vad.frame_len * Config.VAD_BATCH_FRAMES
+    detections = []
+    worst = 0.0
+    cpu_start = time.process_time()
+    for start in range(0, samples.size - block + 1, block):
+        t0 = time.perf_counter()
+        if spotter.process(samples[start:start + block]):
+            detections.append((start + block) / sample_rate)
+        worst = max(worst, time.perf_counter() - t0)
+    cpu = time.process_time() - cpu_start
+    
+    duration = samples.size / sample_rate
+    usage = cpu / duration * 100
+    print(f"Audio:        {duration:.1f}s ({len(model.templates)} template(s), threshold {model.threshold:.2f})")
+    print(f"CPU time:     {cpu * 1000:.1f} ms")
+    print(f"CPU usage:    {usage:.2f}% of one core (budget {args.budget:.1f}%)")
+    print(f"Worst block:  {worst * 1000:.2f} ms per {block / sample_rate * 1000:.0f} ms of audio")
+    print(f"Detections:   {', '.join(f'{t:.2f}s' for t in detections) or 'none'}")
+    sys.exit(0 if usage <= args.budget else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+JARVIS Widget Rendering Benchmark
+Frame cost of ArcReactorWidget and WaveformWidget with retained canvas items
+(current) versus deleting and re-creating every item per frame (previous).
+Starts a headless Xvfb display when no DISPLAY is set
+
+Usage:
+    python -m benchmarks.bench_widgets
+    python -m benchmarks.bench_widgets --frames 1000 --json widgets.json
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from voice.stats import LatencyStats
+
+
+def start_xvfb(display=":99"):
+    """
+    Start Xvfb if there is no display
+    
+    Returns:
+        subprocess.Popen: The Xvfb process, or None if a display already exists
+    """
+    if os.environ.get("DISPLAY"):
+        return None
+    if not shutil.which("Xvfb"):
+        sys.exit("❌ No DISPLAY and Xvfb is not installed (apt install xvfb)")
+    process = subprocess.Popen(["Xvfb", display, "-screen", "0", "1024x768x24", "-nolisten", "tcp"],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    os.environ["DISPLAY"] = display
+    time.sleep(0.5)
+    return process
+
+
+def immediate_arc_reactor(widget):
+    """The previous ArcReactorWidget frame: delete everything and redraw"""
+    widget.delete("all")
+    intensity = widget.animation.get_pulse_intensity(Config.PULSE_SPEED)
+    glow_color = widget.animation.get_glow_color(Config.COLOR_GLOW, intensity)
+    c = widget.center
+    num_rings = Config.ARC_REACTOR_RINGS
+    for i in range(num_rings, 0, -1):
+        radius = (widget.size // 2 - 20) * (i / num_rings)
+        widget.create_oval(c - radius - 5, c - radius - 5, c + radius + 5, c + radius + 5,
+                           outline=glow_color, width=8, tags="glow")
+        widget.create_oval(c - radius, c - radius, c + radius, c + radius,
+                           outline=Config.COLOR_PRIMARY, width=3, tags="ring")
+    if widget.is_active:
+        radius = widget.size // 2 - 30
+        for i in range(3):
+            widget.create_arc(c - radius, c - radius, c + radius, c + radius,
+                              start=widget.angle + (i * 120), extent=80, outline=Config.COLOR_SECONDARY,
+                              width=2, style="arc", tags="rotating")
+    widget.create_oval(c - 10, c - 10, c + 10, c + 10, fill=Config.COLOR_PRIMARY,
+                       outline=glow_color, width=2, tags="center")
+
+
+def immediate_waveform(widget):
+    """The previous WaveformWidget frame: delete everything and redraw"""
+    widget.delete("all")
+    bar_heights = widget.waveform.update(widget.is_active)
+    bar_width = widget.width / widget.num_bars - 2
+    for i, height in enumerate(bar_heights):
+        x = i * (widget.width / widget.num_bars)
+        bar_height = height * (widget.height - 10)
+        y = (widget.height - bar_height) / 2
+        widget.create_rectangle(x, y, x + bar_width, y + bar_height,
+                                fill=widget.waveform.get_bar_color(height), outline="", tags=f"bar_{i}")
+
+
+def measure(root, widget, draw, frames, active):
+    """
+    Time ``frames`` frames of one widget, including Tk's redraw
+    
+    Returns:
+        dict: Frame cost summary (ms) and canvas item ids used
+    """
+    widget.set_active(active)
+    stats = LatencyStats(window=frames)
+    first_id = widget.create_line(0, 0, 0, 0)
+    for _ in range(frames):
+        started = time.perf_counter()
+        if hasattr(widget, "angle"):
+            widget.angle = widget.animation.update_arc_reactor()
+        draw(widget)
+        root.update_idletasks()
+        stats.record(time.perf_counter() - started)
+    last_id = widget.create_line(0, 0, 0, 0)
+    summary = stats.summary()
+    return {
+        "mean_ms": summary["mean"] * 1000,
+        "p95_ms": summary["p95"] * 1000,
+        "max_ms": summary["max"] * 1000,
+        "item_ids_used": last_id - first_id - 1,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark JARVIS canvas widget frame cost")
+    parser.add_argument("--frames", type=int, default=500, help="Frames per measurement")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+    
+    xvfb = start_xvfb()
+    try:
+        import tkinter as tk
+        from ui.widgets import ArcReactorWidget, WaveformWidget
+        
+        root = tk.Tk()
+        root.geometry(f"{Config.WINDOW_WIDTH}x{Config.WINDOW_HEIGHT}")
+        results = []
+        cases = [
+            ("arc_reactor", lambda: ArcReactorWidget(root, size=Config.ARC_REACTOR_SIZE),
+             ArcReactorWidget.draw_arc_reactor, immediate_arc_reactor),
+            ("waveform", lambda: WaveformWidget(root, width=400, height=80, num_bars=30),
+             WaveformWidget.draw_waveform, immediate_waveform),
+        ]
+        for name, create, retained, immediate in cases:
+            for mode, draw in (("immediate", immediate), ("retained", retained)):
+                widget = create()
+                widget.pack()
+                root.update()
+                for active in (False, True):
+                    result = measure(root, widget, draw, args.frames, active)
+                    results.append(dict(result, widget=name, mode=mode, active=active))
+                widget.destroy()
+        root.destroy()
+    finally:
+        if xvfb:
+            xvfb.terminate()
+    
+    print(f"\nFrame cost over {args.frames} frames (ms, includes Tk redraw)")
+    print(f"{'widget':<14}{'mode':<11}{'active':<8}{'mean':>8}{'p95':>8}{'max':>8}{'item ids':>10}")
+    for result in results:
+        print(f"{result['widget']:<14}{result['mode']:<11}{str(result['active']):<8}"
+              f"{result['mean_ms']:8.3f}{result['p95_ms']:8.3f}{result['max_ms']:8.3f}{result['item_ids_used']:>10}")
+    
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"frames": args.frames, "results": results}, f, indent=2)
+        print(f"✅ Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+JARVIS Voice Worker Benchmark
+Frame timing of a 20 FPS UI-style loop on the main thread while utterances are
+preprocessed and recognized back to back - in this process (VOICE_WORKERS=0)
+versus in the ASR worker process (VOICE_WORKERS=1) - plus the per-utterance
+cost of the shared memory / queue round trip. No display needed.
+The default load is the stub recognizer burning --asr-work-ms of CPU per
+utterance while holding the GIL, standing in for native model code
+
+Usage:
+    python -m benchmarks.bench_workers
+    python -m benchmarks.bench_workers --asr-work-ms 300
+    python -m benchmarks.bench_workers --backend vosk --seconds 10 --json workers.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import speech_recognition as sr
+from config import Config
+from voice.stats import LatencyStats
+from voice.recognizers import create_recognizer, UnknownSpeechError, RecognitionServiceError
+from voice.preprocess import get_preprocessor
+from voice.workers import RemoteRecognizer
+
+
+def make_utterance(seconds, sample_rate=16000):
+    """Speech-like test audio: a voiced tone burst between quiet noise"""
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    rng = np.random.default_rng(0)
+    envelope = ((t > seconds * 0.2) & (t < seconds * 0.8)).astype(np.float64)
+    voiced = np.sin(2 * np.pi * 180 * t) + 0.5 * np.sin(2 * np.pi * 360 * t)
+    samples = 6000 * envelope * voiced + 200 * rng.standard_normal(t.size)
+    return sr.AudioData(samples.astype(np.int16).tobytes(), sample_rate, 2)
+
+
+def frame_work(ms):
+    """Pure-Python work standing in for the widget ticks of one frame"""
+    deadline = time.perf_counter() + ms / 1000
+    x = 0
+    while time.perf_counter() < deadline:
+        x += 1
+    return x
+
+
+def run(mode, backend, audio, seconds, fps, work_ms):
+    """
+    Run the frame loop while one thread keeps recognizing
+    
+    Returns:
+        dict: Frame interval and utterance latency summaries (ms)
+    """
+    if mode == "workers":
+        recognizer = RemoteRecognizer(backend).load()
+        recognize = recognizer.recognize
+    else:
+        recognizer = create_recognizer(backend)
+        preprocessor = get_preprocessor()
+        
+        def recognize(clip):
+            return recognizer.recognize(preprocessor.process(clip) if preprocessor else clip)
+    recognize(audio)  # warm up (worker start-up, model load)
+    
+    stop = threading.Event()
+    utterances = LatencyStats(window=100000)
+    
+    def voice_load():
+        while not stop.is_set():
+            started = time.perf_counter()
+            try:
+                recognize(audio)
+            except (UnknownSpeechError, RecognitionServiceError):
+                pass
+            utterances.record(time.perf_counter() - started)
+    worker = threading.Thread(target=voice_load, daemon=True)
+    worker.start()
+    
+    # Frame loop on the frame grid, like ui.animations.FrameClock
+    frames = LatencyStats(window=100000)
+    interval = 1.0 / fps
+    end = time.perf_counter() + seconds
+    last = due = time.perf_counter()
+    while last < end:
+        due += interval
+        delay = due - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        now = time.perf_counter()
+        frames.record(now - last)
+        last = now
+        frame_work(work_ms)
+    
+    stop.set()
+    worker.join()
+    if mode == "workers":
+        recognizer.close()
+    return {"frames": _ms(frames.summary()), "utterances": _ms(utterances.summary())}
+
+
+def _ms(summary):
+    return {key: (round(value * 1000, 2) if key != "count" and value is not None else value)
+            for key, value in summary.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark UI frame timing with in-process vs worker ASR")
+    parser.add_argument("--backend", default="stub", help="ASR backend (default: stub)")
+    parser.add_argument("--asr-work-ms", type=float, default=150.0,
+                        help="CPU-bound work per utterance of the stub backend")
+    parser.add_argument("--seconds", type=float, default=5.0, help="Frame loop duration per mode")
+    parser.add_argument("--utterance", type=float, default=5.0, help="Length of the test utterance (s)")
+    parser.add_argument("--fps", type=int, default=Config.UI_ACTIVE_FPS)
+    parser.add_argument("--work-ms", type=float, default=2.0, help="Python work per frame")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+    
+    # The environment carries the setting into the spawned worker
+    os.environ["ASR_STUB_WORK_MS"] = str(args.asr_work_ms)
+    Config.ASR_STUB_WORK_MS = args.asr_work_ms
+    
+    audio = make_utterance(args.utterance)
+    results = {}
+    for mode in ("in-process", "workers"):
+        results[mode] = run(mode, args.backend, audio, args.seconds, args.fps, args.work_ms)
+    
+    target = 1000 / args.fps
+    load = f"'{args.backend}'" + (f" ({args.asr_work_ms:.0f} ms CPU each)" if args.backend == "stub" else "")
+    print(f"\nFrame interval at {args.fps} FPS (target {target:.1f} ms) while recognizing "
+          f"{args.utterance:.0f}s utterances with {load}")
+    print(f"{'mode':<14}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}{'utt p50':>10}{'utts':>7}")
+    for mode, result in results.items():
+        frames, utterances = result["frames"], result["utterances"]
+        print(f"{mode:<14}{frames['p50']:9.1f}{frames['p95']:9.1f}{frames['p99']:9.1f}{frames['max']:9.1f}"
+              f"{utterances['p50']:10.1f}{utterances['count']:7d}")
+    
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"backend": args.backend, "asr_work_ms": args.asr_work_ms, "fps": args.fps,
+                       "results": results}, f, indent=2)
+        print(f"✅ Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -34,30 +34,164 @@ class Config:
     ARC_REACTOR_RINGS = 3
     PULSE_SPEED = 2.0  # seconds per pulse
     
+    # Animation Frame Rates (one shared clock per window, paused while minimized)
+    UI_ACTIVE_FPS = 20  # while listening / speaking
+    UI_IDLE_FPS = 5  # nothing active, window focused
+    UI_BACKGROUND_FPS = 1  # nothing active, window unfocused
+    UI_DISPATCH_MS = 16  # worker -> widget update drain interval while updates arrive
+    UI_DISPATCH_IDLE_MS = 1000  # safety-net drain interval when quiet (posts wake the Tk loop themselves)
+    GREETING_POOL_SIZE = 3  # greetings generated ahead of time for the popup
+    STARTUP_BUDGET_MS = float(os.getenv("STARTUP_BUDGET_MS", "3000"))  # cold start limit checked by bench_startup
+    
+    # Conversation Log (only the newest messages live in the text widget)
+    CONVERSATION_VIEW_MESSAGES = 200  # messages kept in the widget while following the end
+    CONVERSATION_TRIM_BATCH = 50  # messages trimmed from / loaded into the widget at once
+    CONVERSATION_STORE_MESSAGES = 5000  # messages kept in memory for scrolling back
+    
     # Voice Settings
     VOICE_TIMEOUT = 5  # seconds
     VOICE_PHRASE_LIMIT = 10  # seconds
     TTS_RATE = 175  # speaking rate (words per minute)
     TTS_VOICE_INDEX = 0  # 0 for default, 1 for female (if available)
     
+    # Speech Recognition Settings
+    ASR_BACKEND = os.getenv("ASR_BACKEND", "google")  # "google", "vosk" (offline) or "stub"
+    ASR_MODEL_PATH = os.getenv("ASR_MODEL_PATH", "models/vosk-model-small-en-us-0.15")
+    ASR_SAMPLE_RATE = 16000
+    ASR_STUB_TEXT = os.getenv("ASR_STUB_TEXT", "what time is it")
+    ASR_STUB_WORK_MS = float(os.getenv("ASR_STUB_WORK_MS", "0"))  # CPU (GIL held) burned per stub utterance (benchmarks)
+    
+    # Ambient Noise Tracking
+    NOISE_PROFILE_PATH = os.getenv("NOISE_PROFILE_PATH", str(Path.home() / ".jarvis" / "noise_profile.json"))
+    NOISE_DEFAULT_THRESHOLD = 300  # energy threshold before the room is measured
+    NOISE_MIN_THRESHOLD = 50
+    NOISE_MAX_THRESHOLD = 4000
+    NOISE_THRESHOLD_RATIO = 1.5  # speech must be this much louder than the noise floor
+    NOISE_SMOOTHING = 0.05  # weight of each idle frame in the noise floor average
+    NOISE_RISE_WINDOW = 330  # recent idle frames (~10 s of 30 ms chunks) checked for a louder room
+    NOISE_RISE_PERCENTILE = 20  # if even this percentile is above the threshold, the room got louder
+    NOISE_SAVE_INTERVAL = 30  # seconds between profile writes
+    
+    # Microphone Capture
+    CAPTURE_SAMPLE_RATE = 16000
+    CAPTURE_CHUNK = 480  # frames per read (30 ms at 16 kHz)
+    CAPTURE_BUFFER_SECONDS = 30  # ring buffer length
+    CAPTURE_PRE_ROLL = 0.3  # seconds of audio kept from before a listen starts
+    
+    # Audio Level Metering (waveform display)
+    LEVELS_BANDS = 40  # log-spaced frequency bands
+    LEVELS_MIN_HZ = 80
+    LEVELS_FLOOR_DB = -60.0  # dBFS shown as an empty bar (0 dBFS is a full bar)
+    LEVELS_BUDGET_MS = 0.5  # CPU per update before capture chunks are skipped
+    LEVELS_MAX_AGE = 0.25  # seconds before a level snapshot is considered stale
+    
+    # Voice Activity Detection (continuous listening)
+    VAD_FRAME_MS = 30
+    VAD_BATCH_FRAMES = 4  # frames analysed per wake-up
+    VAD_ONSET_FRAMES = 3  # consecutive speech frames that start an utterance
+    VAD_MIN_HANGOVER = 0.4  # seconds of silence that end an utterance
+    VAD_MAX_HANGOVER = 1.2
+    VAD_HANGOVER_FACTOR = 2.5  # hangover = typical in-utterance pause * factor
+    VAD_MIN_UTTERANCE = 0.25  # seconds - shorter bursts are ignored
+    VAD_MAX_UTTERANCE = 20
+    
+    # Wake Word ("hey jarvis" spotted on-device before any recognition)
+    WAKEWORD_MODEL_PATH = os.getenv("WAKEWORD_MODEL_PATH", "models/wakeword/hey_jarvis.npz")
+    WAKEWORD_THRESHOLD = 0.75  # cosine similarity to the enrolled templates
+    WAKEWORD_STEP = 0.1  # seconds between evaluations while speech is present
+    WAKEWORD_COOLDOWN = 1.5  # seconds before the wake word can trigger again
+    
+    # Barge-in (interrupt JARVIS by talking over it)
+    BARGEIN_ENABLED = os.getenv("BARGEIN_ENABLED", "1") == "1"
+    BARGEIN_ECHO_MARGIN = 2.0  # user speech must be this much louder than the TTS echo
+    BARGEIN_ECHO_WARMUP = 0.3  # seconds of playback used to measure the echo level
+    BARGEIN_ONSET_FRAMES = 6  # consecutive speech frames (180 ms) that count as barge-in
+    
+    # Audio Preprocessing (before recognition, output at ASR_SAMPLE_RATE mono)
+    PREPROCESS_ENABLED = os.getenv("PREPROCESS_ENABLED", "1") == "1"
+    PREPROCESS_FRAME_MS = 10  # analysis frame for the noise gate and silence trimming
+    PREPROCESS_GATE_FLOOR = 0.1  # gain applied to frames below the noise threshold
+    PREPROCESS_TRIM_PAD = 0.15  # seconds of silence kept around the speech
+    PREPROCESS_TARGET_RMS = 3000  # automatic gain control target for the speech frames
+    PREPROCESS_MAX_GAIN = 10.0
+    
+    # Session Recording / Replay
+    SESSION_RECORD_DIR = os.getenv("SESSION_RECORD_DIR", "")  # record live sessions here (empty = off)
+    REPLAY_TAIL_SILENCE = 1.5  # seconds of silence appended to each replayed file
+    
+    # Voice Pipeline (capture -> ASR -> intent/LLM -> TTS)
+    PIPELINE_QUEUE_SIZE = 4  # turns waiting per stage before the oldest is dropped
+    PIPELINE_ECHO_TAIL = 0.3  # seconds after playback during which captured speech is our own echo
+    
+    # Voice Worker Processes (ASR / TTS outside the UI interpreter and its GIL)
+    VOICE_WORKERS = os.getenv("VOICE_WORKERS", "0") == "1"
+    WORKER_CHECK_INTERVAL = 0.5  # seconds between supervisor liveness checks
+    WORKER_MAX_RESTARTS = 5  # crashes per minute before a worker is given up on
+    WORKER_ASR_TIMEOUT = 30  # seconds before a stuck recognition is killed and restarted
+    
+    # Tracing (per-turn spans, summarize with python -m tools.trace_report)
+    TRACE_ENABLED = os.getenv("TRACE_ENABLED", "1") == "1"
+    TRACE_PATH = os.getenv("TRACE_PATH", str(Path.home() / ".jarvis" / "traces.jsonl"))
+    TRACE_MAX_BYTES = 5 * 1024 * 1024  # rotate the trace file at this size
+    TRACE_BACKUPS = 3  # rotated files kept (traces.jsonl.1 ... .3)
+    
+    # Web Server (speech.py)
+    SERVER_HOST = os.getenv("SERVER_HOST", "0.0.0.0")
+    SERVER_PORT = int(os.getenv("SERVER_PORT", "5000"))
+    SERVER_DEBUG = os.getenv("SERVER_DEBUG", "1") == "1"
+    SERVER_TTS = os.getenv("SERVER_TTS", "1") == "1"  # speak API responses on the server
+    SERVER_AI_FALLBACK = os.getenv("SERVER_AI_FALLBACK", "0") == "1"  # send unknown commands to JarvisAI (one shared conversation)
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"  # Prometheus text format at /metrics
+    
+    # Health Checks (/health/live, /health/ready)
+    HEALTH_INTERVAL = float(os.getenv("HEALTH_INTERVAL", "10"))  # seconds between background probes
+    HEALTH_TIMEOUT = 2.0  # seconds per provider probe request
+    HEALTH_STALE_FACTOR = 3  # not ready if the last probe is older than this many intervals
+    HEALTH_WARM_MODEL = os.getenv("HEALTH_WARM_MODEL", "1") == "1"  # load a cold Ollama model in the background
+    HEALTH_REQUIRE_AUDIO = os.getenv("HEALTH_REQUIRE_AUDIO", "0") == "1"  # microphone / TTS failures make the server not ready
+    
+    # Rate Limiting (token buckets per API key or client IP)
+    RATELIMIT_ENABLED = os.getenv("RATELIMIT_ENABLED", "1") == "1"
+    RATELIMIT_LOCAL_RATE = 5.0  # commands per second answered by built-in skills
+    RATELIMIT_LOCAL_BURST = 20
+    RATELIMIT_MODEL_RATE = 0.5  # commands per second that go to the AI provider
+    RATELIMIT_MODEL_BURST = 5
+    RATELIMIT_VOICE_RATE = 0.2  # /api/voice listens per second (the server has one microphone)
+    RATELIMIT_VOICE_BURST = 2
+    RATELIMIT_MAX_CLIENTS = 10000  # least recently seen clients are dropped beyond this
+    RATELIMIT_IDLE_EXPIRY = 600  # seconds before an idle client's buckets are discarded
+    RATELIMIT_TRUST_PROXY = os.getenv("RATELIMIT_TRUST_PROXY", "0") == "1"  # key clients by X-Forwarded-For
+    # API keys that get their own budget (comma separated); any other X-API-Key is keyed by IP
+    RATELIMIT_API_KEYS = [key.strip() for key in os.getenv("RATELIMIT_API_KEYS", "").split(",") if key.strip()]
+    
+    # Headless Daemon (daemon.py)
+    DAEMON_SOCKET = os.getenv("JARVIS_SOCKET", str(Path(os.getenv("XDG_RUNTIME_DIR") or Path.home() / ".jarvis") / "jarvis.sock"))
+    DAEMON_PORT = int(os.getenv("JARVIS_DAEMON_PORT", "5055"))  # 127.0.0.1 control port where Unix sockets are unavailable
+    DAEMON_MODE = os.getenv("JARVIS_DAEMON_MODE", "trigger")  # "trigger" (listen on request) or "continuous" (VAD / wake word)
+    
     # Hotkey Configuration
     ACTIVATION_HOTKEY = "<ctrl>+<space>"
     CLOSE_HOTKEY = "escape"
     
     # AI Settings
-    AI_PROVIDER = os.getenv("AI_PROVIDER", "ollama")  # "gemini" or "ollama"
+    AI_PROVIDER = os.getenv("AI_PROVIDER", "ollama")  # "gemini", "ollama" or "fake" (offline replay / tests)
     
     # Gemini Settings
     AI_MODEL = "gemini-1.5-flash"  # Stable free-tier model
     
     # Ollama Settings (local AI)
     OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "llama3.2")  # or "mistral", "phi", etc.
-    OLLAMA_BASE_URL = "http://localhost:11434"
+    OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")  # or a tools.fake_ollama server
+    OLLAMA_STREAM = os.getenv("OLLAMA_STREAM", "0") == "1"  # stream tokens (tracks time to first token)
+    OLLAMA_TIMEOUT = 60  # seconds
+    
+    # Fake Provider (canned replies, no network)
+    FAKE_PROVIDER_LATENCY = float(os.getenv("FAKE_PROVIDER_LATENCY", "0"))  # seconds per reply
     
     # General AI Settings
     AI_TEMPERATURE = 0.7
     AI_MAX_TOKENS = 1024
-    CONVERSATION_HISTORY_LIMIT = 10
+    CONVERSATION_HISTORY_LIMIT = 10  # messages kept as context (and in memory)
     
     # System Commands
     COMMANDS = {
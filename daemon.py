@@ -0,0 +1,395 @@
+"""
+JARVIS Headless Daemon
+Runs capture, speech recognition, the AI brain and TTS without any UI modules,
+controlled over a local socket (Unix socket, or 127.0.0.1 where unavailable)
+
+Usage:
+    python daemon.py                        # start (trigger mode: listens when told to)
+    python daemon.py --mode continuous      # always listening (VAD / wake word)
+    python daemon.py --send listen          # e.g. bound to a desktop hotkey
+    python daemon.py --send "ask what time is it"
+    python daemon.py --send status
+
+Control protocol: one command per line, one JSON reply per line
+    listen            start a voice turn
+    ask <text>        handle a typed command
+    say <text>        speak text
+    stop              cut the current reply short
+    status            pipeline and speaker state
+    shutdown          stop the daemon
+"""
+
+import argparse
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import Config
+from tracing import get_tracer
+
+
+class AssistantDaemon:
+    """The voice assistant pipeline without a window"""
+    
+    def __init__(self, mode=None, tts=True):
+        """
+        Args:
+            mode: "trigger" or "continuous" (defaults to Config.DAEMON_MODE)
+            tts: Speak replies (False prints them only)
+        """
+        # Imported here so --send stays a tiny client
+        import speech_recognition as sr
+        from ai_brain import JarvisAI
+        from voice.recognizers import get_recognizer
+        from voice.calibration import get_noise_tracker
+        from voice.capture import get_capture_service
+        from voice.tts import Speaker, NullEngine
+        from voice.bargein import BargeInMonitor
+        from voice.pipeline import VoicePipeline
+        
+        self.mode = mode or Config.DAEMON_MODE
+        self.sr = sr
+        self.brain = JarvisAI()
+        # Typed commands ("ask") still work without speech recognition
+        try:
+            self.asr = get_recognizer()
+        except Exception as e:
+            self.asr = None
+            print(f"⚠️  Speech recognition unavailable: {e}")
+        self.noise_tracker = get_noise_tracker()
+        self.recognizer = sr.Recognizer()
+        # Typed commands ("ask") still work on a box without a microphone or speech engine
+        try:
+            self.capture = get_capture_service()
+        except Exception as e:
+            self.capture = None
+            print(f"⚠️  Microphone unavailable: {e}")
+        try:
+            self.speaker = Speaker() if tts else Speaker(engine=NullEngine())
+        except Exception as e:
+            self.speaker = Speaker(engine=NullEngine())
+            print(f"⚠️  Speech output unavailable, printing replies only: {e}")
+        self.is_listening = False
+        self._barged_in = False
+        self._listen_lock = threading.Lock()
+        self._stopped = threading.Event()
+        
+        self.barge_in = None
+        if Config.BARGEIN_ENABLED and tts and self.capture:
+            self.barge_in = BargeInMonitor(self.capture, self.speaker, on_barge_in=self._on_barge_in)
+        
+        utterances = None
+        self.vad_listener = self.wake_listener = None
+        if self.mode == "continuous" and self.capture and self.asr:
+            utterances = self._continuous_utterances()
+        
+        self.pipeline = VoicePipeline(
+            self.asr,
+            self.brain.process_command,
+            self._speak,
+            utterances=utterances,
+            on_event=self._on_event
+        )
+    
+    def _continuous_utterances(self):
+        """VAD utterances, gated by the wake word if a model is enrolled"""
+        from voice.vad import ContinuousListener
+        from voice.wakeword import load_wake_word_listener
+        
+        self.vad_listener = ContinuousListener(self.capture)
+        self.wake_listener = load_wake_word_listener(self.capture)
+        if self.wake_listener is None:
+            return self.vad_listener.utterances()
+        
+        def after_wake_word():
+            while self.wake_listener.wait():
+                self.vad_listener.resync()
+                utterance = next(self.vad_listener.utterances(), None)
+                if utterance:
+                    yield utterance
+        return after_wake_word()
+    
+    def start(self):
+        self.pipeline.start()
+        print(f"✅ JARVIS daemon running ({self.mode} mode, ASR: {self.asr.name if self.asr else 'unavailable'}, AI: {Config.AI_PROVIDER})")
+        return self
+    
+    def stop(self):
+        """Stop listening, speaking and the pipeline"""
+        self._stopped.set()
+        self.pipeline.cancel_speech()
+        self.speaker.cancel()
+        for listener in (self.vad_listener, self.wake_listener):
+            if listener:
+                listener.stop()
+        self.pipeline.stop()
+        if self.capture:
+            self.capture.stop()
+    
+    def wait(self):
+        """Block until stop()"""
+        while not self._stopped.wait(1.0):
+            pass
+    
+    def listen(self, pre_roll=None):
+        """
+        Start one voice turn in the background
+        
+        Returns:
+            bool: False if a turn is already being captured
+        """
+        if self.capture is None or self.asr is None:
+            return False
+        with self._listen_lock:
+            if self.is_listening:
+                return False
+            self.is_listening = True
+        if self.speaker.is_speaking:
+            self.pipeline.cancel_speech()
+            self.speaker.cancel()
+        threading.Thread(target=self._listen_once, args=(pre_roll,), name="daemon-listen", daemon=True).start()
+        return True
+    
+    def _on_barge_in(self, since_onset):
+        self._barged_in = True
+        self.pipeline.cancel_speech()
+        if self.mode == "continuous":
+            # The VAD is already capturing the interruption - keep it from being dropped as echo
+            self.pipeline.mark_barge_in(time.monotonic() - since_onset)
+            return
+        self.listen(pre_roll=since_onset + Config.CAPTURE_PRE_ROLL)
+    
+    def _listen_once(self, pre_roll=None):
+        trace = get_tracer().start_trace("voice_turn", source="daemon")
+        try:
+            with self.capture.source(pre_roll) as source:
+                self.noise_tracker.apply(self.recognizer)
+                capture = trace.child("capture")
+                try:
+                    audio = self.recognizer.listen(
+                        source,
+                        timeout=Config.VOICE_TIMEOUT,
+                        phrase_time_limit=Config.VOICE_PHRASE_LIMIT
+                    )
+                finally:
+                    capture.end()
+                    self.noise_tracker.sync(self.recognizer)
+            self.pipeline.submit(audio, span=trace)
+        except self.sr.WaitTimeoutError:
+            trace.end(outcome="no_speech")
+            print("⚠️  No speech detected")
+        except Exception as e:
+            trace.end(error=str(e))
+            print(f"❌ Listen error: {e}")
+        finally:
+            self.is_listening = False
+    
+    def _speak(self, text):
+        """TTS stage handler"""
+        print(f"JARVIS: {text}")
+        self._barged_in = False
+        if self.barge_in:
+            self.barge_in.start()
+        try:
+            self.speaker.speak(text)
+        finally:
+            if self.barge_in:
+                self.barge_in.stop()
+            # Don't hear our own reply as the next command (unless the user talked over it)
+            if self.vad_listener and not self._barged_in:
+                self.vad_listener.resync()
+    
+    def _on_event(self, event, turn, detail):
+        if event == "recognized":
+            print(f"You: {turn.text}")
+        elif event == "error":
+            print(f"❌ {type(detail).__name__}: {detail}")
+    
+    def status(self):
+        return {
+            "mode": self.mode,
+            "listening": self.is_listening,
+            "speaking": self.speaker.is_speaking,
+            "pipeline": self.pipeline.stats(),
+        }
+    
+    def handle(self, line):
+        """
+        Run one control command
+        
+        Returns:
+            dict: JSON-serializable reply with an "ok" flag
+        """
+        command, _, argument = line.strip().partition(" ")
+        command = command.lower()
+        argument = argument.strip()
+        if command == "listen":
+            if self.asr is None:
+                return {"ok": False, "error": "voice unavailable"}
+            if self.mode == "continuous":
+                return {"ok": True, "detail": "listening continuously"}
+            if self.capture is None:
+                return {"ok": False, "error": "no microphone"}
+            started = self.listen()
+            return {"ok": started, "detail": "listening" if started else "already listening"}
+        if command == "ask" and argument:
+            self.pipeline.submit_text(argument)
+            return {"ok": True, "detail": "queued"}
+        if command == "say" and argument:
+            self.pipeline.say(argument)
+            return {"ok": True, "detail": "queued"}
+        if command == "stop":
+            self.pipeline.cancel_speech()
+            self.speaker.cancel()
+            return {"ok": True, "detail": "stopped"}
+        if command == "status":
+            return {"ok": True, "status": self.status()}
+        if command == "shutdown":
+            threading.Thread(target=self.stop, daemon=True).start()
+            return {"ok": True, "detail": "shutting down"}
+        return {"ok": False, "error": f"unknown command: {line.strip()!r}"}
+
+
+class _ControlHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for raw in self.rfile:
+            line = raw.decode("utf-8", errors="replace").strip()
+            if not line:
+                continue
+            try:
+                reply = self.server.assistant.handle(line)
+            except Exception as e:
+                reply = {"ok": False, "error": str(e)}
+            self.wfile.write((json.dumps(reply) + "\n").encode("utf-8"))
+            self.wfile.flush()
+
+
+def _use_unix_socket():
+    return hasattr(socket, "AF_UNIX") and os.name != "nt"
+
+
+class ControlServer:
+    """Local control socket for hotkey daemons, scripts and remote triggers"""
+    
+    def __init__(self, daemon, path=None, port=None):
+        """
+        Args:
+            daemon: AssistantDaemon receiving the commands
+            path: Unix socket path (defaults to Config.DAEMON_SOCKET)
+            port: 127.0.0.1 port used where Unix sockets are unavailable
+        """
+        if _use_unix_socket():
+            self.address = path or Config.DAEMON_SOCKET
+            Path(self.address).parent.mkdir(parents=True, exist_ok=True)
+            self._remove_stale(self.address)
+            self.server = socketserver.ThreadingUnixStreamServer(self.address, _ControlHandler)
+            os.chmod(self.address, 0o600)  # only this user may control the assistant
+        else:
+            self.address = ("127.0.0.1", port or Config.DAEMON_PORT)
+            self.server = socketserver.ThreadingTCPServer(self.address, _ControlHandler)
+        self.server.daemon_threads = True
+        self.server.assistant = daemon
+        self._thread = None
+    
+    @staticmethod
+    def _remove_stale(path):
+        """Delete a socket file left behind by a daemon that is no longer running"""
+        if not os.path.exists(path):
+            return
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(path)
+        except OSError:
+            os.unlink(path)
+        else:
+            raise RuntimeError(f"A JARVIS daemon is already running on {path}")
+        finally:
+            probe.close()
+    
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, name="daemon-control", daemon=True)
+        self._thread.start()
+        print(f"✅ Control socket: {self.address}")
+        return self
+    
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            os.unlink(self.address)
+
+
+def send_command(command, path=None, port=None, timeout=5.0):
+    """
+    Send one command to a running daemon
+    
+    Returns:
+        dict: The daemon's reply
+    """
+    if _use_unix_socket():
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        address = path or Config.DAEMON_SOCKET
+    else:
+        client = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        address = ("127.0.0.1", port or Config.DAEMON_PORT)
+    client.settimeout(timeout)
+    with client:
+        client.connect(address)
+        client.sendall(command.encode("utf-8") + b"\n")
+        with client.makefile("rb") as reply:
+            return json.loads(reply.readline() or b"{}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run JARVIS without a UI, controlled over a local socket")
+    parser.add_argument("--mode", choices=("trigger", "continuous"), help="Default: JARVIS_DAEMON_MODE")
+    parser.add_argument("--socket", help="Unix socket path (default: JARVIS_SOCKET)")
+    parser.add_argument("--port", type=int, help="Control port where Unix sockets are unavailable")
+    parser.add_argument("--no-tts", action="store_true", help="Print replies instead of speaking them")
+    parser.add_argument("--send", metavar="COMMAND", help="Send a command to a running daemon and exit")
+    args = parser.parse_args()
+    
+    if args.send:
+        try:
+            reply = send_command(args.send, args.socket, args.port)
+        except OSError as e:
+            print(f"❌ JARVIS daemon not reachable: {e}")
+            sys.exit(1)
+        print(json.dumps(reply, indent=2))
+        sys.exit(0 if reply.get("ok") else 1)
+    
+    if not Config.validate():
+        sys.exit(1)
+    
+    try:
+        assistant = AssistantDaemon(mode=args.mode, tts=not args.no_tts)
+    except Exception as e:
+        print(f"❌ Failed to start JARVIS daemon: {e}")
+        sys.exit(1)
+    server = ControlServer(assistant, args.socket, args.port).start()
+    assistant.start()
+    
+    def on_signal(signum, frame):
+        print("\n👋 JARVIS daemon shutting down...")
+        assistant.stop()
+    signal.signal(signal.SIGTERM, on_signal)
+    signal.signal(signal.SIGINT, on_signal)
+    
+    try:
+        assistant.wait()
+    finally:
+        server.stop()
+        print(assistant.pipeline.format_stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""
+JARVIS Health Monitor
+Background probe of the AI provider, TTS engine and microphone. Results are
+cached, so liveness / readiness endpoints answer instantly without touching
+the model
+"""
+
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime
+from config import Config
+from metrics import HEALTH_CHECKS
+
+
+def _request_json(url, payload=None, timeout=None):
+    """GET (or POST ``payload``) and decode a JSON reply"""
+    data = None if payload is None else json.dumps(payload).encode("utf-8")
+    request = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(request, timeout=timeout or Config.HEALTH_TIMEOUT) as response:
+        return json.loads(response.read() or b"{}")
+
+
+class OllamaProbe:
+    """Checks that Ollama answers and the configured model is loaded in memory"""
+    
+    def __init__(self, base_url=None, model=None, warm=None):
+        """
+        Args:
+            base_url: Ollama server (defaults to Config.OLLAMA_BASE_URL)
+            model: Model that must be loaded (defaults to Config.OLLAMA_MODEL)
+            warm: Load a cold model in the background (defaults to Config.HEALTH_WARM_MODEL)
+        """
+        self.base_url = (base_url or Config.OLLAMA_BASE_URL).rstrip("/")
+        self.model = model or Config.OLLAMA_MODEL
+        self.warm = Config.HEALTH_WARM_MODEL if warm is None else warm
+        self._warming = threading.Event()
+    
+    def _is_model(self, name):
+        return name == self.model or name.split(":")[0] == self.model
+    
+    def __call__(self):
+        try:
+            loaded = _request_json(f"{self.base_url}/api/ps").get("models") or []
+        except (urllib.error.URLError, OSError, ValueError) as e:
+            return False, f"Ollama unreachable at {self.base_url}: {getattr(e, 'reason', e)}"
+        if any(self._is_model(m.get("name", "")) for m in loaded):
+            return True, f"{self.model} loaded"
+        if not self.warm:
+            return False, f"{self.model} not loaded"
+        if not self._warming.is_set():
+            self._warming.set()
+            threading.Thread(target=self._load_model, name="health-warmup", daemon=True).start()
+        return False, f"{self.model} cold (loading)"
+    
+    def _load_model(self):
+        """An empty chat request makes Ollama load the model without generating"""
+        try:
+            _request_json(f"{self.base_url}/api/chat",
+                          {"model": self.model, "messages": [], "stream": False},
+                          timeout=Config.OLLAMA_TIMEOUT)
+        except (urllib.error.URLError, OSError, ValueError) as e:
+            print(f"⚠️  Could not load {self.model}: {e}")
+        finally:
+            self._warming.clear()
+
+
+def provider_check(provider=None):
+    """
+    Build the readiness check for an AI provider
+    
+    Returns:
+        callable: () -> (ok, detail)
+    """
+    provider = provider or Config.AI_PROVIDER
+    if provider == "ollama":
+        return OllamaProbe()
+    if provider == "gemini":
+        # Probing Gemini would spend quota, so only the configuration is checked
+        def check_gemini():
+            try:
+                import google.generativeai  # noqa: F401
+            except ImportError:
+                return False, "google-generativeai not installed"
+            if not Config.GEMINI_API_KEY:
+                return False, "GEMINI_API_KEY not configured"
+            return True, f"{Config.AI_MODEL} configured"
+        return check_gemini
+    if provider == "fake":
+        return lambda: (True, "fake provider")
+    return lambda: (False, f"unknown provider {provider}")
+
+
+class HealthMonitor:
+    """Runs registered checks on a background thread and caches the results"""
+    
+    def __init__(self, interval=None):
+        """
+        Args:
+            interval: Seconds between probes (defaults to Config.HEALTH_INTERVAL)
+        """
+        self.interval = interval or Config.HEALTH_INTERVAL
+        self.checks = {}  # name -> (callable, required)
+        self.results = {}
+        self.checked_at = None  # monotonic time of the last completed probe
+        self.checked_wall = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+    
+    def add_check(self, name, check, required=True):
+        """
+        Register a check
+        
+        Args:
+            name: Check name shown in the readiness report
+            check: Callable() -> (ok, detail); exceptions count as failures
+            required: Whether a failure makes the instance not ready
+        """
+        self.checks[name] = (check, required)
+        return self
+    
+    def probe(self):
+        """Run every check now and update the cache"""
+        results = {}
+        for name, (check, required) in list(self.checks.items()):
+            started = time.monotonic()
+            try:
+                ok, detail = check()
+            except Exception as e:
+                ok, detail = False, f"{type(e).__name__}: {e}"
+            results[name] = {
+                "ok": bool(ok),
+                "required": required,
+                "detail": detail,
+                "ms": round((time.monotonic() - started) * 1000, 1),
+            }
+        with self._lock:
+            self.results = results
+            self.checked_at = time.monotonic()
+            self.checked_wall = datetime.now().isoformat(timespec="seconds")
+        return results
+    
+    def _run(self):
+        while not self._stop.is_set():
+            self.probe()
+            self._stop.wait(self.interval)
+    
+    def start(self):
+        """Probe in the background (idempotent)"""
+        if self._thread is None:
+            HEALTH_CHECKS.callback = self.series
+            self._thread = threading.Thread(target=self._run, name="health-probe", daemon=True)
+            self._thread.start()
+        return self
+    
+    def stop(self):
+        self._stop.set()
+    
+    def snapshot(self):
+        """
+        Cached readiness report
+        
+        Returns:
+            dict: ready, reason, age of the last probe and per-check results
+        """
+        with self._lock:
+            results = dict(self.results)
+            checked_at = self.checked_at
+            checked_wall = self.checked_wall
+        if checked_at is None:
+            return {"ready": False, "reason": "starting", "checked_at": None, "age": None, "checks": {}}
+        age = time.monotonic() - checked_at
+        failing = [name for name, result in results.items() if result["required"] and not result["ok"]]
+        reason = None
+        if age > self.interval * Config.HEALTH_STALE_FACTOR:
+            reason = "health probe stalled"
+        elif failing:
+            reason = "failing: " + ", ".join(failing)
+        return {
+            "ready": reason is None,
+            "reason": reason,
+            "checked_at": checked_wall,
+            "age": round(age, 1),
+            "checks": results,
+        }
+    
+    def is_ok(self, name):
+        """Whether a check passed on the last probe (False if unknown)"""
+        with self._lock:
+            result = self.results.get(name)
+        return bool(result and result["ok"])
+    
+    def series(self):
+        """Per-check 1 / 0 values for the metrics endpoint"""
+        with self._lock:
+            return {(name,): int(result["ok"]) for name, result in self.results.items()}
@@ -1,77 +1,140 @@
 import speech_recognition as sr
 import pyttsx3
 import os
+import sys
 import webbrowser
+from voice.recognizers import get_recognizer, UnknownSpeechError, RecognitionServiceError
+from voice.calibration import get_noise_tracker
+from voice.capture import get_capture_service
+from voice.vad import ContinuousListener
+from voice.wakeword import load_wake_word_listener
+from voice.pipeline import VoicePipeline
+from voice.replay import SessionRecorder
+from config import Config
 
 recognizer = sr.Recognizer()
+asr = get_recognizer()
+noise_tracker = get_noise_tracker()
+capture = get_capture_service()
+vad_listener = ContinuousListener(capture)
+# on-device "hey jarvis" (None until a model is enrolled with python -m voice.wakeword enroll)
+wake_listener = load_wake_word_listener(capture)
 engine = pyttsx3.init()
-def speak(text):
+# continuous VAD listening by default, --classic for the old timeout based listen()
+CONTINUOUS = "--classic" not in sys.argv
+def say(text):
     print("Jarvis:",text)
     engine.say(text)
     engine.runAndWait()
+def speak(text):
+    say(text)
+    # don't treat our own voice as the next command
+    vad_listener.resync()
 def listen():
-    with sr.Microphone() as source:
+    with capture.source() as source:
         print("Listening...")
-        recognizer.adjust_for_ambient_noise(source,duration=0.5)
-        recognizer.energy_threshold = 300
+        noise_tracker.apply(recognizer)
         recognizer.pause_threshold=0.5
         try:
            audio = recognizer.listen(source, timeout=2,phrase_time_limit=4)         
-           command = recognizer.recognize_google(audio)
+           noise_tracker.sync(recognizer)
+           heard = (source.stream.position - len(audio.frame_data), source.stream.position)
+           command = asr.recognize(audio)
            print("You said:", command)
+           if recorder:
+               recorder.note(command, *heard)
            return command.lower()
         except sr.WaitTimeoutError:
+             noise_tracker.sync(recognizer)
              return ""
-        except sr.UnknownValueError:
+        except UnknownSpeechError:
+            if recorder:
+                recorder.note("", *heard)
             speak("Sorry, I didn't catch that.")
             return ""
-        except sr.RequestError:
+        except RecognitionServiceError:
             speak("Sorry, there seems to be an issue with the service.")
             return ""
-#main loop
-speak("Hello sir, I am your assistant Jarvis. How can I help you today?")
-while True:
-    command = listen()
-    if not command:
-         continue
+def listen_after_wake_word():
+    """Only send the utterance that follows an on-device wake word to the recognizer"""
+    print("Waiting for 'hey jarvis'...")
+    while wake_listener.wait():
+        say("yes sir, how can I help you")
+        vad_listener.resync()
+        utterance = next(vad_listener.utterances(), None)
+        if utterance:
+            yield utterance
+def respond(command):
+    """Run a command and return what Jarvis should say back"""
+    command = command.lower()
     if "stop" in command or "exit" in command:
-        speak("Goodbye!")
-        break
+        running[0] = False
+        return "Goodbye!"
     elif"hey jarvis" in command:
-         speak("yes sir, how can I help you")
-         command=listen()
+         return "yes sir, how can I help you"
     elif "your name" in command:
-        speak("My name is Jarvis.")
+        return "My name is Jarvis."
     elif "whats is the time" in command:
         from datetime import datetime
-        speak("The current time is " + datetime.now().strftime("%I:%M %p"))
+        return "The current time is " + datetime.now().strftime("%I:%M %p")
     elif "open notepad" in command:
-         speak("yes sir, Opening Notepad")
          os.system("notepad.exe")
+         return "yes sir, Opening Notepad"
     elif "open chrome" in command:
-         speak("yes sir, Opening Chrome")
          os.startfile(r"C:\\Users\\omanl\\AppData\\Local\\Google\\Chrome\\Application\\chrome.exe")
+         return "yes sir, Opening Chrome"
   
     elif "open vs code" in command:
-         speak("yes sir, Opening VS Code")
          os.startfile(r"C:\\Users\\omanl\\AppData\\Local\\Programs\\Microsoft VS Code\\Code.exe")
+         return "yes sir, Opening VS Code"
     elif"open lead code" in command:
-        speak("yes sir,Opening Leetcode")
         webbrowser.open("https://leetcode.com/u/SAAI_PRAKASH/")
+        return "yes sir,Opening Leetcode"
     elif "open my github" in command:
-         speak("yes sir,opening github")
          webbrowser.open("https://github.com/Saai416")
+         return "yes sir,opening github"
     elif"open youtube"in command:
-         speak("yes sir,opening youtube")
          webbrowser.open("https://www.youtube.com/")
+         return "yes sir,opening youtube"
     elif "open my folder" in command:
-            speak("yes sir,opening your folder")
             os.startfile("explorer.exe")
+            return "yes sir,opening your folder"
     elif"open whatsapp" in command:
-           speak("yes sir,opening whatsapp")
            os.startfile(r"C:\\Users\\omanl\\OneDrive\\Desktop\\WhatsApp - Shortcut.lnk")
+           return "yes sir,opening whatsapp"
     elif command:
-        speak("You said: " + command)
-
-
-    
\ No newline at end of file
+        return "You said: " + command
+def on_event(event, turn, detail):
+    if recorder:
+        recorder.on_event(event, turn, detail)
+    if event == "recognized":
+        print("You said:", turn.text)
+    elif event == "spoken" and not running[0]:
+        pipeline.stop()
+    elif event == "error" and isinstance(detail, RecognitionServiceError):
+        pipeline.say("Sorry, there seems to be an issue with the service.")
+running = [True]
+# SESSION_RECORD_DIR=sessions saves the mic + transcripts for python -m voice.replay
+recorder = SessionRecorder(capture).start() if Config.SESSION_RECORD_DIR else None
+#main loop
+speak("Hello sir, I am your assistant Jarvis. How can I help you today?")
+if not CONTINUOUS:
+    for command in iter(listen, None):
+        if not command:
+             continue
+        speak(respond(command))
+        if not running[0]:
+            break
+else:
+    # capture, recognition, command handling and speech run as separate stages,
+    # so the next utterance is captured while the last one is still being answered
+    utterances = listen_after_wake_word() if wake_listener else vad_listener.utterances()
+    pipeline = VoicePipeline(asr, respond, say, utterances=utterances, on_event=on_event)
+    print("Listening continuously...")
+    try:
+        pipeline.run()
+    except KeyboardInterrupt:
+        pipeline.stop()
+    print(pipeline.format_stats())
+if recorder:
+    recorder.stop()
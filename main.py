@@ -3,32 +3,48 @@ JARVIS - Just A Rather Very Intelligent System
 Iron Man-style AI Assistant with voice control and futuristic UI
 
 Main entry point - launches JARVIS with global hotkey activation
+
+Usage:
+    python main.py
+    python main.py --profile-startup                      # per-phase / per-import timings
+    python main.py --profile-startup --exit-after-startup --profile-json startup.json
 """
 
-import customtkinter as ctk
-from pynput import keyboard
+import argparse
 import sys
 import os
+import time
 
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+# Heavy modules (AI SDKs, Tk, speech, pynput) are imported inside the startup phases that need them
+from startup import get_startup_profiler
 from config import Config
-from ai_brain import JarvisAI
-from ui.jarvis_ui import JarvisUI
 
 
 class JarvisApp:
     """Main JARVIS application controller"""
     
-    def __init__(self):
-        """Initialize JARVIS"""
+    def __init__(self, profile_startup=False, exit_after_startup=False, profile_json=None):
+        """
+        Initialize JARVIS
+        
+        Args:
+            profile_startup: Print per-phase and per-import startup timings
+            exit_after_startup: Stop once the window is ready instead of running (for profiling)
+            profile_json: Write the startup profile to this file
+        """
+        profiler = get_startup_profiler()
+        
         print("\n" + "="*60)
         print("🤖 J.A.R.V.I.S. - Iron Man AI Assistant")
         print("="*60)
         
         # Validate configuration
-        if not Config.validate():
+        with profiler.phase("config"):
+            valid = Config.validate()
+        if not valid:
             print("\n❌ Configuration error! Please set up your .env file.")
             print("See .env.example for template.\n")
             input("Press Enter to exit...")
@@ -44,34 +60,83 @@ class JarvisApp:
         print("="*60 + "\n")
         
         # Initialize AI
-        try:
-            self.ai_brain = JarvisAI()
-            print("✅ AI Brain initialized successfully\n")
-        except Exception as e:
-            error_msg = str(e)
-            print(f"\n❌ Failed to initialize AI: {e}\n")
-            
-            # Provide helpful guidance based on error type
-            if "429" in error_msg or "quota" in error_msg.lower():
-                print("💡 SOLUTION: Rate limit or quota exceeded")
-                print("   The model config has been updated to use 'gemini-1.5-flash'")
-                print("   Please restart JARVIS with: python main.py")
-                print("   OR wait a few minutes and try again\n")
-            elif "API_KEY" in error_msg or "api key" in error_msg.lower():
-                print("💡 SOLUTION: Check your .env file")
-                print("   Make sure GEMINI_API_KEY is set correctly\n")
+        with profiler.phase("ai_brain"):
+            from ai_brain import JarvisAI, GreetingPool
+            try:
+                self.ai_brain = JarvisAI()
+                print("✅ AI Brain initialized successfully\n")
+            except Exception as e:
+                error_msg = str(e)
+                print(f"\n❌ Failed to initialize AI: {e}\n")
+                
+                # Provide helpful guidance based on error type
+                if "429" in error_msg or "quota" in error_msg.lower():
+                    print("💡 SOLUTION: Rate limit or quota exceeded")
+                    print("   The model config has been updated to use 'gemini-1.5-flash'")
+                    print("   Please restart JARVIS with: python main.py")
+                    print("   OR wait a few minutes and try again\n")
+                elif "API_KEY" in error_msg or "api key" in error_msg.lower():
+                    print("💡 SOLUTION: Check your .env file")
+                    print("   Make sure GEMINI_API_KEY is set correctly\n")
+                else:
+                    print("💡 SOLUTION: Check your internet connection")
+                    print("   Verify your API key at: https://aistudio.google.com/app/apikey\n")
+                
+                input("Press Enter to exit...")
+                sys.exit(1)
+        
+        # Load speech recognition model once at startup (in the worker process, if enabled)
+        with profiler.phase("speech_recognizer"):
+            if Config.VOICE_WORKERS:
+                print(f"✅ Speech recognizer: {Config.ASR_BACKEND} (worker process)\n")
             else:
-                print("💡 SOLUTION: Check your internet connection")
-                print("   Verify your API key at: https://aistudio.google.com/app/apikey\n")
-            
-            input("Press Enter to exit...")
-            sys.exit(1)
+                try:
+                    from voice.recognizers import get_recognizer
+                    asr = get_recognizer()
+                    print(f"✅ Speech recognizer: {asr.name}\n")
+                except Exception as e:
+                    print(f"⚠️  Speech recognizer unavailable ({Config.ASR_BACKEND}): {e}\n")
+        
+        # Keep the microphone open for the whole session (also tracks the noise floor)
+        with profiler.phase("microphone"):
+            try:
+                from voice.capture import get_capture_service
+                get_capture_service()
+                print("✅ Microphone stream open\n")
+            except Exception as e:
+                print(f"⚠️  Microphone unavailable: {e}\n")
+        
+        # Greetings are generated in the background, ahead of the first hotkey press
+        with profiler.phase("greeting_pool"):
+            self.greetings = GreetingPool(self.ai_brain).start()
         
-        # UI window reference
-        self.ui_window = None
+        # Build the window once (hidden) - the hotkey only shows it
+        with profiler.phase("ui"):
+            from ui.jarvis_ui import JarvisUI
+            self.ui_window = JarvisUI(self.ai_brain, greetings=self.greetings, persistent=True)
+            self.center_window(self.ui_window)
+        print("✅ JARVIS window ready\n")
         
         # Set up hotkey listener
-        self.setup_hotkey()
+        with profiler.phase("hotkey"):
+            self.setup_hotkey()
+        
+        profiler.finish()
+        if profile_startup:
+            profiler.report()
+        if profile_json:
+            profiler.write_json(profile_json)
+            print(f"✅ Startup profile written to {profile_json}")
+        if exit_after_startup:
+            self.hotkey_listener.stop()
+            self.ui_window.shutdown()
+            return
+        
+        # Tk runs on the main thread until the app exits
+        try:
+            self.ui_window.mainloop()
+        finally:
+            self.hotkey_listener.stop()
     
     def setup_hotkey(self):
         """Set up global hotkey listener"""
@@ -85,40 +150,17 @@ class JarvisApp:
         # Format: "<ctrl>+<space>"
         hotkey = Config.ACTIVATION_HOTKEY
         
-        # Set up listener
-        with keyboard.GlobalHotKeys({
+        # Listen on pynput's own thread
+        from pynput import keyboard
+        self.hotkey_listener = keyboard.GlobalHotKeys({
             hotkey: on_activate
-        }) as listener:
-            listener.join()
+        })
+        self.hotkey_listener.start()
     
     def show_ui(self):
-        """Show JARVIS UI window"""
-        if self.ui_window is not None:
-            try:
-                # Window already exists, bring to front
-                self.ui_window.lift()
-                self.ui_window.focus_force()
-                return
-            except:
-                # Window was closed, create new one
-                pass
-        
-        try:
-            # Create new window
-            self.ui_window = JarvisUI(self.ai_brain)
-            
-            # Center window on screen
-            self.center_window(self.ui_window)
-            
-            # Run UI
-            self.ui_window.mainloop()
-            
-            # Window closed
-            self.ui_window = None
-        
-        except Exception as e:
-            print(f"Error showing UI: {e}")
-            self.ui_window = None
+        """Show JARVIS UI window (called from the hotkey thread)"""
+        # The window belongs to the Tk thread - hand the request over through its queue
+        self.ui_window.ui.post(self.ui_window.show_popup, requested_at=time.perf_counter())
     
     def center_window(self, window):
         """Center window on screen"""
@@ -138,8 +180,23 @@ class JarvisApp:
 
 def main():
     """Main entry point"""
+    parser = argparse.ArgumentParser(description="JARVIS desktop assistant")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="Print a per-phase and per-import startup timing breakdown")
+    parser.add_argument("--exit-after-startup", action="store_true",
+                        help="Exit once the window is ready (for profiling and benchmarks)")
+    parser.add_argument("--profile-json", help="Write the startup profile to this file")
+    args = parser.parse_args()
+    
+    if args.profile_startup or args.profile_json:
+        get_startup_profiler().enable()
+    
     try:
-        app = JarvisApp()
+        app = JarvisApp(
+            profile_startup=args.profile_startup,
+            exit_after_startup=args.exit_after_startup,
+            profile_json=args.profile_json
+        )
     except KeyboardInterrupt:
         print("\n\n👋 JARVIS shutting down...")
         print("Goodbye, sir.\n")
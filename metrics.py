@@ -0,0 +1,304 @@
+"""
+JARVIS Metrics
+Counters, gauges and histograms exposed in the Prometheus text format.
+Each thread records into its own shard without taking a lock; shards are only
+summed when the metrics are scraped
+"""
+
+import threading
+import weakref
+from bisect import bisect_left
+
+# Seconds, from a fast local skill up to a slow model reply
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=""):
+    pairs = [f'{name}="{_escape("" if value is None else value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class _Shard:
+    """Per-thread values; retired into the registry when its thread exits"""
+    
+    __slots__ = ("values", "__weakref__")
+    
+    def __init__(self):
+        self.values = {}
+
+
+class _Metric:
+    type = None
+    
+    def __init__(self, registry, name, help, labelnames=()):
+        self.registry = registry
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+    
+    def _key(self, labels):
+        if not self.labelnames:
+            return (self,)
+        return (self, *map(labels.get, self.labelnames))
+    
+    def _header(self):
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}"]
+
+
+class Counter(_Metric):
+    """Monotonic count (name should end in _total)"""
+    
+    type = "counter"
+    
+    def inc(self, amount=1, **labels):
+        values = self.registry._values()
+        key = self._key(labels)
+        values[key] = values.get(key, 0) + amount
+    
+    def render(self, series):
+        lines = self._header()
+        for labels, value in sorted(series.items(), key=lambda item: str(item[0])):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}")
+        return lines
+
+
+class Gauge(Counter):
+    """Value that goes up and down (e.g. requests in flight)"""
+    
+    type = "gauge"
+    
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    """Bucketed distribution of observations (seconds)"""
+    
+    type = "histogram"
+    
+    def __init__(self, registry, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(registry, name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+    
+    def observe(self, value, **labels):
+        values = self.registry._values()
+        key = self._key(labels)
+        cells = values.get(key)
+        if cells is None:
+            # One count per bucket, one for +Inf, then the sum
+            cells = values[key] = [0] * (len(self.buckets) + 2)
+        cells[bisect_left(self.buckets, value)] += 1
+        cells[-1] += value
+    
+    def render(self, series):
+        lines = self._header()
+        for labels, cells in sorted(series.items(), key=lambda item: str(item[0])):
+            total = 0
+            for bound, count in zip(self.buckets + (float("inf"),), cells):
+                total += count
+                le = f'le="{_format_value(float(bound))}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {total}")
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_value(round(cells[-1], 6))}")
+            lines.append(f"{self.name}_count{label_text} {total}")
+        return lines
+
+
+class CallbackGauge(_Metric):
+    """Gauge read at scrape time, e.g. a queue depth"""
+    
+    type = "gauge"
+    
+    def __init__(self, registry, name, help, labelnames=(), callback=None):
+        super().__init__(registry, name, help, labelnames)
+        self.callback = callback
+        self._sources = {}  # label values -> weak reference to an object with qsize()
+        self._lock = threading.Lock()
+    
+    def track(self, obj, *labels):
+        """Report ``obj.qsize()`` under these label values while obj is alive"""
+        with self._lock:
+            self._sources[labels] = weakref.ref(obj)
+    
+    def collect(self):
+        series = {}
+        with self._lock:
+            sources = list(self._sources.items())
+        for labels, ref in sources:
+            obj = ref()
+            if obj is None:
+                with self._lock:
+                    if self._sources.get(labels) is ref:
+                        del self._sources[labels]
+                continue
+            series[labels] = obj.qsize()
+        if self.callback is not None:
+            value = self.callback()
+            series.update(value if isinstance(value, dict) else {(): value})
+        return series
+    
+    def render(self, series):
+        lines = self._header()
+        for labels, value in sorted(self.collect().items(), key=lambda item: str(item[0])):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}")
+        return lines
+
+
+class MetricsRegistry:
+    """Owns the metrics and the per-thread shards they record into"""
+    
+    def __init__(self):
+        self._metrics = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._live = {}  # id(shard) -> values of threads still running
+        self._retired = {}  # values merged from finished threads
+    
+    def _values(self):
+        """The calling thread's shard (created on first use)"""
+        try:
+            return self._local.shard.values
+        except AttributeError:
+            shard = self._local.shard = _Shard()
+            key = id(shard)
+            with self._lock:
+                self._live[key] = shard.values
+            weakref.finalize(shard, self._retire, key)
+            return shard.values
+    
+    def _retire(self, key):
+        with self._lock:
+            values = self._live.pop(key, None)
+            if values:
+                self._merge(self._retired, values)
+    
+    @staticmethod
+    def _merge(target, values):
+        for key, value in values.items():
+            if isinstance(value, list):
+                cells = target.get(key)
+                if cells is None:
+                    target[key] = list(value)
+                else:
+                    for index, cell in enumerate(value):
+                        cells[index] += cell
+            else:
+                target[key] = target.get(key, 0) + value
+    
+    def _add(self, metric):
+        self._metrics.append(metric)
+        return metric
+    
+    def counter(self, name, help, labelnames=()):
+        return self._add(Counter(self, name, help, labelnames))
+    
+    def gauge(self, name, help, labelnames=()):
+        return self._add(Gauge(self, name, help, labelnames))
+    
+    def histogram(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._add(Histogram(self, name, help, labelnames, buckets))
+    
+    def callback_gauge(self, name, help, labelnames=(), callback=None):
+        return self._add(CallbackGauge(self, name, help, labelnames, callback))
+    
+    def collect(self):
+        """
+        Sum all shards
+        
+        Returns:
+            dict: metric -> {label values: number or histogram cells}
+        """
+        merged = {}
+        with self._lock:
+            self._merge(merged, self._retired)
+            for values in self._live.values():
+                self._merge(merged, values.copy())
+        series = {}
+        for (metric, *labels), value in merged.items():
+            series.setdefault(metric, {})[tuple(labels)] = value
+        return series
+    
+    def value(self, metric, **labels):
+        """Current value of one counter / gauge series (0 if never recorded)"""
+        return self.collect().get(metric, {}).get(metric._key(labels)[1:], 0)
+    
+    def render(self):
+        """All metrics in the Prometheus text exposition format"""
+        series = self.collect()
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render(series.get(metric, {})))
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+# HTTP API (speech.py)
+HTTP_REQUESTS = REGISTRY.counter(
+    "jarvis_http_requests_total", "HTTP requests by route, method and status", ("route", "method", "status"))
+HTTP_LATENCY = REGISTRY.histogram(
+    "jarvis_http_request_seconds", "HTTP request latency by route", ("route", "method"))
+HTTP_IN_FLIGHT = REGISTRY.gauge("jarvis_http_requests_in_flight", "HTTP requests being handled")
+
+# Voice stages
+ASR_LATENCY = REGISTRY.histogram("jarvis_asr_seconds", "Speech recognition time per utterance", ("backend",))
+LLM_LATENCY = REGISTRY.histogram("jarvis_llm_seconds", "AI provider round-trip per reply", ("provider",))
+LLM_FIRST_TOKEN = REGISTRY.histogram(
+    "jarvis_llm_first_token_seconds", "Time to the first streamed token", ("provider",))
+TTS_LATENCY = REGISTRY.histogram("jarvis_tts_seconds", "Time spent speaking a reply")
+WORKER_RESTARTS = REGISTRY.counter(
+    "jarvis_worker_restarts_total", "Voice worker processes restarted after a crash", ("worker",))
+
+# Provider health
+PROVIDER_REQUESTS = REGISTRY.counter(
+    "jarvis_provider_requests_total", "AI provider calls by outcome (ok / error)", ("provider", "outcome"))
+
+# Admission control
+RATELIMIT_REJECTIONS = REGISTRY.counter(
+    "jarvis_ratelimit_rejections_total", "Requests refused with 429 by budget", ("budget",))
+
+# Caches
+CACHE_REQUESTS = REGISTRY.counter(
+    "jarvis_cache_requests_total", "Cache lookups by result (hit / miss)", ("cache", "result"))
+
+# Queues
+QUEUE_DEPTH = REGISTRY.callback_gauge("jarvis_queue_depth", "Items waiting in a queue", ("queue",))
+
+# Dependency health (callback set by health.HealthMonitor.start)
+HEALTH_CHECKS = REGISTRY.callback_gauge(
+    "jarvis_health_check", "1 if the dependency passed its last health probe", ("check",))
+
+
+def _ratio(metric, numerator, outcomes):
+    """{(group,): numerator / total} over a counter labelled (group, outcome)"""
+    totals, hits = {}, {}
+    for (group, outcome), count in REGISTRY.collect().get(metric, {}).items():
+        if outcome in outcomes:
+            totals[group] = totals.get(group, 0) + count
+        if outcome == numerator:
+            hits[group] = hits.get(group, 0) + count
+    return {(group,): round(hits.get(group, 0) / total, 4) for group, total in totals.items() if total}
+
+
+CACHE_HIT_RATIO = REGISTRY.callback_gauge(
+    "jarvis_cache_hit_ratio", "Hits / lookups since start", ("cache",),
+    lambda: _ratio(CACHE_REQUESTS, "hit", ("hit", "miss")))
+PROVIDER_ERROR_RATIO = REGISTRY.callback_gauge(
+    "jarvis_provider_error_ratio", "Failed / all provider calls since start", ("provider",),
+    lambda: _ratio(PROVIDER_REQUESTS, "error", ("ok", "error")))
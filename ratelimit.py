@@ -0,0 +1,142 @@
+"""
+JARVIS Rate Limiting
+In-memory token buckets per client (IP address or API key) with a bounded,
+expiring client table, used to keep any one client from flooding the server
+"""
+
+import hmac
+import math
+import threading
+import time
+from collections import OrderedDict
+from config import Config
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a client has used up a budget"""
+    
+    def __init__(self, budget, retry_after):
+        super().__init__(f"Rate limit exceeded for {budget} requests, retry in {retry_after:.1f}s")
+        self.budget = budget
+        self.retry_after = retry_after
+    
+    @property
+    def retry_after_header(self):
+        """Whole seconds for the Retry-After header (at least 1)"""
+        return str(max(1, math.ceil(self.retry_after)))
+
+
+class RateLimiter:
+    """Token buckets keyed by client; refilled lazily on each request"""
+    
+    def __init__(self, name, rate, burst, max_clients=None, idle_expiry=None):
+        """
+        Args:
+            name: Budget name used in errors and metrics
+            rate: Tokens added per second
+            burst: Bucket size (requests allowed back to back)
+            max_clients: Clients tracked before the least recently seen is dropped
+            idle_expiry: Seconds after which an idle client's bucket is discarded
+        """
+        self.name = name
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self.max_clients = max_clients or Config.RATELIMIT_MAX_CLIENTS
+        # A bucket idle for burst / rate seconds is full again, same as a new one
+        self.idle_expiry = max(idle_expiry or Config.RATELIMIT_IDLE_EXPIRY, self.burst / self.rate)
+        self._buckets = OrderedDict()  # key -> [tokens, last update], least recently used first
+        self._lock = threading.Lock()
+    
+    def acquire(self, key, cost=1.0):
+        """
+        Take ``cost`` tokens from a client's bucket
+        
+        Returns:
+            float: 0 if allowed, otherwise seconds until enough tokens are back
+        """
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [self.burst, now]
+            else:
+                self._buckets.move_to_end(key)
+                bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+            if bucket[0] >= cost:
+                bucket[0] -= cost
+                wait = 0.0
+            else:
+                wait = (cost - bucket[0]) / self.rate
+            self._evict(now)
+        return wait
+    
+    def check(self, key, cost=1.0):
+        """
+        Take tokens or raise
+        
+        Raises:
+            RateLimitExceeded: If the client has to wait
+        """
+        wait = self.acquire(key, cost)
+        if wait > 0:
+            raise RateLimitExceeded(self.name, wait)
+    
+    def _evict(self, now):
+        """Drop expired clients from the LRU end, then any over the size bound"""
+        while self._buckets:
+            key, bucket = next(iter(self._buckets.items()))
+            if now - bucket[1] < self.idle_expiry and len(self._buckets) <= self.max_clients:
+                break
+            del self._buckets[key]
+    
+    def __len__(self):
+        return len(self._buckets)
+
+
+class AdmissionControl:
+    """Separate per-client budgets for cheap local skills, model-backed turns and the microphone"""
+    
+    def __init__(self):
+        self.enabled = Config.RATELIMIT_ENABLED
+        self.budgets = {
+            "local": RateLimiter("local", Config.RATELIMIT_LOCAL_RATE, Config.RATELIMIT_LOCAL_BURST),
+            "model": RateLimiter("model", Config.RATELIMIT_MODEL_RATE, Config.RATELIMIT_MODEL_BURST),
+            "voice": RateLimiter("voice", Config.RATELIMIT_VOICE_RATE, Config.RATELIMIT_VOICE_BURST),
+        }
+    
+    @staticmethod
+    def is_known_key(api_key):
+        """True if the key is in the configured allow-list (constant-time compare)"""
+        known = False
+        for allowed in Config.RATELIMIT_API_KEYS:
+            known |= hmac.compare_digest(api_key.encode("utf-8"), allowed.encode("utf-8"))
+        return known
+    
+    @staticmethod
+    def client_key(request):
+        """
+        Identify the caller of a Flask request
+        
+        Returns:
+            str: ``key:<api key>`` for a key in Config.RATELIMIT_API_KEYS,
+                 otherwise ``ip:<address>`` (made-up keys must not buy fresh buckets)
+        """
+        api_key = request.headers.get("X-API-Key")
+        if api_key and AdmissionControl.is_known_key(api_key):
+            return f"key:{api_key}"
+        address = request.remote_addr
+        if Config.RATELIMIT_TRUST_PROXY:
+            forwarded = request.headers.get("X-Forwarded-For", "")
+            address = forwarded.split(",")[0].strip() or address
+        return f"ip:{address}"
+    
+    def check(self, budget, key):
+        """
+        Charge one request to a budget
+        
+        Raises:
+            RateLimitExceeded: If the client is over that budget
+        """
+        if self.enabled:
+            self.budgets[budget].check(key)
@@ -1,32 +1,202 @@
-from flask import Flask, request, jsonify, render_template
+import sys
+from startup import get_startup_profiler
+
+# python speech.py --profile-startup prints where the startup time goes
+startup_profiler = get_startup_profiler()
+if __name__ == '__main__' and "--profile-startup" in sys.argv:
+    startup_profiler.enable()
+
+from flask import Flask, request, jsonify, render_template, g, Response, abort
 import os
+import threading
+import time
 import webbrowser
 from datetime import datetime
+from config import Config
+from tracing import get_tracer
+from health import HealthMonitor, provider_check
+from ratelimit import AdmissionControl, RateLimitExceeded
+import metrics
 
-# Optional: Speech recognition (works only if installed)
-try:
-    import speech_recognition as sr
-    import pyttsx3
-    VOICE_ENABLED = True
-    recognizer = sr.Recognizer()
-    engine = pyttsx3.init()
-except:
-    VOICE_ENABLED = False
-    print("Voice features disabled - speech libraries not installed")
+# Optional: Spoken responses and speech recognition (each works only if installed).
+# They are set up separately, so a missing microphone or ASR model never silences text replies
+with startup_profiler.phase("voice"):
+    try:
+        import pyttsx3
+        engine = pyttsx3.init()
+        TTS_ENABLED = True
+        tts_error = None
+    except Exception as e:
+        TTS_ENABLED = False
+        tts_error = f"pyttsx3 unavailable: {e}"
+        print(f"⚠️  Spoken responses disabled - {tts_error}")
+    
+    recognizer = asr = capture = noise_tracker = preprocessor = None
+    voice_errors = []
+    try:
+        import speech_recognition as sr
+        from voice.recognizers import get_recognizer, UnknownSpeechError
+        from voice.calibration import get_noise_tracker
+        from voice.capture import get_capture_service
+        from voice.preprocess import get_preprocessor
+        recognizer = sr.Recognizer()
+    except Exception as e:
+        voice_errors.append(f"speech libraries unavailable: {e}")
+    
+    if recognizer is not None:
+        try:
+            capture = get_capture_service()
+        except Exception as e:
+            voice_errors.append(f"microphone unavailable: {e}")
+        try:
+            asr = get_recognizer()
+        except Exception as e:
+            voice_errors.append(f"speech recognizer failed to load: {e}")
+        # Listening still works without these, just less well
+        try:
+            noise_tracker = get_noise_tracker()
+        except Exception as e:
+            print(f"⚠️  Noise floor tracking disabled: {e}")
+        try:
+            preprocessor = get_preprocessor()
+        except Exception as e:
+            print(f"⚠️  Audio preprocessing disabled: {e}")
+    
+    VOICE_ENABLED = capture is not None and asr is not None
+    voice_error = "; ".join(voice_errors) or None
+    if not VOICE_ENABLED:
+        print(f"⚠️  Voice commands disabled - {voice_error}")
 
 app = Flask(__name__)
+tracer = get_tracer()
+if tracer.writer is not None:
+    metrics.QUEUE_DEPTH.track(tracer.writer.queue, "trace_writer")
+
+admission = AdmissionControl()
+
+@app.before_request
+def start_trace():
+    """One trace per HTTP request"""
+    g.started = time.perf_counter()
+    metrics.HTTP_IN_FLIGHT.inc()
+    g.trace = tracer.start_trace("http", method=request.method, route=request.path).activate()
+    g.client_key = admission.client_key(request)
+
+@app.errorhandler(RateLimitExceeded)
+def rate_limited(e):
+    metrics.RATELIMIT_REJECTIONS.inc(budget=e.budget)
+    response = jsonify({
+        "status": "error",
+        "message": str(e),
+        "retry_after": round(e.retry_after, 2)
+    })
+    response.status_code = 429
+    response.headers["Retry-After"] = e.retry_after_header
+    return response
+
+@app.after_request
+def record_status(response):
+    g.trace.set(status=response.status_code)
+    # Label by URL rule, not raw path, so unknown URLs cannot blow up the series count
+    route = request.url_rule.rule if request.url_rule else "unmatched"
+    metrics.HTTP_REQUESTS.inc(route=route, method=request.method, status=response.status_code)
+    metrics.HTTP_LATENCY.observe(time.perf_counter() - g.started, route=route, method=request.method)
+    return response
+
+@app.teardown_request
+def end_trace(exc):
+    metrics.HTTP_IN_FLIGHT.dec()
+    trace = g.pop("trace", None)
+    if trace is not None:
+        trace.deactivate()
+        trace.end()
+
+# AI brain for commands the built-in handlers don't know (created on first use).
+# The server is a single-user assistant: every client talks to the same JarvisAI,
+# so they share one conversation, capped at Config.CONVERSATION_HISTORY_LIMIT messages
+ai_brain = None
+ai_failed = False
+ai_lock = threading.Lock()
+
+def get_ai_brain():
+    """Get the shared JarvisAI, or None if disabled / unavailable"""
+    global ai_brain, ai_failed
+    if not Config.SERVER_AI_FALLBACK or ai_failed:
+        return None
+    with ai_lock:
+        if ai_brain is None and not ai_failed:
+            try:
+                from ai_brain import JarvisAI
+                ai_brain = JarvisAI()
+            except Exception as e:
+                ai_failed = True
+                print(f"⚠️  AI fallback disabled: {e}")
+    return ai_brain
+
+# Readiness probe (cached, refreshed every Config.HEALTH_INTERVAL seconds)
+last_capture_position = [None]
+
+def check_microphone():
+    """Capture stream is open and still delivering audio"""
+    if capture is None:
+        return False, voice_error
+    if not capture.is_running:
+        return False, "capture stream closed"
+    previous = last_capture_position[0]
+    position = last_capture_position[0] = capture.position
+    if position == previous:
+        return False, "capture stalled (no audio since the last probe)"
+    return True, f"{capture.sample_rate} Hz capture running"
+
+def check_tts():
+    """Server-side speech engine is available"""
+    if not Config.SERVER_TTS:
+        return True, "spoken responses disabled"
+    if not TTS_ENABLED:
+        return False, tts_error
+    return True, "pyttsx3 engine ready"
+
+health = HealthMonitor()
+if Config.SERVER_AI_FALLBACK:
+    health.add_check("provider", provider_check())
+health.add_check("tts", check_tts, required=Config.HEALTH_REQUIRE_AUDIO)
+health.add_check("microphone", check_microphone, required=Config.HEALTH_REQUIRE_AUDIO)
+health.start()
+
+# Span of the reply being spoken, marked by the engine's first audio
+tts_span = [None]
+
+def on_tts_started(name):
+    """pyttsx3 started-utterance callback"""
+    span, tts_span[0] = tts_span[0], None
+    if span is not None:
+        span.mark("first_audio")
+
+if TTS_ENABLED:
+    engine.connect("started-utterance", on_tts_started)
 
 def speak(text):
     """Text-to-speech (if available)"""
-    if VOICE_ENABLED:
-        try:
-            engine.say(text)
-            engine.runAndWait()
-        except:
-            pass
+    if TTS_ENABLED and Config.SERVER_TTS:
+        started = time.perf_counter()
+        with tracer.span("tts") as span:
+            tts_span[0] = span
+            try:
+                engine.say(text)
+                engine.runAndWait()
+            except:
+                pass
+            tts_span[0] = None
+        metrics.TTS_LATENCY.observe(time.perf_counter() - started)
 
 def execute_command(command):
     """Process command and return response"""
+    with tracer.span("intent") as span:
+        response = _execute_command(command)
+        span.set(chars=len(response))
+    return response
+
+def _execute_command(command):
     command = command.lower().strip()
     
     if "time" in command:
@@ -77,6 +247,11 @@ def execute_command(command):
 - System commands"""
     
     else:
+        brain = get_ai_brain()
+        if brain:
+            admission.check("model", g.client_key)
+            response, _ = brain.process_command(command)
+            return response
         return f"I received your command: '{command}'. I'm still learning this one!"
 
 # Routes
@@ -89,6 +264,7 @@ def home():
 @app.route('/api/command', methods=['POST'])
 def api_command():
     """Execute text command via API"""
+    admission.check("local", g.client_key)
     try:
         data = request.json
         command = data.get('command', '')
@@ -107,6 +283,8 @@ def api_command():
             "command": command,
             "response": response
         })
+    except RateLimitExceeded:
+        raise
     except Exception as e:
         return jsonify({
             "status": "error",
@@ -119,14 +297,24 @@ def api_voice():
     if not VOICE_ENABLED:
         return jsonify({
             "status": "error",
-            "message": "Voice features not available"
+            "message": f"Voice features not available - {voice_error}"
         }), 400
     
+    admission.check("voice", g.client_key)
     try:
-        with sr.Microphone() as source:
-            recognizer.adjust_for_ambient_noise(source, duration=0.5)
-            audio = recognizer.listen(source, timeout=5, phrase_time_limit=5)
-            command = recognizer.recognize_google(audio)
+        with capture.source() as source:
+            if noise_tracker:
+                noise_tracker.apply(recognizer)
+            try:
+                with tracer.span("capture"):
+                    audio = recognizer.listen(source, timeout=5, phrase_time_limit=5)
+            finally:
+                if noise_tracker:
+                    noise_tracker.sync(recognizer)
+            with tracer.span("asr", backend=asr.name):
+                if preprocessor:
+                    audio = preprocessor.process(audio)
+                command = asr.recognize(audio)
             response = execute_command(command)
             
             return jsonify({
@@ -139,11 +327,13 @@ def api_voice():
             "status": "error",
             "message": "No speech detected"
         }), 400
-    except sr.UnknownValueError:
+    except UnknownSpeechError:
         return jsonify({
             "status": "error",
             "message": "Could not understand audio"
         }), 400
+    except RateLimitExceeded:
+        raise
     except Exception as e:
         return jsonify({
             "status": "error",
@@ -153,19 +343,47 @@ def api_voice():
 @app.route('/api/status', methods=['GET'])
 def api_status():
     """Check server status"""
+    report = health.snapshot()
     return jsonify({
         "status": "online",
         "name": "Jarvis",
         "version": "2.0",
-        "voice_enabled": VOICE_ENABLED
+        "voice_enabled": VOICE_ENABLED and health.is_ok("microphone"),
+        "ready": report["ready"],
+        "checks": {name: result["ok"] for name, result in report["checks"].items()}
     })
 
+@app.route('/health/live', methods=['GET'])
+def health_live():
+    """Liveness: the process is up and serving requests"""
+    return jsonify({"status": "alive"})
+
+@app.route('/health/ready', methods=['GET'])
+def health_ready():
+    """Readiness from the cached background probe (503 when not ready)"""
+    report = health.snapshot()
+    return jsonify(report), 200 if report["ready"] else 503
+
+@app.route('/metrics', methods=['GET'])
+def api_metrics():
+    """Prometheus metrics (text exposition format)"""
+    if not Config.METRICS_ENABLED:
+        abort(404)
+    return Response(metrics.REGISTRY.render(), mimetype=metrics.CONTENT_TYPE)
+
 if __name__ == '__main__':
     print("\n" + "="*50)
     print("🤖 JARVIS AI Assistant - Flask Server")
     print("="*50)
-    print(f"✅ Server running at: http://localhost:5000")
+    print(f"✅ Server running at: http://localhost:{Config.SERVER_PORT}")
     print(f"✅ Voice features: {'Enabled' if VOICE_ENABLED else 'Disabled'}")
+    print(f"✅ Spoken responses: {'Enabled' if Config.SERVER_TTS and TTS_ENABLED else 'Disabled'}")
+    print(f"✅ AI fallback: {Config.AI_PROVIDER if Config.SERVER_AI_FALLBACK else 'Disabled'}")
+    print(f"✅ Metrics: {'/metrics' if Config.METRICS_ENABLED else 'Disabled'}")
     print("="*50 + "\n")
     
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    startup_profiler.finish()
+    if "--profile-startup" in sys.argv:
+        startup_profiler.report()
+    
+    app.run(debug=Config.SERVER_DEBUG, host=Config.SERVER_HOST, port=Config.SERVER_PORT)
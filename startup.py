@@ -0,0 +1,124 @@
+"""
+JARVIS Startup Profiler
+Per-phase and per-import timing of application startup, printed by the
+entry points when started with --profile-startup
+"""
+
+import builtins
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+
+class StartupProfiler:
+    """Times named startup phases and every module imported while enabled"""
+    
+    def __init__(self):
+        self.enabled = False
+        self.started = time.perf_counter()
+        self.finished = None
+        self.phases = []  # (name, seconds) in the order they ran
+        self.imports = {}  # module -> (inclusive seconds, self seconds)
+        self._stack = []  # child import time of the imports in progress
+        self._thread_id = None
+        self._original_import = None
+    
+    def enable(self):
+        """Start timing imports (made on the calling thread)"""
+        if not self.enabled:
+            self.enabled = True
+            self._thread_id = threading.get_ident()
+            self._original_import = builtins.__import__
+            builtins.__import__ = self._import
+        return self
+    
+    def disable(self):
+        """Stop timing imports"""
+        if self.enabled:
+            builtins.__import__ = self._original_import
+            self.enabled = False
+    
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        # Only first-time absolute imports on the profiled thread are timed
+        if level or name in sys.modules or threading.get_ident() != self._thread_id:
+            return self._original_import(name, globals, locals, fromlist, level)
+        children = [0.0]
+        self._stack.append(children)
+        started = time.perf_counter()
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - started
+            self._stack.pop()
+            if self._stack:
+                self._stack[-1][0] += elapsed
+            self.imports[name] = (elapsed, elapsed - children[0])
+    
+    @contextmanager
+    def phase(self, name):
+        """Time a block of startup work (a no-op cost when disabled)"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - started))
+    
+    def finish(self):
+        """Mark startup complete and stop timing imports"""
+        if self.finished is None:
+            self.finished = time.perf_counter()
+        self.disable()
+    
+    @property
+    def total(self):
+        """Seconds from profiler creation to finish() (or now)"""
+        return (self.finished or time.perf_counter()) - self.started
+    
+    def as_dict(self, top=20):
+        """
+        Startup timings
+        
+        Returns:
+            dict: total_ms, phases and the ``top`` slowest imports by self time (ms)
+        """
+        slowest = sorted(self.imports.items(), key=lambda item: item[1][1], reverse=True)[:top]
+        return {
+            "total_ms": round(self.total * 1000, 1),
+            "phases": [{"name": name, "ms": round(seconds * 1000, 1)} for name, seconds in self.phases],
+            "imports": [{"module": module, "ms": round(inclusive * 1000, 1), "self_ms": round(own * 1000, 1)}
+                        for module, (inclusive, own) in slowest],
+            "modules_imported": len(self.imports),
+        }
+    
+    def report(self, top=15):
+        """Print the per-phase and per-import breakdown"""
+        data = self.as_dict(top)
+        print("\n" + "="*60)
+        print(f"⏱️  Startup profile: {data['total_ms']:.0f} ms total")
+        print("="*60)
+        print(f"{'phase':<30}{'ms':>10}{'share':>10}")
+        for phase in data["phases"]:
+            share = phase["ms"] / data["total_ms"] * 100 if data["total_ms"] else 0
+            print(f"{phase['name']:<30}{phase['ms']:10.1f}{share:9.0f}%")
+        print(f"\nSlowest of {data['modules_imported']} imports (self time excludes nested imports)")
+        print(f"{'module':<40}{'ms':>10}{'self ms':>10}")
+        for entry in data["imports"]:
+            print(f"{entry['module']:<40}{entry['ms']:10.1f}{entry['self_ms']:10.1f}")
+        print("="*60 + "\n")
+    
+    def write_json(self, path, top=50):
+        with open(path, "w") as f:
+            json.dump(self.as_dict(top), f, indent=2)
+
+
+_profiler = None
+
+
+def get_startup_profiler():
+    """Get the process-wide startup profiler (disabled until enable())"""
+    global _profiler
+    if _profiler is None:
+        _profiler = StartupProfiler()
+    return _profiler
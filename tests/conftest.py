@@ -0,0 +1,16 @@
+"""
+JARVIS Test Configuration
+Puts the project root on sys.path and keeps tests away from real providers,
+microphones and the user's trace / noise profile files
+"""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+os.environ.setdefault("AI_PROVIDER", "fake")
+os.environ.setdefault("ASR_BACKEND", "stub")
+os.environ.setdefault("TRACE_ENABLED", "0")
+os.environ.setdefault("SERVER_TTS", "0")
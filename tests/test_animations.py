@@ -0,0 +1,28 @@
+"""Wall-time animation steps"""
+
+import pytest
+
+from ui.animations import AnimationEngine
+
+
+@pytest.mark.parametrize("fps", [20, 60, 120, 144])
+def test_rotation_speed_does_not_depend_on_the_frame_rate(monkeypatch, fps):
+    now = [0.0]
+    monkeypatch.setattr("ui.animations.time.monotonic", lambda: now[0])
+    engine = AnimationEngine()
+    engine.update_arc_reactor()
+    for _ in range(fps):
+        now[0] += 1.0 / fps
+        engine.update_arc_reactor(degrees_per_second=40.0)
+    assert engine.arc_reactor_angle == pytest.approx(40.0)
+
+
+def test_angle_wraps_around(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr("ui.animations.time.monotonic", lambda: now[0])
+    engine = AnimationEngine()
+    engine.update_arc_reactor()
+    for _ in range(100):
+        now[0] += 0.1
+        engine.update_arc_reactor(degrees_per_second=40.0)
+    assert engine.arc_reactor_angle == pytest.approx(400.0 % 360)
@@ -0,0 +1,62 @@
+"""Noise floor tracking from idle audio"""
+
+import numpy as np
+import pytest
+
+from config import Config
+from voice.calibration import NoiseFloorTracker
+
+
+def noise(level, samples=480, seed=0):
+    """One int16 frame of white noise with roughly the given rms"""
+    rng = np.random.default_rng(seed)
+    return (level * rng.standard_normal(samples)).astype(np.int16).tobytes()
+
+
+@pytest.fixture
+def tracker(tmp_path):
+    return NoiseFloorTracker(tmp_path / "noise_profile.json")
+
+
+def settle(tracker, level, frames):
+    for index in range(frames):
+        tracker.observe(noise(level, seed=index))
+
+
+def test_threshold_follows_a_quiet_room(tracker):
+    settle(tracker, 100, 200)
+    assert tracker.noise_rms == pytest.approx(100, rel=0.1)
+    assert tracker.energy_threshold == pytest.approx(100 * Config.NOISE_THRESHOLD_RATIO, rel=0.1)
+
+
+def test_speech_with_pauses_does_not_raise_the_floor(tracker):
+    settle(tracker, 100, 200)
+    threshold = tracker.energy_threshold
+    for index in range(2 * Config.NOISE_RISE_WINDOW):
+        # Two seconds of talking, one second of pause
+        level = 2000 if index % 100 < 66 else 100
+        tracker.observe(noise(level, seed=index))
+    assert tracker.energy_threshold == pytest.approx(threshold, rel=0.1)
+
+
+def test_floor_follows_a_step_increase_in_background_noise(tracker):
+    settle(tracker, 100, 200)  # e.g. a profile saved in a quiet session
+    settle(tracker, 400, 2 * Config.NOISE_RISE_WINDOW)
+    assert tracker.noise_rms == pytest.approx(400, rel=0.15)
+    assert tracker.energy_threshold > 400  # silence ends an utterance again
+
+
+@pytest.mark.parametrize("width, frame", [
+    (1, np.full(480, 128 + 4, dtype=np.uint8).tobytes()),
+    (2, np.full(480, 1024, dtype="<i2").tobytes()),
+    (4, np.full(480, 1024 << 16, dtype="<i4").tobytes()),
+])
+def test_sample_widths_share_the_16_bit_scale(tracker, width, frame):
+    tracker.is_calibrated = False
+    tracker.observe(frame, width)
+    assert tracker.noise_rms == pytest.approx(1024)
+
+
+def test_unsupported_sample_width_is_rejected(tracker):
+    with pytest.raises(ValueError):
+        tracker.observe(bytes(30), 3)
@@ -0,0 +1,45 @@
+"""Capture ring buffer addressing and wraparound"""
+
+from voice.capture import RingBuffer
+
+
+def test_read_back_before_wrapping():
+    ring = RingBuffer(8)
+    ring.write(b"abcd")
+    assert ring.read_bytes(0) == b"abcd"
+    assert ring.read_bytes(1, 3) == b"bc"
+    assert ring.oldest_pos() == 0
+
+
+def test_wraparound_keeps_the_newest_bytes():
+    ring = RingBuffer(8)
+    ring.write(b"abcdef")
+    ring.write(b"ghij")  # wraps: "ij" lands at the start of the buffer
+    assert ring.write_pos == 10
+    assert ring.oldest_pos() == 2
+    views = ring.read(2)
+    assert len(views) == 2  # split across the end of the buffer
+    assert b"".join(views) == b"cdefghij"
+    assert ring.read_bytes(7, 10) == b"hij"
+
+
+def test_reads_are_clamped_to_the_retained_range():
+    ring = RingBuffer(8)
+    ring.write(b"abcdefghij")
+    assert ring.read_bytes(0, 4) == b"cd"  # bytes 0-1 were overwritten
+    assert ring.read_bytes(8, 99) == b"ij"  # nothing past the write position
+    assert ring.read(10) == []
+
+
+def test_write_larger_than_capacity_keeps_its_tail():
+    ring = RingBuffer(4)
+    ring.write(b"0123456789")
+    assert ring.write_pos == 10
+    assert ring.read_bytes(ring.oldest_pos()) == b"6789"
+
+
+def test_capacity_is_rounded_down_to_whole_frames():
+    ring = RingBuffer(9, frame_size=2)
+    assert ring.capacity == 8
+    ring.write(bytes(range(12)))
+    assert ring.read_bytes(ring.oldest_pos()) == bytes(range(4, 12))
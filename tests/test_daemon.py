@@ -0,0 +1,79 @@
+"""Control commands of the headless daemon (stub ASR, fake AI, no microphone or speech output)"""
+
+import pytest
+
+pytest.importorskip("speech_recognition")
+
+from config import Config
+from daemon import AssistantDaemon
+
+
+@pytest.fixture
+def headless(monkeypatch, tmp_path):
+    """No microphone and a throwaway noise profile"""
+    monkeypatch.setattr(Config, "NOISE_PROFILE_PATH", str(tmp_path / "noise_profile.json"))
+    monkeypatch.setattr(Config, "BARGEIN_ENABLED", False)
+    
+    def no_microphone():
+        raise OSError("no input device")
+    monkeypatch.setattr("voice.capture.get_capture_service", no_microphone)
+
+
+@pytest.fixture
+def daemon(headless):
+    assistant = AssistantDaemon(mode="trigger", tts=False)
+    yield assistant
+    assistant.pipeline.stop()  # never started - the queues are inspected instead
+
+
+def queued(stage):
+    return list(stage.queue.queue)
+
+
+def test_ask_queues_a_typed_command(daemon):
+    assert daemon.handle("ask  what time is it ") == {"ok": True, "detail": "queued"}
+    assert [turn.text for turn in queued(daemon.pipeline.intent)] == ["what time is it"]
+
+
+def test_say_queues_speech(daemon):
+    assert daemon.handle("SAY hello there")["ok"]
+    assert [turn.response for turn in queued(daemon.pipeline.tts)] == ["hello there"]
+
+
+def test_stop_drops_queued_replies(daemon):
+    daemon.handle("say one")
+    daemon.handle("say two")
+    assert daemon.handle("stop") == {"ok": True, "detail": "stopped"}
+    assert queued(daemon.pipeline.tts) == []
+
+
+def test_listen_without_a_microphone(daemon):
+    assert daemon.capture is None
+    assert daemon.handle("listen") == {"ok": False, "error": "no microphone"}
+
+
+def test_status_reports_the_pipeline(daemon):
+    reply = daemon.handle("status")
+    assert reply["ok"]
+    assert reply["status"]["mode"] == "trigger"
+    assert [stage["name"] for stage in reply["status"]["pipeline"]["stages"]] == ["asr", "intent", "tts"]
+
+
+@pytest.mark.parametrize("line", ["dance", "ask", "say   ", ""])
+def test_unknown_or_incomplete_commands_are_rejected(daemon, line):
+    reply = daemon.handle(line)
+    assert not reply["ok"]
+    assert "unknown command" in reply["error"]
+
+
+def test_starts_without_speech_recognition(monkeypatch, headless):
+    def no_model():
+        raise RuntimeError("Vosk model not found")
+    monkeypatch.setattr("voice.recognizers.get_recognizer", no_model)
+    assistant = AssistantDaemon(mode="trigger", tts=False)
+    try:
+        assert assistant.asr is None
+        assert assistant.handle("listen") == {"ok": False, "error": "voice unavailable"}
+        assert assistant.handle("ask hello")["ok"]
+    finally:
+        assistant.pipeline.stop()
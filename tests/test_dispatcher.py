@@ -0,0 +1,105 @@
+"""Coalescing, ordering and idle wake-up of the UI dispatcher"""
+
+import itertools
+
+from ui.dispatcher import UIDispatcher, WAKE_EVENT
+
+
+class FakeRoot:
+    """Records what the dispatcher schedules on the Tk window"""
+    
+    def __init__(self):
+        self.scheduled = {}
+        self.bindings = {}
+        self.generated = []
+        self._ids = itertools.count(1)
+    
+    def after(self, ms, fn):
+        after_id = f"after#{next(self._ids)}"
+        self.scheduled[after_id] = (ms, fn)
+        return after_id
+    
+    def after_cancel(self, after_id):
+        self.scheduled.pop(after_id, None)
+    
+    def bind(self, sequence, fn, add=None):
+        self.bindings[sequence] = fn
+    
+    def event_generate(self, sequence, when=None):
+        self.generated.append(sequence)
+
+
+def test_updates_apply_in_first_posted_order():
+    ui = UIDispatcher(FakeRoot(), interval_ms=10, idle_interval_ms=80)
+    calls = []
+    ui.latest("status", calls.append, "status 1")
+    ui.post(calls.append, "call 1")
+    ui.append("log", calls.append, "line 1")
+    ui.post(calls.append, "call 2")
+    ui.latest("status", calls.append, "status 2")
+    ui.append("log", calls.append, "line 2")
+    
+    assert ui.flush() == 4
+    assert calls == ["status 2", "call 1", ["line 1", "line 2"], "call 2"]
+    assert ui.coalesced == 2
+    assert ui.flush() == 0
+
+
+def test_updates_posted_while_flushing_are_applied_in_the_same_flush():
+    ui = UIDispatcher(FakeRoot())
+    calls = []
+    ui.post(lambda: ui.post(calls.append, "follow-up"))
+    ui.flush()
+    assert calls == ["follow-up"]
+
+
+def test_failing_update_does_not_stop_the_rest():
+    ui = UIDispatcher(FakeRoot())
+    calls = []
+    ui.post(lambda: 1 / 0)
+    ui.post(calls.append, "after")
+    assert ui.flush() == 2
+    assert calls == ["after"]
+    assert ui.applied == 1
+
+
+def test_drain_backs_off_when_quiet_and_speeds_up_on_updates():
+    root = FakeRoot()
+    ui = UIDispatcher(root, interval_ms=10, idle_interval_ms=80)
+    for expected in (20, 40, 80, 80):
+        ui._drain()
+        assert ui._delay == expected
+    ui.post(lambda: None)
+    ui._drain()
+    assert ui._delay == 10
+    assert list(root.scheduled.values())[-1] == (10, ui._drain)
+
+
+def test_first_post_after_a_quiet_period_wakes_the_tk_loop():
+    root = FakeRoot()
+    ui = UIDispatcher(root, interval_ms=10, idle_interval_ms=80)
+    ui._delay = 10
+    ui.post(lambda: None)
+    assert not ui._wake.is_set()  # polling quickly anyway
+    ui.flush()
+    
+    ui._delay = 80
+    ui.post(lambda: None)
+    assert ui._wake.is_set()
+    ui._wake.clear()
+    ui.post(lambda: None)
+    assert not ui._wake.is_set()  # only the first update of a batch wakes
+
+
+def test_wake_event_drains_at_once():
+    root = FakeRoot()
+    ui = UIDispatcher(root, interval_ms=10, idle_interval_ms=80).start()
+    try:
+        calls = []
+        ui._delay = 80
+        ui.post(calls.append, "now")
+        root.bindings[WAKE_EVENT](None)
+        assert calls == ["now"]
+        assert ui._delay == 10
+    finally:
+        ui.stop()
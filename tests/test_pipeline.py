@@ -0,0 +1,82 @@
+"""Voice pipeline stage queues: overflow, stop and cancel"""
+
+import threading
+
+from voice.pipeline import Stage, Turn, VoicePipeline
+from voice.recognizers import StubRecognizer
+
+
+def make_stage(maxsize=2):
+    done = []
+    stage = Stage("test", lambda turn: None, maxsize, on_done=done.append)
+    return stage, done
+
+
+def queued(stage):
+    return list(stage.queue.queue)
+
+
+def test_overflow_finishes_the_oldest_turn():
+    stage, done = make_stage()
+    first, second, third = Turn(), Turn(), Turn()
+    for turn in (first, second, third):
+        stage.put(turn, block=False)
+    assert queued(stage) == [second, third]
+    assert done == [first]
+    assert stage.dropped == 1
+
+
+def test_overflow_never_drops_a_pending_stop():
+    stage, done = make_stage()
+    stage.put(Turn(), block=False)
+    stage.stop()
+    late = Turn()
+    stage.put(late, block=False)
+    assert None in queued(stage)
+    assert done == [late]  # the stage is stopping - it would never run
+
+
+def test_stop_does_not_block_on_a_full_queue():
+    stage, done = make_stage()
+    oldest, newest = Turn(), Turn()
+    stage.put(oldest, block=False)
+    stage.put(newest, block=False)
+    stopper = threading.Thread(target=stage.stop)
+    stopper.start()
+    stopper.join(timeout=1.0)
+    assert not stopper.is_alive()
+    assert queued(stage) == [newest, None]
+    assert done == [oldest]
+    stage.stop()  # stopping twice is harmless
+    assert queued(stage) == [newest, None]
+
+
+def test_stop_from_a_stage_callback_returns():
+    spoken = threading.Event()
+    pipeline = None
+    
+    def on_event(event, turn, detail=None):
+        if event == "spoken":
+            pipeline.stop()  # like jarvis_test.py, on the tts thread
+            spoken.set()
+    
+    pipeline = VoicePipeline(StubRecognizer(), lambda text: text, lambda text: None,
+                             on_event=on_event, preprocessor=None)
+    for index in range(pipeline.tts.queue.maxsize):
+        pipeline.tts.put(Turn(), block=False)
+    pipeline.say("hello")
+    pipeline.start()
+    assert spoken.wait(1.0)
+    pipeline.tts._thread.join(timeout=1.0)
+    assert not pipeline.tts._thread.is_alive()
+
+
+def test_cancel_speech_finishes_queued_replies():
+    events = []
+    pipeline = VoicePipeline(StubRecognizer(), lambda text: text, lambda text: None,
+                             on_event=lambda event, turn, detail=None: events.append(event))
+    pipeline.say("one")
+    pipeline.say("two")
+    assert pipeline.cancel_speech() == 2
+    assert events == ["done", "done"]
+    assert queued(pipeline.tts) == []
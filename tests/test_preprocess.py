@@ -0,0 +1,23 @@
+"""Resampling keeps the output aligned with the input"""
+
+import numpy as np
+import pytest
+
+from voice.preprocess import AudioPreprocessor
+
+
+@pytest.mark.parametrize("size", [1, 10, 62, 63, 64, 4800])
+def test_downsampling_length_matches_the_rate_ratio(size):
+    preprocessor = AudioPreprocessor(target_rate=16000)
+    x = np.random.default_rng(0).standard_normal(size).astype(np.float32)
+    assert preprocessor._resample(x, 48000).size == len(range(0, size, 3))
+    assert preprocessor._resample(x, 44100).size == int(size * 16000 / 44100)
+
+
+def test_filter_matches_same_mode_for_long_inputs():
+    preprocessor = AudioPreprocessor(target_rate=16000)
+    x = np.random.default_rng(1).standard_normal(4800).astype(np.float32)
+    preprocessor._resample(x, 48000)
+    kernel = preprocessor._kernels[48000]
+    expected = np.convolve(x, kernel, mode="same")[::3]
+    assert np.allclose(preprocessor._resample(x, 48000), expected)
@@ -0,0 +1,73 @@
+"""Token buckets, client keys and the 429 path of the HTTP API"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from config import Config
+from ratelimit import AdmissionControl, RateLimiter, RateLimitExceeded
+
+
+def fake_request(api_key=None, address="10.0.0.1", forwarded=None):
+    headers = {}
+    if api_key:
+        headers["X-API-Key"] = api_key
+    if forwarded:
+        headers["X-Forwarded-For"] = forwarded
+    return SimpleNamespace(headers=headers, remote_addr=address)
+
+
+def test_burst_then_refill(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("ratelimit.time.monotonic", lambda: now[0])
+    limiter = RateLimiter("test", rate=2, burst=3)
+    assert [limiter.acquire("a") for _ in range(3)] == [0, 0, 0]
+    assert limiter.acquire("a") == pytest.approx(0.5)
+    now[0] += 0.5
+    assert limiter.acquire("a") == 0
+    assert limiter.acquire("b") == 0  # other clients have their own bucket
+
+
+def test_check_raises_with_retry_after():
+    limiter = RateLimiter("model", rate=0.5, burst=1)
+    limiter.check("a")
+    with pytest.raises(RateLimitExceeded) as error:
+        limiter.check("a")
+    assert error.value.budget == "model"
+    assert error.value.retry_after_header == "2"
+
+
+def test_client_table_is_bounded():
+    limiter = RateLimiter("test", rate=1, burst=1, max_clients=3)
+    for client in "abcde":
+        limiter.acquire(client)
+    assert len(limiter) == 3
+
+
+def test_client_key_uses_ip_for_unknown_api_keys(monkeypatch):
+    monkeypatch.setattr(Config, "RATELIMIT_API_KEYS", ["secret"])
+    assert AdmissionControl.client_key(fake_request()) == "ip:10.0.0.1"
+    assert AdmissionControl.client_key(fake_request("secret")) == "key:secret"
+    assert AdmissionControl.client_key(fake_request("made-up")) == "ip:10.0.0.1"
+
+
+def test_client_key_forwarded_only_behind_trusted_proxy(monkeypatch):
+    request = fake_request(forwarded="1.2.3.4, 10.0.0.1")
+    monkeypatch.setattr(Config, "RATELIMIT_TRUST_PROXY", False)
+    assert AdmissionControl.client_key(request) == "ip:10.0.0.1"
+    monkeypatch.setattr(Config, "RATELIMIT_TRUST_PROXY", True)
+    assert AdmissionControl.client_key(request) == "ip:1.2.3.4"
+
+
+def test_rotating_api_keys_are_still_limited(monkeypatch):
+    speech = pytest.importorskip("speech")
+    monkeypatch.setattr(Config, "RATELIMIT_API_KEYS", [])
+    monkeypatch.setattr(speech, "admission", AdmissionControl())
+    client = speech.app.test_client()
+    statuses = [
+        client.post("/api/command", json={"command": "what time is it"},
+                    headers={"X-API-Key": f"rotating-{i}"}).status_code
+        for i in range(Config.RATELIMIT_LOCAL_BURST + 5)
+    ]
+    assert 429 in statuses
+    assert len(speech.admission.budgets["local"]) == 1
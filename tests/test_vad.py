@@ -0,0 +1,74 @@
+"""Utterance segmentation from per-frame speech flags"""
+
+import numpy as np
+
+from config import Config
+from voice.vad import UtteranceSegmenter
+
+FRAME = 0.03
+
+
+def flags(*runs):
+    """Frame flags from (is_speech, frame count) runs"""
+    return np.concatenate([np.full(count, bool(speech)) for speech, count in runs])
+
+
+def hangover_frames(segmenter):
+    return int(segmenter.hangover / FRAME)
+
+
+def test_silence_yields_nothing():
+    segmenter = UtteranceSegmenter(FRAME)
+    assert segmenter.push(flags((0, 100))) == []
+    assert segmenter.frame_index == 100
+
+
+def test_utterance_ends_after_the_hangover():
+    segmenter = UtteranceSegmenter(FRAME)
+    silence = hangover_frames(segmenter)
+    assert segmenter.push(flags((0, 5), (1, 20), (0, silence - 1))) == []
+    assert segmenter.push(flags((0, 1))) == [(5, 25)]
+    assert not segmenter.in_speech
+
+
+def test_blips_and_short_bursts_are_ignored():
+    segmenter = UtteranceSegmenter(FRAME)
+    silence = hangover_frames(segmenter)
+    # Shorter than the onset, then long enough to start but shorter than the minimum
+    blip = Config.VAD_ONSET_FRAMES - 1
+    burst = segmenter.min_frames - 1
+    assert segmenter.push(flags((1, blip), (0, 5), (1, burst), (0, silence))) == []
+
+
+def test_result_does_not_depend_on_batching():
+    stream = flags((0, 7), (1, 15), (0, 4), (1, 12), (0, 60), (1, 30), (0, 60))
+    whole = UtteranceSegmenter(FRAME).push(stream)
+    segmenter = UtteranceSegmenter(FRAME)
+    batched = []
+    for start in range(0, stream.size, Config.VAD_BATCH_FRAMES):
+        batched += segmenter.push(stream[start:start + Config.VAD_BATCH_FRAMES])
+    assert batched == whole
+    assert len(whole) == 2
+
+
+def test_long_speech_is_cut_at_the_maximum_length():
+    segmenter = UtteranceSegmenter(FRAME)
+    longest = segmenter.max_frames
+    result = segmenter.push(flags((1, longest * 2 + 5)))
+    assert result == [(0, longest), (longest, 2 * longest)]
+
+
+def test_pauses_inside_an_utterance_lengthen_the_hangover():
+    segmenter = UtteranceSegmenter(FRAME)
+    before = segmenter.hangover
+    pause = hangover_frames(segmenter) - 1
+    segmenter.push(flags((1, 10), (0, pause), (1, 10), (0, pause), (1, 10)))
+    assert segmenter.in_speech  # the pauses did not end it
+    assert before < segmenter.hangover <= Config.VAD_MAX_HANGOVER
+
+
+def test_reset_forgets_a_partial_utterance():
+    segmenter = UtteranceSegmenter(FRAME)
+    segmenter.push(flags((1, 20)))
+    segmenter.reset()
+    assert segmenter.push(flags((0, 100))) == []
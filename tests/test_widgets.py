@@ -0,0 +1,96 @@
+"""Conversation log trimming line math (without a display)"""
+
+import pytest
+
+pytest.importorskip("customtkinter")
+
+from ui.widgets import ConversationText
+
+
+class FakeText:
+    """Just enough of a Tk text widget: line.column indices over one string"""
+    
+    def __init__(self):
+        self.text = ""
+        self.following = True
+    
+    def insert(self, index, text):
+        self.text = text + self.text if index == "1.0" else self.text + text
+    
+    def delete(self, start, end):
+        assert start == "1.0"
+        line = int(end.split(".")[0])
+        self.text = "".join(self.text.splitlines(keepends=True)[line - 1:])
+    
+    def yview(self, index=None):
+        return (0.0, 1.0 if self.following else 0.5)
+
+
+def make_log(view_messages=4, trim_batch=2, store_messages=10):
+    log = ConversationText.__new__(ConversationText)
+    fake = FakeText()
+    log._textbox = fake
+    log.insert = fake.insert
+    log.delete = fake.delete
+    log.see = log.configure = lambda *args, **kwargs: None
+    log.view_messages = view_messages
+    log.trim_batch = trim_batch
+    log.store_messages = max(store_messages, view_messages + trim_batch)
+    log._store = []
+    log._shown = 0
+    log._loading = False
+    return log, fake
+
+
+def shown(log):
+    return "".join(log._store[len(log._store) - log._shown:])
+
+
+def test_trim_removes_whole_messages():
+    log, fake = make_log()
+    log._store = [log.format_message("YOU", "hi"), "\nJARVIS: line one\nline two\n", log.format_message("YOU", "x")]
+    log._shown = 3
+    fake.text = "".join(log._store)
+    log._trim(2)
+    assert fake.text == log.format_message("YOU", "x")
+    assert log._shown == 1
+
+
+def test_widget_keeps_the_newest_messages_while_following():
+    log, fake = make_log()
+    for index in range(7):
+        log.add_message("YOU", f"message {index}\nsecond line")
+    assert log._shown == 5  # trimmed in a batch of 2 once 2 over the view size
+    assert fake.text == shown(log)
+    assert "message 6" in fake.text and "message 1" not in fake.text
+
+
+def test_streamed_chunks_join_the_newest_message():
+    log, fake = make_log()
+    for index in range(5):
+        log.write([(f"\nJARVIS: ", True), ("part", False), (f" {index}\n", False)])
+    log.append_text("more\n")
+    assert len(log._store) == 5
+    assert log._store[-1] == "\nJARVIS: part 4\nmore\n"
+    log.add_message("YOU", "last")
+    assert fake.text == shown(log)
+
+
+def test_no_trim_while_scrolled_back_until_half_the_store():
+    log, fake = make_log(store_messages=16)
+    fake.following = False
+    for index in range(8):
+        log.add_message("YOU", str(index))
+    assert log._shown == 8
+    log.add_message("YOU", "8")
+    assert log._shown == 4  # over half the store - trimmed anyway
+    assert fake.text == shown(log)
+
+
+def test_store_forgets_the_oldest_messages():
+    log, fake = make_log(store_messages=6)
+    for index in range(20):
+        log.add_message("YOU", str(index))
+    assert len(log._store) <= 6 + 2
+    assert log._store[-1] == log.format_message("YOU", "19")
+    assert fake.text == shown(log)
@@ -0,0 +1,82 @@
+"""Worker supervisor restart and give-up decisions (no processes are started)"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from voice.workers import WorkerSupervisor, _EXIT_FATAL
+
+
+class FakeWorker:
+    """A worker whose process has exited with ``exitcode``"""
+    
+    def __init__(self, exitcode=1):
+        self.name = "asr"
+        self.process = SimpleNamespace(exitcode=exitcode)
+        self.is_alive = False
+        self.stopped = False
+        self.failed = None
+        self.crashes = []
+        self.restarts = 0
+        self.starts = 0
+    
+    def start(self):
+        self.starts += 1
+        return self
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("voice.workers.time.monotonic", lambda: now[0])
+    return now
+
+
+def test_crashed_worker_is_restarted(clock):
+    worker = FakeWorker()
+    assert WorkerSupervisor(max_restarts=3).check(worker)
+    assert worker.starts == 1 and worker.restarts == 1
+    assert worker.crashes == [1000.0]
+
+
+def test_live_stopped_or_failed_workers_are_left_alone(clock):
+    supervisor = WorkerSupervisor(max_restarts=3)
+    alive = FakeWorker()
+    alive.is_alive = True
+    stopped = FakeWorker()
+    stopped.stopped = True
+    failed = FakeWorker()
+    failed.failed = "crashed 4 times in a minute"
+    never_started = FakeWorker()
+    never_started.process = None
+    for worker in (alive, stopped, failed, never_started):
+        assert not supervisor.check(worker)
+        assert worker.starts == 0
+
+
+def test_fatal_start_up_error_is_not_retried(clock):
+    worker = FakeWorker(exitcode=_EXIT_FATAL)
+    assert not WorkerSupervisor(max_restarts=3).check(worker)
+    assert worker.failed == "could not start"
+    assert worker.starts == 0
+
+
+def test_gives_up_after_too_many_crashes_in_a_minute(clock):
+    supervisor = WorkerSupervisor(max_restarts=3)
+    worker = FakeWorker()
+    for _ in range(3):
+        assert supervisor.check(worker)
+        clock[0] += 5
+    assert not supervisor.check(worker)
+    assert worker.failed == "crashed 4 times in a minute"
+    assert worker.starts == 3
+
+
+def test_old_crashes_do_not_count(clock):
+    supervisor = WorkerSupervisor(max_restarts=3)
+    worker = FakeWorker()
+    for _ in range(10):
+        assert supervisor.check(worker)
+        clock[0] += 30  # two crashes per minute at most
+    assert worker.failed is None
+    assert worker.restarts == 10
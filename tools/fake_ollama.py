@@ -0,0 +1,284 @@
+"""
+JARVIS Fake Ollama Server
+Stand-in for the Ollama HTTP API (chat with and without streaming, model
+listing, version) with configurable time-to-first-token, token rate and
+error injection, for offline and reproducible provider benchmarks
+
+Usage:
+    python -m tools.fake_ollama --port 11435 --ttft 0.2 --tokens-per-second 40
+    OLLAMA_BASE_URL=http://127.0.0.1:11435 python main.py
+"""
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def _timestamp():
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+class FakeModel:
+    """Timing and failure behaviour of the fake model"""
+    
+    def __init__(self, name="llama3.2", ttft=0.15, tokens_per_second=50.0, reply_tokens=24,
+                 error_rate=0.0, stream_error_rate=0.0, seed=0):
+        """
+        Args:
+            name: Model name reported by /api/tags (requests for any model are served)
+            ttft: Seconds before the first token
+            tokens_per_second: Generation speed after the first token (0 = instant)
+            reply_tokens: Tokens per reply (capped by options.num_predict)
+            error_rate: Fraction of requests answered with HTTP 500
+            stream_error_rate: Fraction of streamed replies that fail halfway
+            seed: Seed for the error injection
+        """
+        self.name = name
+        self.ttft = ttft
+        self.tokens_per_second = tokens_per_second
+        self.reply_tokens = reply_tokens
+        self.error_rate = error_rate
+        self.stream_error_rate = stream_error_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+    
+    def roll(self, rate):
+        """Deterministic (seeded) coin flip"""
+        if rate <= 0:
+            return False
+        with self._lock:
+            return self._random.random() < rate
+    
+    def reply(self, messages, num_predict=None):
+        """
+        Tokens of a deterministic reply to the last user message
+        
+        Returns:
+            list: Token strings (words with their leading space)
+        """
+        prompt = next((m.get("content", "") for m in reversed(messages) if m.get("role") == "user"), "")
+        words = ["Certainly,", "sir."] + prompt.split()
+        filler = "I have taken care of it and everything is running smoothly".split()
+        while len(words) < self.reply_tokens:
+            words += filler
+        count = self.reply_tokens if num_predict is None or num_predict < 0 else min(self.reply_tokens, num_predict)
+        words = words[:max(1, count)]
+        return [words[0]] + [" " + word for word in words[1:]]
+
+
+class FakeOllamaHandler(BaseHTTPRequestHandler):
+    """Request handler implementing the parts of the Ollama API JARVIS uses"""
+    
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # headers and body go out as separate writes
+    
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+    
+    def _send_json(self, payload, status=200):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+    
+    def do_GET(self):
+        model = self.server.model
+        if self.path == "/":
+            body = b"Ollama is running"
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        elif self.path == "/api/version":
+            self._send_json({"version": "0.0.0-fake"})
+        elif self.path in ("/api/tags", "/api/ps"):
+            self._send_json({"models": [{
+                "name": f"{model.name}:latest",
+                "model": f"{model.name}:latest",
+                "modified_at": _timestamp(),
+                "size": 0,
+                "digest": "0" * 64,
+                "details": {"format": "gguf", "family": "fake", "parameter_size": "0B"},
+            }]})
+        else:
+            self._send_json({"error": "not found"}, 404)
+    
+    def do_POST(self):
+        if self.path != "/api/chat":
+            self._send_json({"error": "not found"}, 404)
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            request = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self._send_json({"error": "invalid JSON"}, 400)
+            return
+        
+        self.server.count("requests")
+        model = self.server.model
+        if model.roll(model.error_rate):
+            self.server.count("errors")
+            self._send_json({"error": "injected failure"}, 500)
+            return
+        
+        options = request.get("options") or {}
+        tokens = model.reply(request.get("messages") or [], options.get("num_predict"))
+        started = time.monotonic()
+        if request.get("stream", True):
+            self._stream(request, tokens, started)
+        else:
+            self._complete(request, tokens, started)
+    
+    def _pace(self, started, index):
+        """Sleep until token ``index`` is due"""
+        model = self.server.model
+        due = started + model.ttft
+        if model.tokens_per_second > 0:
+            due += index / model.tokens_per_second
+        delay = due - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+    
+    def _final(self, request, tokens, started, content):
+        elapsed = int((time.monotonic() - started) * 1e9)
+        return {
+            "model": request.get("model", self.server.model.name),
+            "created_at": _timestamp(),
+            "message": {"role": "assistant", "content": content},
+            "done": True,
+            "done_reason": "stop",
+            "total_duration": elapsed,
+            "load_duration": 0,
+            "prompt_eval_count": sum(len(m.get("content", "").split()) for m in request.get("messages") or []),
+            "prompt_eval_duration": int(self.server.model.ttft * 1e9),
+            "eval_count": len(tokens),
+            "eval_duration": max(0, elapsed - int(self.server.model.ttft * 1e9)),
+        }
+    
+    def _complete(self, request, tokens, started):
+        self._pace(started, len(tokens) - 1)
+        self._send_json(self._final(request, tokens, started, "".join(tokens)))
+    
+    def _stream(self, request, tokens, started):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        
+        fail_at = len(tokens) // 2 if self.server.model.roll(self.server.model.stream_error_rate) else None
+        try:
+            for index, token in enumerate(tokens):
+                self._pace(started, index)
+                if index == fail_at:
+                    self.server.count("errors")
+                    self._chunk({"error": "injected stream failure"})
+                    break
+                self._chunk({
+                    "model": request.get("model", self.server.model.name),
+                    "created_at": _timestamp(),
+                    "message": {"role": "assistant", "content": token},
+                    "done": False,
+                })
+            else:
+                self._chunk(self._final(request, tokens, started, ""))
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+    
+    def _chunk(self, payload):
+        line = json.dumps(payload).encode("utf-8") + b"\n"
+        self.wfile.write(f"{len(line):X}\r\n".encode("ascii") + line + b"\r\n")
+        self.wfile.flush()
+
+
+class FakeOllamaServer(ThreadingHTTPServer):
+    """Threaded fake Ollama server that can run in the background of a benchmark"""
+    
+    daemon_threads = True
+    
+    def __init__(self, model=None, host="127.0.0.1", port=0, verbose=False):
+        """
+        Args:
+            model: FakeModel (defaults to FakeModel())
+            host: Interface to bind
+            port: Port to bind (0 picks a free one)
+        """
+        super().__init__((host, port), FakeOllamaHandler)
+        self.model = model or FakeModel()
+        self.verbose = verbose
+        self.counters = {"requests": 0, "errors": 0}
+        self._lock = threading.Lock()
+        self._thread = None
+    
+    @property
+    def url(self):
+        """Base URL to use as OLLAMA_BASE_URL"""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def handle_error(self, request, client_address):
+        # Clients dropping idle keep-alive connections are not errors
+        if isinstance(sys.exc_info()[1], ConnectionError):
+            return
+        super().handle_error(request, client_address)
+    
+    def count(self, name):
+        with self._lock:
+            self.counters[name] += 1
+    
+    def start(self):
+        """Serve from a background thread"""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self):
+        """Stop serving and release the port"""
+        self.shutdown()
+        self.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake Ollama server for offline JARVIS benchmarks")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument("--model", default="llama3.2", help="Model name to report")
+    parser.add_argument("--ttft", type=float, default=0.15, help="Seconds to the first token")
+    parser.add_argument("--tokens-per-second", type=float, default=50.0, help="0 = instant")
+    parser.add_argument("--reply-tokens", type=int, default=24)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests failing with HTTP 500")
+    parser.add_argument("--stream-error-rate", type=float, default=0.0, help="Fraction of streams failing halfway")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args()
+    
+    model = FakeModel(args.model, args.ttft, args.tokens_per_second, args.reply_tokens,
+                      args.error_rate, args.stream_error_rate, args.seed)
+    server = FakeOllamaServer(model, args.host, args.port, args.verbose)
+    print(f"✅ Fake Ollama listening on {server.url} (model {args.model}, "
+          f"TTFT {args.ttft * 1000:.0f} ms, {args.tokens_per_second:g} tokens/s)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"Served {server.counters['requests']} request(s), {server.counters['errors']} injected error(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,310 @@
+"""
+JARVIS Web API Load Generator
+Drives the speech.py HTTP API at fixed request rates (open loop) or fixed
+concurrency (closed loop), with a warm-up phase, and reports throughput and
+p50/p95/p99 latency per load step
+
+Usage:
+    python -m tools.loadtest --spawn --rate 20,50,100 --duration 10 --json run.json
+    python -m tools.loadtest --url http://localhost:5000 --concurrency 1,8,32
+    python -m tools.loadtest --compare baseline.json run.json
+
+--spawn starts speech.py against a fake Ollama server with spoken responses
+and rate limiting turned off, so the numbers show server overhead only.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from voice.stats import LatencyStats
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+# Two built-in commands, three that go to the AI provider
+DEFAULT_COMMANDS = [
+    "what time is it",
+    "explain quantum computing briefly",
+    "who are you",
+    "suggest a good book to read",
+    "how far away is the sun",
+]
+
+
+class Recorder:
+    """Latency samples and error counts of one load step"""
+    
+    def __init__(self):
+        self.latency = LatencyStats(window=1_000_000)
+        self.errors = {}
+        self.started = None
+        self.finished = None
+    
+    def ok(self, seconds):
+        self.latency.record(seconds)
+    
+    def error(self, kind):
+        self.errors[kind] = self.errors.get(kind, 0) + 1
+    
+    def result(self, **step):
+        """Summary of the step as a JSON-friendly dict"""
+        elapsed = (self.finished or time.monotonic()) - self.started
+        summary = self.latency.summary()
+        ms = lambda value: None if value is None else round(value * 1000, 2)
+        return dict(
+            step,
+            seconds=round(elapsed, 3),
+            completed=summary["count"],
+            errors=sum(self.errors.values()),
+            error_kinds=self.errors,
+            throughput=round(summary["count"] / elapsed, 2) if elapsed else 0.0,
+            latency_ms={key: ms(summary[key]) for key in ("mean", "p50", "p95", "p99", "max")},
+        )
+
+
+class LoadGenerator:
+    """Async HTTP load against one endpoint of the JARVIS server"""
+    
+    def __init__(self, url, endpoint="command", commands=None, timeout=30.0):
+        """
+        Args:
+            url: Server base URL
+            endpoint: "command" (POST /api/command) or "status" (GET /api/status)
+            commands: Commands cycled through for /api/command
+            timeout: Per-request timeout in seconds
+        """
+        self.url = url.rstrip("/")
+        self.endpoint = endpoint
+        self.commands = itertools.cycle(commands or DEFAULT_COMMANDS)
+        self.timeout = timeout
+    
+    async def _request(self, client, recorder, scheduled):
+        """Send one request; latency counts from when it was due (no coordinated omission)"""
+        try:
+            if self.endpoint == "status":
+                response = await client.get(f"{self.url}/api/status")
+            else:
+                response = await client.post(f"{self.url}/api/command", json={"command": next(self.commands)})
+            if response.status_code >= 400:
+                recorder.error(f"http_{response.status_code}")
+            else:
+                recorder.ok(time.monotonic() - scheduled)
+        except httpx.TimeoutException:
+            recorder.error("timeout")
+        except httpx.HTTPError as e:
+            recorder.error(type(e).__name__)
+    
+    async def open_loop(self, client, rate, duration):
+        """Start requests at a fixed rate, however long earlier ones take"""
+        recorder = Recorder()
+        recorder.started = time.monotonic()
+        tasks = []
+        for index in range(int(rate * duration)):
+            scheduled = recorder.started + index / rate
+            delay = scheduled - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(self._request(client, recorder, scheduled)))
+        await asyncio.gather(*tasks)
+        recorder.finished = time.monotonic()
+        return recorder
+    
+    async def closed_loop(self, client, concurrency, duration):
+        """Keep ``concurrency`` requests in flight for ``duration`` seconds"""
+        recorder = Recorder()
+        recorder.started = time.monotonic()
+        deadline = recorder.started + duration
+        
+        async def worker():
+            while time.monotonic() < deadline:
+                await self._request(client, recorder, time.monotonic())
+        
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        recorder.finished = time.monotonic()
+        return recorder
+    
+    async def run(self, mode, levels, duration, warmup):
+        """
+        Run every load level, each after its own warm-up
+        
+        Args:
+            mode: "rate" or "concurrency"
+            levels: Requests/s (rate) or clients (concurrency) per step
+            duration: Measured seconds per step
+            warmup: Unmeasured seconds before each step
+        
+        Returns:
+            list: One result dict per step
+        """
+        results = []
+        limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+        async with httpx.AsyncClient(timeout=self.timeout, limits=limits) as client:
+            for level in levels:
+                step = self.open_loop if mode == "rate" else self.closed_loop
+                if warmup > 0:
+                    await step(client, level, warmup)
+                recorder = await step(client, level, duration)
+                result = recorder.result(mode=mode, level=level, endpoint=self.endpoint)
+                results.append(result)
+                print(_format_row(result))
+        return results
+
+
+def _format_header():
+    return (f"{'level':>8}{'done':>8}{'err':>6}{'req/s':>9}"
+            f"{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}")
+
+
+def _format_row(result):
+    cell = lambda value: f"{'-':>9}" if value is None else f"{value:9.1f}"
+    latency = result["latency_ms"]
+    return (f"{result['level']:>8g}{result['completed']:>8}{result['errors']:>6}{result['throughput']:>9.1f}"
+            f"{cell(latency['p50'])}{cell(latency['p95'])}{cell(latency['p99'])}{cell(latency['max'])}")
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def spawn_server(ttft, tokens_per_second):
+    """
+    Start a fake Ollama server and speech.py (no TTS, AI fallback on)
+    
+    Returns:
+        tuple: (base URL, fake server, server process)
+    """
+    from tools.fake_ollama import FakeModel, FakeOllamaServer
+    
+    fake = FakeOllamaServer(FakeModel(ttft=ttft, tokens_per_second=tokens_per_second)).start()
+    port = _free_port()
+    env = dict(
+        os.environ,
+        AI_PROVIDER="ollama",
+        OLLAMA_BASE_URL=fake.url,
+        SERVER_TTS="0",
+        SERVER_AI_FALLBACK="1",
+        RATELIMIT_ENABLED="0",  # one client IP generates all the load
+        SERVER_DEBUG="0",
+        SERVER_HOST="127.0.0.1",
+        SERVER_PORT=str(port),
+    )
+    root = Path(__file__).resolve().parent.parent
+    process = subprocess.Popen(
+        [sys.executable, str(root / "speech.py")],
+        cwd=root, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            fake.stop()
+            raise RuntimeError("speech.py exited during startup")
+        try:
+            if httpx.get(f"{url}/api/status", timeout=1.0).status_code == 200:
+                return url, fake, process
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    process.terminate()
+    fake.stop()
+    raise RuntimeError("speech.py did not come up within 30 s")
+
+
+def compare(baseline_path, run_path):
+    """Print per-step throughput / latency changes between two saved runs"""
+    baseline = {(r["mode"], r["level"]): r for r in json.loads(Path(baseline_path).read_text())["results"]}
+    run = json.loads(Path(run_path).read_text())["results"]
+    print(f"{'level':>8}{'req/s':>20}{'p50 ms':>20}{'p95 ms':>20}{'p99 ms':>20}")
+    for result in run:
+        base = baseline.get((result["mode"], result["level"]))
+        if base is None:
+            continue
+        
+        def change(old, new):
+            if old is None or new is None:
+                return f"{'-':>20}"
+            pct = (new - old) / old * 100 if old else 0.0
+            return f"{old:9.1f} ->{new:7.1f}{pct:+5.0f}%"
+        
+        print(f"{result['level']:>8g}" + change(base["throughput"], result["throughput"])
+              + "".join(change(base["latency_ms"][key], result["latency_ms"][key]) for key in ("p50", "p95", "p99")))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the JARVIS web API")
+    parser.add_argument("--url", default="http://127.0.0.1:5000", help="Server base URL")
+    parser.add_argument("--spawn", action="store_true",
+                        help="Start speech.py with a fake Ollama server and TTS off")
+    parser.add_argument("--endpoint", choices=["command", "status"], default="command")
+    parser.add_argument("--commands", help="File with one command per line")
+    load = parser.add_mutually_exclusive_group()
+    load.add_argument("--rate", help="Comma separated request rates (req/s), open loop")
+    load.add_argument("--concurrency", help="Comma separated client counts, closed loop")
+    parser.add_argument("--duration", type=float, default=10.0, help="Measured seconds per step")
+    parser.add_argument("--warmup", type=float, default=2.0, help="Warm-up seconds per step")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Request timeout in seconds")
+    parser.add_argument("--ttft", type=float, default=0.15, help="Fake provider time to first token (--spawn)")
+    parser.add_argument("--tokens-per-second", type=float, default=50.0, help="Fake provider token rate (--spawn)")
+    parser.add_argument("--json", help="Save results to this file")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "RUN"), help="Compare two saved runs")
+    args = parser.parse_args()
+    
+    if args.compare:
+        compare(*args.compare)
+        return
+    if not HTTPX_AVAILABLE:
+        parser.error("httpx not installed. Run: pip install httpx")
+    
+    mode, levels = ("concurrency", args.concurrency) if args.concurrency else ("rate", args.rate or "10")
+    levels = [float(level) if mode == "rate" else int(level) for level in levels.split(",")]
+    commands = None
+    if args.commands:
+        commands = [line for line in Path(args.commands).read_text(encoding="utf-8").splitlines() if line.strip()]
+    
+    url, fake, process = args.url, None, None
+    if args.spawn:
+        url, fake, process = spawn_server(args.ttft, args.tokens_per_second)
+        print(f"✅ speech.py on {url} using fake Ollama at {fake.url} (TTS off)")
+    
+    print(f"Load test: {mode} {args.endpoint} x {args.duration:g}s per step ({args.warmup:g}s warm-up)")
+    print(_format_header())
+    try:
+        generator = LoadGenerator(url, args.endpoint, commands, args.timeout)
+        results = asyncio.run(generator.run(mode, levels, args.duration, args.warmup))
+    finally:
+        if process:
+            process.terminate()
+            process.wait(timeout=10)
+        if fake:
+            fake.stop()
+    
+    if args.json:
+        Path(args.json).write_text(json.dumps({
+            "url": url,
+            "spawned": args.spawn,
+            "endpoint": args.endpoint,
+            "mode": mode,
+            "duration": args.duration,
+            "warmup": args.warmup,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "results": results,
+        }, indent=2))
+        print(f"✅ Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
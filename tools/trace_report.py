@@ -0,0 +1,120 @@
+"""
+JARVIS Trace Report
+Aggregates the JSONL span file written by tracing.py into per-stage
+latency percentile tables
+
+Usage:
+    python -m tools.trace_report
+    python -m tools.trace_report ~/.jarvis/traces.jsonl --turn voice_turn --since 60
+    python -m tools.trace_report --all --json summary.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+
+
+def _percentile(samples, pct):
+    index = min(len(samples) - 1, int(round(pct / 100.0 * (len(samples) - 1))))
+    return samples[index]
+
+
+def read_spans(path, include_rotated=False):
+    """Yield span dicts from the trace file (oldest rotated file first)"""
+    path = Path(path).expanduser()
+    files = []
+    if include_rotated:
+        files = sorted(path.parent.glob(f"{path.name}.*"), key=lambda p: -int(p.suffix[1:]) if p.suffix[1:].isdigit() else 0)
+    files.append(path)
+    for file in files:
+        if not file.exists():
+            continue
+        with open(file, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue  # partially written line
+
+
+def aggregate(spans, turn=None, since=None):
+    """
+    Group span durations (and ``*_ms`` attributes) by stage
+    
+    Args:
+        spans: Iterable of span dicts
+        turn: Only include traces whose root span has this name
+        since: Only include spans that started after this epoch time
+    
+    Returns:
+        dict: stage name -> sorted list of milliseconds
+    """
+    spans = [span for span in spans if since is None or span["start"] >= since]
+    roots = {span["trace"]: span["name"] for span in spans if span.get("parent") is None}
+    stages = {}
+    for span in spans:
+        root = roots.get(span["trace"])
+        if turn is not None and root != turn:
+            continue
+        name = span["name"] if span.get("parent") is None else f"{root or '?'}/{span['name']}"
+        stages.setdefault(name, []).append(span["ms"])
+        # Marks like llm.ttft_ms and speak.first_audio_ms become their own rows
+        for key, value in (span.get("attrs") or {}).items():
+            if key.endswith("_ms") and isinstance(value, (int, float)):
+                stages.setdefault(f"{name}.{key[:-3]}", []).append(value)
+    return {name: sorted(values) for name, values in stages.items()}
+
+
+def summarize(stages):
+    """Percentile table rows"""
+    rows = []
+    for name in sorted(stages):
+        samples = stages[name]
+        rows.append({
+            "stage": name,
+            "count": len(samples),
+            "mean": sum(samples) / len(samples),
+            "p50": _percentile(samples, 50),
+            "p95": _percentile(samples, 95),
+            "p99": _percentile(samples, 99),
+            "max": samples[-1],
+        })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize JARVIS traces")
+    parser.add_argument("path", nargs="?", default=Config.TRACE_PATH, help="Trace file")
+    parser.add_argument("--all", action="store_true", help="Include rotated files")
+    parser.add_argument("--turn", help="Only traces of this kind (voice_turn, http, say, text_turn)")
+    parser.add_argument("--since", type=float, help="Only the last N minutes")
+    parser.add_argument("--json", help="Write the table to this file")
+    args = parser.parse_args()
+    
+    since = time.time() - args.since * 60 if args.since else None
+    rows = summarize(aggregate(read_spans(args.path, args.all), args.turn, since))
+    if not rows:
+        print(f"No spans found in {args.path}")
+        return
+    
+    width = max(len(row["stage"]) for row in rows) + 2
+    print("Latencies in milliseconds")
+    print(f"{'stage':<{width}}{'count':>7}{'mean':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}")
+    for row in rows:
+        print(f"{row['stage']:<{width}}{row['count']:>7}{row['mean']:9.1f}{row['p50']:9.1f}"
+              f"{row['p95']:9.1f}{row['p99']:9.1f}{row['max']:9.1f}")
+    
+    if args.json:
+        Path(args.json).write_text(json.dumps(rows, indent=2))
+        print(f"✅ Summary written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
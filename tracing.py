@@ -0,0 +1,247 @@
+"""
+JARVIS Tracing
+Lightweight per-turn span trees (voice and HTTP turns) written to a rotating
+JSONL file by a background thread
+"""
+
+import atexit
+import contextvars
+import itertools
+import json
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from config import Config
+
+# Convert monotonic timestamps to wall clock for the output
+_EPOCH_OFFSET = time.time() - time.monotonic()
+_span_ids = itertools.count(1)
+_current = contextvars.ContextVar("jarvis_span", default=None)
+
+
+class Span:
+    """A timed operation inside a turn; use as a context manager or call end()"""
+    
+    def __init__(self, tracer, name, trace_id, parent_id=None, start=None, attrs=None):
+        self.tracer = tracer
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = f"{next(_span_ids):x}"
+        self.parent_id = parent_id
+        self.start = time.monotonic() if start is None else start
+        self.attrs = attrs or {}
+        self.duration = None
+        self._token = None
+    
+    def child(self, name, start=None, **attrs):
+        """Start a span nested under this one (e.g. in another thread)"""
+        return Span(self.tracer, name, self.trace_id, self.span_id, start, attrs)
+    
+    def set(self, **attrs):
+        """Attach attributes (durations should use an ``_ms`` suffix)"""
+        self.attrs.update(attrs)
+        return self
+    
+    def mark(self, name):
+        """Record the time since span start as ``<name>_ms`` (e.g. first_audio)"""
+        self.attrs[f"{name}_ms"] = round((time.monotonic() - self.start) * 1000, 3)
+    
+    def end(self, end=None, **attrs):
+        """Finish the span and queue it for writing (idempotent)"""
+        if self.duration is not None:
+            return
+        self.attrs.update(attrs)
+        self.duration = (time.monotonic() if end is None else end) - self.start
+        self.tracer._emit(self)
+    
+    def activate(self):
+        """Make this the current span of the calling thread / context"""
+        self._token = _current.set(self)
+        return self
+    
+    def deactivate(self):
+        if self._token is not None:
+            _current.reset(self._token)
+            self._token = None
+    
+    def __enter__(self):
+        return self.activate()
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.deactivate()
+        if exc is not None:
+            self.attrs["error"] = f"{exc_type.__name__}: {exc}"
+        self.end()
+        return False
+    
+    def to_dict(self):
+        return {
+            "trace": self.trace_id,
+            "span": self.span_id,
+            "parent": self.parent_id,
+            "name": self.name,
+            "start": round(self.start + _EPOCH_OFFSET, 6),
+            "ms": round(self.duration * 1000, 3),
+            "attrs": self.attrs,
+        }
+
+
+class _NullSpan:
+    """Stand-in returned when tracing is off or there is no enclosing turn"""
+    
+    name = None
+    trace_id = None
+    
+    def child(self, name, start=None, **attrs):
+        return self
+    
+    def set(self, **attrs):
+        return self
+    
+    def mark(self, name):
+        pass
+    
+    def end(self, end=None, **attrs):
+        pass
+    
+    def activate(self):
+        return self
+    
+    def deactivate(self):
+        pass
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NULL_SPAN = _NullSpan()
+
+
+class RotatingJSONLWriter:
+    """Background writer appending one JSON object per line, rotating by size"""
+    
+    def __init__(self, path, max_bytes, backups):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.queue = queue.SimpleQueue()
+        self._file = None
+        self._thread = threading.Thread(target=self._run, name="trace-writer", daemon=True)
+        self._thread.start()
+    
+    def write(self, record):
+        """Queue a record (never blocks the caller on disk I/O)"""
+        self.queue.put(record)
+    
+    def _open(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")
+    
+    def _rotate(self):
+        self._file.close()
+        for index in range(self.backups - 1, 0, -1):
+            source = self.path.with_name(f"{self.path.name}.{index}")
+            if source.exists():
+                os.replace(source, self.path.with_name(f"{self.path.name}.{index + 1}"))
+        if self.backups > 0:
+            os.replace(self.path, self.path.with_name(f"{self.path.name}.1"))
+        else:
+            self.path.unlink()
+        self._open()
+    
+    def _run(self):
+        while True:
+            record = self.queue.get()
+            if record is None:
+                break
+            try:
+                if self._file is None:
+                    self._open()
+                lines = [json.dumps(record)]
+                # Write whatever else is already queued in one go
+                while True:
+                    try:
+                        record = self.queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if record is None:
+                        self.queue.put(None)
+                        break
+                    lines.append(json.dumps(record))
+                self._file.write("\n".join(lines) + "\n")
+                self._file.flush()
+                if self._file.tell() >= self.max_bytes:
+                    self._rotate()
+            except (OSError, TypeError, ValueError) as e:
+                print(f"⚠️  Trace writer error: {e}")
+        if self._file is not None:
+            self._file.close()
+    
+    def close(self, timeout=2.0):
+        """Flush queued records and stop"""
+        self.queue.put(None)
+        self._thread.join(timeout)
+
+
+class Tracer:
+    """Creates turn traces and hands finished spans to the writer"""
+    
+    def __init__(self, path=None, enabled=None):
+        """
+        Args:
+            path: JSONL output file (defaults to Config.TRACE_PATH)
+            enabled: Record spans at all (defaults to Config.TRACE_ENABLED)
+        """
+        self.enabled = Config.TRACE_ENABLED if enabled is None else enabled
+        self.path = Path(path or Config.TRACE_PATH).expanduser()
+        self.writer = None
+        if self.enabled:
+            self.writer = RotatingJSONLWriter(self.path, Config.TRACE_MAX_BYTES, Config.TRACE_BACKUPS)
+    
+    def start_trace(self, name, start=None, **attrs):
+        """
+        Start the root span of a new turn
+        
+        Args:
+            name: Turn kind, e.g. "voice_turn" or "http"
+            start: time.monotonic() the turn began (defaults to now)
+        """
+        if not self.enabled:
+            return NULL_SPAN
+        return Span(self, name, os.urandom(8).hex(), start=start, attrs=attrs)
+    
+    def span(self, name, **attrs):
+        """Child of the current span, or a no-op span outside of any turn"""
+        parent = _current.get()
+        if parent is None or not self.enabled:
+            return NULL_SPAN
+        return parent.child(name, **attrs)
+    
+    def current(self):
+        """The active span of this thread / context"""
+        return _current.get() or NULL_SPAN
+    
+    def _emit(self, span):
+        if self.writer is not None:
+            self.writer.write(span.to_dict())
+    
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+_tracer = None
+
+
+def get_tracer():
+    """Get the shared tracer"""
+    global _tracer
+    if _tracer is None:
+        _tracer = Tracer()
+        atexit.register(_tracer.close)
+    return _tracer
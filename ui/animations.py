@@ -5,23 +5,90 @@ Handles all visual effects and animations for the Iron Man-style interface
 
 import math
 import time
+from functools import lru_cache
 from typing import List, Tuple
+import numpy as np
+from config import Config
+
+
+class ColorLUT:
+    """Precomputed hex colors of a base color scaled by quantized intensities"""
+    
+    def __init__(self, base_color, steps=256):
+        """
+        Args:
+            base_color: Base color in hex format (e.g., "#00d4ff")
+            steps: Number of intensity levels between 0.0 and 1.0
+        """
+        base_color = base_color.lstrip('#')
+        rgb = np.array([int(base_color[i:i + 2], 16) for i in (0, 2, 4)], dtype=np.float64)
+        scaled = (np.linspace(0.0, 1.0, steps)[:, None] * rgb).astype(np.int64)
+        self.steps = steps
+        self.colors = np.array([f"#{r:02x}{g:02x}{b:02x}" for r, g, b in scaled], dtype=object)
+    
+    def lookup(self, intensity):
+        """Color for one intensity (0.0 to 1.0)"""
+        index = int(intensity * (self.steps - 1) + 0.5)
+        return self.colors[min(max(index, 0), self.steps - 1)]
+    
+    def lookup_many(self, intensities):
+        """Colors for an array of intensities in one call"""
+        index = (np.asarray(intensities, dtype=np.float64) * (self.steps - 1) + 0.5).astype(np.int64)
+        return self.colors[np.clip(index, 0, self.steps - 1)].tolist()
+
+
+@lru_cache(maxsize=32)
+def color_lut(base_color, steps=256):
+    """Get the (cached) lookup table of a base color"""
+    return ColorLUT(base_color, steps)
+
+
+def _read_only(array):
+    array.flags.writeable = False
+    return array
+
+
+@lru_cache(maxsize=64)
+def _circle_offsets(radius, num_points):
+    angles = np.arange(num_points) * (2 * np.pi / num_points)
+    return _read_only(np.column_stack((np.cos(angles), np.sin(angles))) * radius)
+
+
+@lru_cache(maxsize=64)
+def _arc_offsets(radius, start_angle, end_angle, num_points):
+    start_rad = math.radians(start_angle)
+    end_rad = math.radians(end_angle)
+    angles = start_rad + np.arange(num_points) * ((end_rad - start_rad) / num_points)
+    return _read_only(np.column_stack((np.cos(angles), np.sin(angles))) * radius)
+
 
 class AnimationEngine:
     """Manages animation states and calculations"""
     
     def __init__(self):
         self.start_time = time.time()
-        self.arc_reactor_angle = 0
+        self.arc_reactor_angle = 0.0
         self.pulse_phase = 0
+        self._last_update = None
     
     def get_elapsed_time(self):
         """Get elapsed time since animation start"""
         return time.time() - self.start_time
     
-    def update_arc_reactor(self):
-        """Update arc reactor rotation angle"""
-        self.arc_reactor_angle = (self.arc_reactor_angle + 2) % 360
+    def update_arc_reactor(self, degrees_per_second=40.0):
+        """
+        Update arc reactor rotation angle
+        
+        The angle advances with wall time, so the rotation speed does not
+        depend on the frame rate
+        """
+        now = time.monotonic()
+        if self._last_update is not None:
+            # Cap the step so resuming after a pause does not jump
+            step = min(now - self._last_update, 0.25) * degrees_per_second
+            # Kept as a float - truncating each step would slow the rotation at high frame rates
+            self.arc_reactor_angle = (self.arc_reactor_angle + step) % 360
+        self._last_update = now
         return self.arc_reactor_angle
     
     def get_pulse_intensity(self, speed=2.0):
@@ -51,18 +118,7 @@ class AnimationEngine:
         Returns:
             str: Color in hex format
         """
-        # Parse hex color
-        base_color = base_color.lstrip('#')
-        r = int(base_color[0:2], 16)
-        g = int(base_color[2:4], 16)
-        b = int(base_color[4:6], 16)
-        
-        # Apply intensity
-        r = int(r * intensity)
-        g = int(g * intensity)
-        b = int(b * intensity)
-        
-        return f"#{r:02x}{g:02x}{b:02x}"
+        return color_lut(base_color).lookup(intensity)
     
     def generate_circle_points(self, center_x, center_y, radius, num_points=100):
         """
@@ -75,15 +131,9 @@ class AnimationEngine:
             num_points: Number of points to generate
         
         Returns:
-            List of (x, y) tuples
+            numpy.ndarray: (num_points, 2) array of x, y
         """
-        points = []
-        for i in range(num_points):
-            angle = (i / num_points) * 2 * math.pi
-            x = center_x + radius * math.cos(angle)
-            y = center_y + radius * math.sin(angle)
-            points.append((x, y))
-        return points
+        return _circle_offsets(radius, num_points) + (center_x, center_y)
     
     def generate_arc_points(self, center_x, center_y, radius, start_angle, end_angle, num_points=50):
         """
@@ -98,48 +148,41 @@ class AnimationEngine:
             num_points: Number of points to generate
         
         Returns:
-            List of (x, y) tuples
+            numpy.ndarray: (num_points, 2) array of x, y
         """
-        points = []
-        start_rad = math.radians(start_angle)
-        end_rad = math.radians(end_angle)
-        
-        for i in range(num_points):
-            angle = start_rad + (i / num_points) * (end_rad - start_rad)
-            x = center_x + radius * math.cos(angle)
-            y = center_y + radius * math.sin(angle)
-            points.append((x, y))
-        return points
+        return _arc_offsets(radius, start_angle, end_angle, num_points) + (center_x, center_y)
 
 
 class WaveformGenerator:
-    """Generates animated waveforms for voice visualization"""
+    """Turns measured audio levels into smoothed waveform bar heights"""
     
     def __init__(self, num_bars=20):
         self.num_bars = num_bars
         self.bar_heights = [0.0] * num_bars
-        self.time_offset = 0
     
-    def update(self, is_active=False):
+    def update(self, is_active=False, dt=0.05, levels=None):
         """
         Update waveform animation
         
         Args:
             is_active: Whether voice is active (listening/speaking)
+            dt: Seconds since the previous frame
+            levels: Current band levels (0.0 to 1.0, any number of bands), or None
         
         Returns:
             List of bar heights (0.0 to 1.0)
         """
-        self.time_offset += 0.1
+        decay = 0.9 ** (dt / 0.05)  # 0.9 per 20 FPS frame
+        num_levels = 0 if levels is None else len(levels)
         
         for i in range(self.num_bars):
-            if is_active:
-                # Generate animated sine wave
-                phase = (i / self.num_bars) * 2 * math.pi + self.time_offset
-                height = 0.3 + 0.7 * abs(math.sin(phase + i * 0.5))
+            if is_active and num_levels:
+                # Jump up to the measured level, fall back slowly
+                level = float(levels[i * num_levels // self.num_bars])
+                height = max(0.1, level, self.bar_heights[i] * decay)
             else:
                 # Decay to baseline
-                self.bar_heights[i] *= 0.9
+                self.bar_heights[i] *= decay
                 height = max(0.1, self.bar_heights[i])
             
             self.bar_heights[i] = height
@@ -149,17 +192,133 @@ class WaveformGenerator:
     def get_bar_color(self, height, base_color="#00d4ff"):
         """Get color for bar based on height"""
         # Brighter at higher amplitudes
-        intensity = 0.4 + 0.6 * height
-        base_color = base_color.lstrip('#')
-        r = int(base_color[0:2], 16)
-        g = int(base_color[2:4], 16)
-        b = int(base_color[4:6], 16)
+        return color_lut(base_color).lookup(0.4 + 0.6 * height)
+    
+    def get_bar_colors(self, heights, base_color="#00d4ff"):
+        """
+        Get the colors of all bars of a frame in one call
+        
+        Args:
+            heights: Bar heights (0.0 to 1.0)
+        
+        Returns:
+            list: Hex color per bar
+        """
+        return color_lut(base_color).lookup_many(0.4 + 0.6 * np.asarray(heights, dtype=np.float64))
+
+
+class FrameClock:
+    """
+    One animation tick shared by every widget of a window
+    
+    Runs at Config.UI_ACTIVE_FPS while any widget is animating, drops to
+    Config.UI_IDLE_FPS (or UI_BACKGROUND_FPS when the window is unfocused)
+    otherwise, and stops while the window is withdrawn or minimized. Frames
+    that were missed because a tick ran late are skipped, not queued up.
+    """
+    
+    def __init__(self, root):
+        """
+        Args:
+            root: Toplevel window whose after() drives the clock
+        """
+        self.root = root
+        self.widgets = []  # objects with tick(now, dt) -> bool (needs the active frame rate)
+        self.is_active = False
+        # A window that starts hidden (withdrawn before its first map) gets no <Unmap>
+        self.is_paused = not root.winfo_ismapped()
+        self.frames = 0
+        self.skipped = 0
+        self._after_id = None
+        self._due = None
+        self._last_tick = None
+        root.bind("<Unmap>", self._on_unmap, add="+")
+        root.bind("<Map>", self._on_map, add="+")
+    
+    @classmethod
+    def for_window(cls, widget):
+        """Get the clock of the widget's toplevel window (created on first use)"""
+        root = widget.winfo_toplevel()
+        clock = getattr(root, "_jarvis_frame_clock", None)
+        if clock is None:
+            clock = root._jarvis_frame_clock = cls(root)
+        return clock
+    
+    def register(self, widget):
+        """Drive ``widget.tick`` from this clock until the widget is destroyed"""
+        self.widgets.append(widget)
+        widget.bind("<Destroy>", lambda e, w=widget: self.unregister(w) if e.widget is w else None, add="+")
+        self.wake()
+    
+    def unregister(self, widget):
+        if widget in self.widgets:
+            self.widgets.remove(widget)
+    
+    def wake(self):
+        """Tick now (e.g. a widget became active while the clock ran at the idle rate)"""
+        if self.is_paused:
+            return
+        if self._after_id is not None:
+            if self.is_active:
+                return
+            self.root.after_cancel(self._after_id)
+        self._due = None
+        self._after_id = self.root.after_idle(self._tick)
+    
+    def _on_unmap(self, event):
+        if event.widget is self.root:
+            self.is_paused = True
+            if self._after_id is not None:
+                self.root.after_cancel(self._after_id)
+                self._after_id = None
+    
+    def _on_map(self, event):
+        if event.widget is self.root and self.is_paused:
+            self.is_paused = False
+            self._last_tick = None
+            self.wake()
+    
+    @property
+    def interval(self):
+        """Seconds between frames at the current rate"""
+        if self.is_active:
+            fps = Config.UI_ACTIVE_FPS
+        else:
+            try:
+                focused = self.root.focus_displayof() is not None
+            except (KeyError, RuntimeError):
+                focused = False  # focus is in a widget we do not know about
+            fps = Config.UI_IDLE_FPS if focused else Config.UI_BACKGROUND_FPS
+        return 1.0 / fps
+    
+    def _tick(self):
+        self._after_id = None
+        if self.is_paused or not self.widgets:
+            return
+        now = time.monotonic()
+        dt = 0.0 if self._last_tick is None else now - self._last_tick
+        self._last_tick = now
         
-        r = int(r * intensity)
-        g = int(g * intensity)
-        b = int(b * intensity)
+        active = False
+        for widget in list(self.widgets):
+            try:
+                active = widget.tick(now, dt) or active
+            except Exception as e:
+                print(f"⚠️  Animation error in {type(widget).__name__}: {e}")
+                self.unregister(widget)
+        self.is_active = active
+        self.frames += 1
         
-        return f"#{r:02x}{g:02x}{b:02x}"
+        # Stay on the frame grid; if we are behind, skip the missed frames
+        interval = self.interval
+        finished = time.monotonic()
+        due = (self._due or now) + interval
+        if due < finished:
+            missed = int((finished - due) / interval) + 1
+            self.skipped += missed
+            due += missed * interval
+        self._due = due
+        self._after_id = self.root.after(max(1, int((due - finished) * 1000)), self._tick)
 
 
 class FadeAnimation:
@@ -0,0 +1,181 @@
+"""
+JARVIS UI Dispatcher
+Thread-safe queue of widget updates, drained on the Tk thread. Updates are
+coalesced per drain: the last status wins and appended items arrive in one batch.
+The first update after a quiet period wakes the Tk loop with a virtual event, so
+an idle window does not have to poll quickly to stay responsive
+"""
+
+import threading
+from tkinter import TclError
+from config import Config
+
+WAKE_EVENT = "<<Wake>>"
+
+
+class UIDispatcher:
+    """Lets worker threads schedule widget updates without touching Tk"""
+    
+    def __init__(self, root, interval_ms=None, idle_interval_ms=None):
+        """
+        Args:
+            root: Tk window whose after() runs the drain (must be created on the Tk thread)
+            interval_ms: Drain interval while updates are arriving
+            idle_interval_ms: Slowest drain interval after a quiet period (a
+                safety net - posts wake the drain through WAKE_EVENT)
+        """
+        self.root = root
+        self.interval = interval_ms or Config.UI_DISPATCH_MS
+        self.idle_interval = idle_interval_ms or Config.UI_DISPATCH_IDLE_MS
+        self.applied = 0
+        self.coalesced = 0
+        self._lock = threading.Lock()
+        self._order = []  # ("call", fn, args, kwargs) or ("latest" / "append", key) in first-posted order
+        self._latest = {}  # key -> (fn, args, kwargs)
+        self._batches = {}  # key -> (fn, items)
+        self._delay = self.interval
+        self._after_id = None
+        self._stopped = False
+        self._flushing = False
+        self._wake = threading.Event()
+        self._waker = None
+    
+    def start(self):
+        """Begin draining (call from the Tk thread)"""
+        if self._after_id is None and not self._stopped:
+            self._after_id = self.root.after(self._delay, self._drain)
+        if self._waker is None:
+            self.root.bind(WAKE_EVENT, self._on_wake, add="+")
+            # event_generate from another thread waits for the Tk thread, so only this thread ever does
+            self._waker = threading.Thread(target=self._run_waker, name="ui-waker", daemon=True)
+            self._waker.start()
+        return self
+    
+    def stop(self):
+        """Stop draining; later updates are dropped"""
+        self._stopped = True
+        self._wake.set()
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+    
+    def post(self, fn, *args, **kwargs):
+        """Run fn(*args, **kwargs) on the Tk thread (every call is applied, in order)"""
+        with self._lock:
+            self._order.append(("call", fn, args, kwargs))
+            self._wake_if_idle()
+    
+    def latest(self, key, fn, *args, **kwargs):
+        """
+        Run fn on the Tk thread, keeping only the newest call per key and drain
+        
+        Args:
+            key: Coalescing key, e.g. "status"
+        """
+        with self._lock:
+            if key in self._latest:
+                self.coalesced += 1
+            else:
+                self._order.append(("latest", key))
+                self._wake_if_idle()
+            self._latest[key] = (fn, args, kwargs)
+    
+    def append(self, key, fn, item):
+        """
+        Collect items per key and call fn(items) once per drain
+        
+        Args:
+            key: Batch key, e.g. "conversation"
+            fn: Callable taking the list of items posted since the last drain
+            item: Item to add to the batch
+        """
+        with self._lock:
+            batch = self._batches.get(key)
+            if batch is None:
+                self._batches[key] = (fn, [item])
+                self._order.append(("append", key))
+                self._wake_if_idle()
+            else:
+                batch[1].append(item)
+                self.coalesced += 1
+    
+    def flush(self):
+        """
+        Apply everything posted so far (Tk thread only)
+        
+        Returns:
+            int: Number of updates applied
+        """
+        if self._flushing:
+            return 0  # posted from inside an update - the running flush picks it up
+        self._flushing = True
+        try:
+            applied = 0
+            for _ in range(3):  # a few passes for updates that post more updates, never forever
+                count = self._apply_pending()
+                if not count:
+                    break
+                applied += count
+            return applied
+        finally:
+            self._flushing = False
+    
+    def _apply_pending(self):
+        with self._lock:
+            order, latest, batches = self._order, self._latest, self._batches
+            self._order, self._latest, self._batches = [], {}, {}
+        
+        for entry in order:
+            try:
+                if entry[0] == "call":
+                    _, fn, args, kwargs = entry
+                    fn(*args, **kwargs)
+                elif entry[0] == "latest":
+                    fn, args, kwargs = latest[entry[1]]
+                    fn(*args, **kwargs)
+                else:
+                    fn, items = batches[entry[1]]
+                    fn(items)
+                self.applied += 1
+            except Exception as e:
+                print(f"⚠️  UI update failed: {e}")
+        return len(order)
+    
+    def _wake_if_idle(self):
+        """Called with the lock held after queueing; wakes a backed-off drain"""
+        if len(self._order) == 1 and self._delay > self.interval:
+            self._wake.set()  # while updates flow, the fast poll batches them instead
+    
+    def _run_waker(self):
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            if self._stopped:
+                return
+            try:
+                self.root.event_generate(WAKE_EVENT, when="tail")
+            except (RuntimeError, TclError):
+                pass  # Tk loop not running (yet) - the safety-net poll drains instead
+    
+    def _on_wake(self, event):
+        """Updates arrived after a quiet period - drain now and poll quickly again"""
+        if self._stopped:
+            return
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+        self._delay = self.interval
+        self._drain()
+    
+    def _drain(self):
+        self._after_id = None
+        if self._stopped:
+            return
+        applied = self.flush()
+        
+        # Poll quickly while updates arrive, back off when quiet
+        self._delay = self.interval if applied else min(self._delay * 2, self.idle_interval)
+        if not self._stopped:
+            self._after_id = self.root.after(self._delay, self._drain)
@@ -6,8 +6,8 @@ Iron Man-style popup interface with arc reactor and voice controls
 import customtkinter as ctk
 from tkinter import END
 import threading
+import time
 import speech_recognition as sr
-import pyttsx3
 from ui.widgets import (
     ArcReactorWidget, 
     WaveformWidget, 
@@ -15,17 +15,40 @@ from ui.widgets import (
     ConversationText,
     GlassPanel
 )
+from ui.dispatcher import UIDispatcher
 from config import Config
-from ai_brain import JarvisAI
+from voice.recognizers import get_recognizer, UnknownSpeechError
+from voice.calibration import get_noise_tracker
+from voice.capture import get_capture_service
+from voice.levels import get_level_meter
+from voice.tts import Speaker
+from voice.bargein import BargeInMonitor
+from voice.pipeline import VoicePipeline
+from voice.replay import SessionRecorder
+from voice.stats import LatencyStats
+from tracing import get_tracer
 
 
 class JarvisUI(ctk.CTk):
     """Main JARVIS popup window"""
     
-    def __init__(self, ai_brain):
+    def __init__(self, ai_brain, greetings=None, persistent=False):
+        """
+        Args:
+            ai_brain: JarvisAI answering commands
+            greetings: Optional GreetingPool used when the window is shown
+            persistent: Start hidden; show_popup() / close_window() show and hide
+                the same window instead of creating and destroying it
+        """
         super().__init__()
         
         self.ai_brain = ai_brain
+        self.greetings = greetings
+        self.persistent = persistent
+        self.show_latency = LatencyStats()  # show request -> window mapped
+        self._show_requested = None
+        if persistent:
+            self.withdraw()
         
         # Window configuration
         self.title("JARVIS")
@@ -44,21 +67,73 @@ class JarvisUI(ctk.CTk):
         
         # Voice components
         self.recognizer = sr.Recognizer()
-        self.tts_engine = pyttsx3.init()
-        self.tts_engine.setProperty('rate', Config.TTS_RATE)
+        self.asr_error = None
+        self.noise_tracker = get_noise_tracker()
+        # Without the shared capture stream, listens open the microphone themselves
+        self.levels = None
+        try:
+            self.capture = get_capture_service()
+            self.capture.levels = self.levels = get_level_meter("mic")
+        except Exception as e:
+            self.capture = None
+            print(f"⚠️  Capture service unavailable, opening the microphone per listen: {e}")
+        if Config.VOICE_WORKERS:
+            # Recognition and speech output in their own processes, off this GIL
+            from voice.workers import RemoteRecognizer, RemoteSpeaker
+            self.asr = RemoteRecognizer().load()
+            self.speaker = RemoteSpeaker().start()
+        else:
+            self.speaker = Speaker()
+            # A missing model only disables listening - typed greetings and replies still work
+            try:
+                self.asr = get_recognizer()
+            except Exception as e:
+                self.asr = None
+                self.asr_error = f"Speech recognition unavailable ({Config.ASR_BACKEND}): {e}"
+                print(f"⚠️  {self.asr_error}")
+        
+        # Interrupt playback when the user talks over JARVIS
+        self.barge_in = None
+        if Config.BARGEIN_ENABLED and self.capture:
+            self.barge_in = BargeInMonitor(self.capture, self.speaker, on_barge_in=self._on_barge_in)
+        
+        # Staged voice pipeline - a new listen can start while earlier turns are still handled
+        self.pipeline = VoicePipeline(
+            self.asr,
+            self._respond,
+            self._speak_blocking,
+            on_event=self._on_pipeline_event
+        ).start()
+        
+        # Optional session recording for python -m voice.replay
+        self.recorder = None
+        if Config.SESSION_RECORD_DIR and self.capture:
+            self.recorder = SessionRecorder(self.capture).start()
         
         # State
         self.is_listening = False
         self.is_speaking = False
+        self._streaming = False  # a streamed reply is being appended to the log
+        self._streamed = []  # chunks of that reply
         
         # Build UI
         self._build_ui()
         
+        # Worker threads never touch widgets - they post updates, drained here on the Tk thread
+        self.ui = UIDispatcher(self).start()
+        if self.asr is None:
+            self.listen_btn.configure(state="disabled")
+            self._show_idle()
+            self._log("SYSTEM", self.asr_error)
+        
         # Bind escape key to close
         self.bind("<Escape>", lambda e: self.close_window())
+        self.protocol("WM_DELETE_WINDOW", self.close_window)
+        self.bind("<Map>", self._on_map, add="+")
         
-        # Greeting
-        self._show_greeting()
+        # Greeting (a persistent window greets each time it is shown)
+        if not persistent:
+            self._show_greeting()
     
     def _build_ui(self):
         """Build the user interface"""
@@ -85,7 +160,7 @@ class JarvisUI(ctk.CTk):
         self.status_label.pack(pady=10)
         
         # Waveform visualization
-        self.waveform = WaveformWidget(main_frame, width=500, height=60, num_bars=40)
+        self.waveform = WaveformWidget(main_frame, width=500, height=60, num_bars=40, levels=self.levels)
         self.waveform.pack(pady=15)
         
         # Control buttons frame
@@ -154,129 +229,250 @@ class JarvisUI(ctk.CTk):
         """Get and display AI greeting"""
         try:
             greeting = self.ai_brain.get_greeting()
-            self.conversation.add_message("JARVIS", greeting)
+            self._log("JARVIS", greeting)
             self.speak(greeting)
         except Exception as e:
             print(f"Greeting error: {e}")
             # Use fallback greeting if AI fails
             fallback = "Good day, sir. JARVIS systems online and ready to assist."
-            self.conversation.add_message("JARVIS", fallback)
+            self._log("JARVIS", fallback)
             self.speak(fallback)
     
-    def start_listening(self):
-        """Start voice recognition"""
-        if self.is_listening or self.is_speaking:
+    def show_popup(self, requested_at=None):
+        """
+        Show (or raise) the window and greet (Tk thread)
+        
+        Args:
+            requested_at: time.perf_counter() of the hotkey press, for the latency measurement
+        """
+        already_shown = self.state() == "normal"
+        self._show_requested = requested_at or time.perf_counter()
+        self.deiconify()
+        self.lift()
+        self.focus_force()
+        if already_shown:
+            self._on_map(None)
+            return
+        
+        greeting = self.greetings.take() if self.greetings else None
+        if greeting:
+            self._log("JARVIS", greeting)
+            self.speak(greeting)
+        else:
+            self._show_greeting()
+    
+    def _on_map(self, event):
+        """Record how long the window took to appear"""
+        if self._show_requested is None or (event is not None and event.widget is not self):
+            return
+        elapsed = time.perf_counter() - self._show_requested
+        self._show_requested = None
+        self.show_latency.record(elapsed)
+        print(f"✅ JARVIS shown in {elapsed * 1000:.0f} ms "
+              f"(p95 {self.show_latency.percentile(95) * 1000:.0f} ms over {self.show_latency.count})")
+    
+    def start_listening(self, pre_roll=None):
+        """
+        Start voice recognition
+        
+        Args:
+            pre_roll: Seconds of already captured audio to include
+        """
+        if self.is_listening or self.asr is None:
             return
         
+        # Talking over JARVIS (or pressing listen) cuts the current answer short
+        if self.is_speaking:
+            self.stop_speaking()
+        
         self.is_listening = True
-        self.listen_btn.configure(state="disabled")
-        self.status_label.set_status("🎤 LISTENING...", Config.COLOR_GLOW)
-        self.arc_reactor.set_active(True)
-        self.waveform.set_active(True)
+        # Same queue as the workers so a late update of theirs can't override this one
+        self._set_button(self.listen_btn, "disabled")
+        self._set_status("🎤 LISTENING...", Config.COLOR_GLOW)
+        self._sync_activity()
+        self.ui.flush()
         
         # Run in thread to avoid blocking UI
-        threading.Thread(target=self._listen_thread, daemon=True).start()
+        threading.Thread(target=self._listen_thread, args=(pre_roll,), daemon=True).start()
+    
+    def _on_barge_in(self, since_onset):
+        """User spoke during playback - listen, starting from the speech onset"""
+        self.pipeline.cancel_speech()
+        self.ui.post(self.start_listening, pre_roll=since_onset + Config.CAPTURE_PRE_ROLL)
+    
+    def _set_status(self, text, color=None):
+        """Post a status change (only the last one per drain is drawn)"""
+        self.ui.latest("status", self.status_label.set_status, text, color)
+    
+    def _log(self, speaker, text):
+        """Post a conversation message"""
+        self._write_log(self.conversation.format_message(speaker, text), True)
+    
+    def _write_log(self, text, new_message=False):
+        """Post conversation text; everything posted between drains goes in with one insert"""
+        self.ui.append("conversation", self.conversation.write, (text, new_message))
+    
+    def _sync_activity(self):
+        """Post an animation refresh; the state is read when it is applied, so stale posts can't win"""
+        self.ui.latest("activity", self._apply_activity)
+    
+    def _apply_activity(self):
+        self.arc_reactor.set_active(self.is_listening)
+        self.waveform.set_active(self.is_listening or self.is_speaking)
+    
+    def _show_idle(self):
+        """Post the idle status, applied only if nothing started in the meantime"""
+        self.ui.latest("status", self._apply_idle)
+    
+    def _apply_idle(self):
+        if self.is_listening or self.is_speaking:
+            return
+        if self.asr is None:
+            self.status_label.set_status("❌ SPEECH RECOGNITION UNAVAILABLE", "#ff0000")
+        else:
+            self.status_label.set_status("SYSTEM ONLINE", Config.COLOR_PRIMARY)
+    
+    def _set_button(self, button, state):
+        """Post a button state change"""
+        self.ui.latest(("button", str(button)), button.configure, state=state)
     
-    def _listen_thread(self):
+    def _listen_thread(self, pre_roll=None):
         """Voice recognition thread"""
+        trace = get_tracer().start_trace("voice_turn", source="ui")
+        mic_open = trace.child("mic_open")
         try:
-            with sr.Microphone() as source:
-                # Adjust for ambient noise
-                self.recognizer.adjust_for_ambient_noise(source, duration=0.5)
+            microphone = self.capture.source(pre_roll) if self.capture else sr.Microphone()
+            with microphone as source:
+                mic_open.end()
+                
+                # Use the tracked noise floor - no per-listen calibration pause
+                self.noise_tracker.apply(self.recognizer)
                 
                 # Listen for audio
-                audio = self.recognizer.listen(
-                    source,
-                    timeout=Config.VOICE_TIMEOUT,
-                    phrase_time_limit=Config.VOICE_PHRASE_LIMIT
-                )
+                capture = trace.child("capture")
+                try:
+                    audio = self.recognizer.listen(
+                        source,
+                        timeout=Config.VOICE_TIMEOUT,
+                        phrase_time_limit=Config.VOICE_PHRASE_LIMIT
+                    )
+                finally:
+                    capture.end()
+                    self.noise_tracker.sync(self.recognizer)
                 
                 # Update status
-                self.status_label.set_status("⚙️ PROCESSING...", "#ffaa00")
-                
-                # Recognize speech
-                command = self.recognizer.recognize_google(audio)
-                
-                # Display user command
-                self.conversation.add_message("YOU", command)
+                self._set_status("⚙️ PROCESSING...", "#ffaa00")
                 
-                # Process with AI
-                self._process_command(command)
+                # Hand over to recognition / AI / speech stages
+                self.pipeline.submit(audio, span=trace)
         
         except sr.WaitTimeoutError:
-            self.status_label.set_status("⚠️ NO SPEECH DETECTED", "#ff4444")
-            self.conversation.add_message("SYSTEM", "No speech detected. Please try again.")
-        
-        except sr.UnknownValueError:
-            self.status_label.set_status("⚠️ COULD NOT UNDERSTAND", "#ff4444")
-            self.conversation.add_message("SYSTEM", "Could not understand audio. Please speak clearly.")
+            trace.end(outcome="no_speech")
+            self._set_status("⚠️ NO SPEECH DETECTED", "#ff4444")
+            self._log("SYSTEM", "No speech detected. Please try again.")
         
         except Exception as e:
-            self.status_label.set_status("❌ ERROR", "#ff0000")
-            self.conversation.add_message("SYSTEM", f"Error: {str(e)}")
+            trace.end(error=str(e))
+            self._set_status("❌ ERROR", "#ff0000")
+            self._log("SYSTEM", f"Error: {str(e)}")
         
         finally:
             self.is_listening = False
-            self.listen_btn.configure(state="normal")
-            self.arc_reactor.set_active(False)
-            self.waveform.set_active(False)
-            
-            if not self.is_speaking:
-                self.status_label.set_status("SYSTEM ONLINE", Config.COLOR_PRIMARY)
+            self._set_button(self.listen_btn, "normal")
+            self._sync_activity()
+            self._show_idle()
     
-    def _process_command(self, command):
-        """Process command with AI brain"""
-        try:
-            # Get AI response
-            response, command_executed = self.ai_brain.process_command(command)
-            
-            # Display response
-            self.conversation.add_message("JARVIS", response)
-            
-            # Speak response
-            self.speak(response)
-        
-        except Exception as e:
-            error_msg = f"Error processing command: {str(e)}"
-            self.conversation.add_message("SYSTEM", error_msg)
-            print(error_msg)
+    def _on_pipeline_event(self, event, turn, detail):
+        """Show pipeline progress (called from the stage workers)"""
+        if self.recorder:
+            self.recorder.on_event(event, turn, detail)
+        
+        if event == "recognized":
+            self._log("YOU", turn.text)
+        
+        elif event == "responded":
+            if self._streaming:
+                self._streaming = False
+                self._write_log("\n")
+                # A stream that broke off ends in an apology instead - show what is spoken
+                if turn.response != "".join(self._streamed):
+                    self._log("JARVIS", turn.response)
+            else:
+                self._log("JARVIS", turn.response)
+        
+        elif event == "error":
+            if self._streaming:
+                self._streaming = False
+                self._write_log("\n")
+            if isinstance(detail, UnknownSpeechError):
+                self._set_status("⚠️ COULD NOT UNDERSTAND", "#ff4444")
+                self._log("SYSTEM", "Could not understand audio. Please speak clearly.")
+            else:
+                self._set_status("❌ ERROR", "#ff0000")
+                self._log("SYSTEM", f"Error: {str(detail)}")
+    
+    def _respond(self, text):
+        """Response stage handler - streamed replies show up in the log as they arrive"""
+        self._streaming = False
+        self._streamed = []
+        return self.ai_brain.process_command(text, on_chunk=self._on_response_chunk)
+    
+    def _on_response_chunk(self, chunk):
+        """Called from the response stage for every streamed chunk"""
+        if not self._streaming:
+            self._streaming = True
+            self._write_log("\nJARVIS: ", True)
+        self._streamed.append(chunk)
+        self._write_log(chunk)
     
     def speak(self, text):
-        """Speak text using TTS"""
-        if self.is_speaking:
-            return
-        
-        self.is_speaking = True
-        self.stop_btn.configure(state="normal")
-        
-        threading.Thread(target=self._speak_thread, args=(text,), daemon=True).start()
+        """Queue text for the TTS stage"""
+        self.pipeline.say(text)
     
-    def _speak_thread(self, text):
-        """TTS thread"""
+    def _speak_blocking(self, text):
+        """TTS stage handler"""
+        self.is_speaking = True
+        self._set_button(self.stop_btn, "normal")
         try:
-            self.status_label.set_status("🔊 SPEAKING...", Config.COLOR_SECONDARY)
-            self.waveform.set_active(True)
+            self._set_status("🔊 SPEAKING...", Config.COLOR_SECONDARY)
+            self._sync_activity()
             
-            self.tts_engine.say(text)
-            self.tts_engine.runAndWait()
+            if self.barge_in:
+                self.barge_in.start()
+            self.speaker.speak(text)
         
         except Exception as e:
             print(f"TTS error: {e}")
         
         finally:
+            if self.barge_in:
+                self.barge_in.stop()
             self.is_speaking = False
-            self.stop_btn.configure(state="disabled")
-            self.waveform.set_active(False)
-            self.status_label.set_status("SYSTEM ONLINE", Config.COLOR_PRIMARY)
+            self._set_button(self.stop_btn, "disabled")
+            self._sync_activity()
+            self._show_idle()
     
     def stop_speaking(self):
-        """Stop TTS"""
-        try:
-            self.tts_engine.stop()
-        except:
-            pass
+        """Stop TTS, including the replies queued behind the current one"""
+        self.pipeline.cancel_speech()
+        self.speaker.cancel()
     
     def close_window(self):
-        """Close the JARVIS window"""
+        """Close the JARVIS window (hide it, if persistent)"""
+        self.stop_speaking()
+        if self.persistent:
+            self.withdraw()
+            return
+        self.shutdown()
+    
+    def shutdown(self):
+        """Stop the workers and destroy the window"""
         self.stop_speaking()
+        self.ui.stop()
+        self.pipeline.stop()
+        if self.recorder:
+            self.recorder.stop()
+        if Config.VOICE_WORKERS:
+            self.asr.close()
+            self.speaker.close()
         self.destroy()
@@ -5,8 +5,8 @@ Custom widgets for the Iron Man-style interface
 
 import customtkinter as ctk
 from tkinter import Canvas
-import math
-from ui.animations import AnimationEngine, WaveformGenerator
+import numpy as np
+from ui.animations import AnimationEngine, WaveformGenerator, FrameClock
 from config import Config
 
 
@@ -27,104 +27,125 @@ class ArcReactorWidget(Canvas):
         self.is_active = False
         self.angle = 0
         
+        # Canvas items are created once and updated in place every frame
+        self._glow_items = []
+        self._arc_items = []
+        self._center_item = None
+        self._glow_color = None
+        self._arc_angle = None
+        self._arcs_visible = False
+        self._create_items()
+        
         self.draw_arc_reactor()
-        self.animate()
+        self.clock = FrameClock.for_window(self)
+        self.clock.register(self)
     
-    def draw_arc_reactor(self):
-        """Draw the arc reactor with multiple rings"""
-        self.delete("all")
-        
-        # Get pulse intensity
-        intensity = self.animation.get_pulse_intensity(Config.PULSE_SPEED)
-        
-        # Glow color based on intensity
-        glow_color = self.animation.get_glow_color(Config.COLOR_GLOW, intensity)
-        
-        # Draw multiple concentric rings
+    def _create_items(self):
+        """Create the rings, rotating arcs and center dot"""
+        c = self.center
         num_rings = Config.ARC_REACTOR_RINGS
         for i in range(num_rings, 0, -1):
             radius = (self.size // 2 - 20) * (i / num_rings)
             
             # Outer glow
-            self.create_oval(
-                self.center - radius - 5,
-                self.center - radius - 5,
-                self.center + radius + 5,
-                self.center + radius + 5,
-                outline=glow_color,
+            self._glow_items.append(self.create_oval(
+                c - radius - 5, c - radius - 5, c + radius + 5, c + radius + 5,
                 width=8,
                 tags="glow"
-            )
+            ))
             
             # Main ring
             self.create_oval(
-                self.center - radius,
-                self.center - radius,
-                self.center + radius,
-                self.center + radius,
+                c - radius, c - radius, c + radius, c + radius,
                 outline=Config.COLOR_PRIMARY,
                 width=3,
                 tags="ring"
             )
         
-        # Draw rotating arcs for active state
-        if self.is_active:
-            self._draw_rotating_arcs()
+        # Rotating arcs (hidden until active)
+        radius = self.size // 2 - 30
+        for i in range(3):
+            self._arc_items.append(self.create_arc(
+                c - radius, c - radius, c + radius, c + radius,
+                start=i * 120,
+                extent=80,
+                outline=Config.COLOR_SECONDARY,
+                width=2,
+                style="arc",
+                state="hidden",
+                tags="rotating"
+            ))
         
         # Center dot
         center_radius = 10
-        self.create_oval(
-            self.center - center_radius,
-            self.center - center_radius,
-            self.center + center_radius,
-            self.center + center_radius,
+        self._center_item = self.create_oval(
+            c - center_radius, c - center_radius, c + center_radius, c + center_radius,
             fill=Config.COLOR_PRIMARY,
-            outline=glow_color,
             width=2,
             tags="center"
         )
     
-    def _draw_rotating_arcs(self):
-        """Draw rotating arcs around the reactor"""
-        radius = self.size // 2 - 30
+    def draw_arc_reactor(self):
+        """Update the arc reactor items for the current frame"""
+        # Get pulse intensity
+        intensity = self.animation.get_pulse_intensity(Config.PULSE_SPEED)
         
-        for i in range(3):
-            start_angle = self.angle + (i * 120)
-            end_angle = start_angle + 80
-            
-            # Convert to radians
-            start_rad = math.radians(start_angle)
-            end_rad = math.radians(end_angle)
-            
-            # Draw arc
-            self.create_arc(
-                self.center - radius,
-                self.center - radius,
-                self.center + radius,
-                self.center + radius,
-                start=start_angle,
-                extent=80,
-                outline=Config.COLOR_SECONDARY,
-                width=2,
-                style="arc",
-                tags="rotating"
-            )
+        # Glow color based on intensity (only touch Tk when it changed)
+        glow_color = self.animation.get_glow_color(Config.COLOR_GLOW, intensity)
+        if glow_color != self._glow_color:
+            self._glow_color = glow_color
+            for item in self._glow_items:
+                self.itemconfigure(item, outline=glow_color)
+            self.itemconfigure(self._center_item, outline=glow_color)
+        
+        # Rotating arcs for active state
+        if self.is_active:
+            self._draw_rotating_arcs()
+        elif self._arcs_visible:
+            self._arcs_visible = False
+            for item in self._arc_items:
+                self.itemconfigure(item, state="hidden")
     
-    def animate(self):
-        """Animation loop"""
+    def _draw_rotating_arcs(self):
+        """Rotate (and show) the arcs around the reactor"""
+        if not self._arcs_visible:
+            self._arcs_visible = True
+            for item in self._arc_items:
+                self.itemconfigure(item, state="normal")
+        # Canvas angles are drawn in whole degrees - skip frames that would not move them
+        angle = round(self.angle) % 360
+        if angle == self._arc_angle:
+            return
+        self._arc_angle = angle
+        for i, item in enumerate(self._arc_items):
+            self.itemconfigure(item, start=angle + (i * 120))
+    
+    def tick(self, now, dt):
+        """
+        Draw one frame (called by the window's FrameClock)
+        
+        Returns:
+            bool: True while the rotating arcs need the full frame rate
+        """
         self.angle = self.animation.update_arc_reactor()
         self.draw_arc_reactor()
-        self.after(50, self.animate)  # 20 FPS
+        return self.is_active
     
     def set_active(self, active=True):
         """Set active state (shows rotating arcs)"""
         self.is_active = active
+        if active:
+            self.clock.wake()
 
 
 class WaveformWidget(Canvas):
-    """Animated waveform visualization for voice"""
+    """Waveform visualization of live audio levels"""
     
-    def __init__(self, parent, width=400, height=80, num_bars=30):
+    def __init__(self, parent, width=400, height=80, num_bars=30, levels=None):
+        """
+        Args:
+            levels: LevelMeter to display while active (bars stay flat without one)
+        """
         super().__init__(
             parent,
             width=width,
@@ -136,45 +157,69 @@ class WaveformWidget(Canvas):
         self.height = height
         self.num_bars = num_bars
         self.waveform = WaveformGenerator(num_bars)
+        self.levels = levels
         self.is_active = False
         
+        # One rectangle per bar, moved / recolored in place
+        self._bar_items = [
+            self.create_rectangle(0, 0, 0, 0, outline="", tags=f"bar_{i}")
+            for i in range(num_bars)
+        ]
+        # Bar x positions never change; y is recomputed per frame for all bars at once
+        step = width / num_bars
+        left = np.arange(num_bars) * step
+        self._bar_x = np.round(np.column_stack((left, left + step - 2))).astype(np.int64)
+        self._bar_coords = np.full((num_bars, 4), -1, dtype=np.int64)
+        self._bar_colors = [None] * num_bars
+        
         self.draw_waveform()
-        self.animate()
+        self.clock = FrameClock.for_window(self)
+        self.clock.register(self)
     
-    def draw_waveform(self):
-        """Draw animated waveform bars"""
-        self.delete("all")
+    def draw_waveform(self, dt=0.05):
+        """Update the waveform bars for the current frame"""
+        bands = None
+        if self.levels is not None:
+            # Latest snapshot, read in place (no copy, no lock)
+            _, bands, _, _, age = self.levels.latest()
+            if age > Config.LEVELS_MAX_AGE:
+                bands = None
+        bar_heights = np.asarray(self.waveform.update(self.is_active, dt, bands))
+        bar_height = bar_heights * (self.height - 10)
+        y = (self.height - bar_height) / 2
         
-        bar_heights = self.waveform.update(self.is_active)
-        bar_width = self.width / self.num_bars - 2
+        # Whole pixels, so sub-pixel changes do not cost a Tk call
+        coords = np.column_stack((self._bar_x[:, 0], np.round(y), self._bar_x[:, 1], np.round(y + bar_height)))
+        coords = coords.astype(np.int64)
+        for i in np.flatnonzero((coords != self._bar_coords).any(axis=1)):
+            self.coords(self._bar_items[i], *coords[i].tolist())
+        self._bar_coords = coords
         
-        for i, height in enumerate(bar_heights):
-            x = i * (self.width / self.num_bars)
-            bar_height = height * (self.height - 10)
-            y = (self.height - bar_height) / 2
-            
-            # Get color based on height
-            color = self.waveform.get_bar_color(height)
-            
-            # Draw bar
-            self.create_rectangle(
-                x,
-                y,
-                x + bar_width,
-                y + bar_height,
-                fill=color,
-                outline="",
-                tags=f"bar_{i}"
-            )
+        # Colors based on height, looked up for all bars in one call
+        colors = self.waveform.get_bar_colors(bar_heights)
+        for i, color in enumerate(colors):
+            if color != self._bar_colors[i]:
+                self.itemconfigure(self._bar_items[i], fill=color)
+        self._bar_colors = colors
     
-    def animate(self):
-        """Animation loop"""
-        self.draw_waveform()
-        self.after(50, self.animate)  # 20 FPS
+    def tick(self, now, dt):
+        """
+        Draw one frame (called by the window's FrameClock)
+        
+        Returns:
+            bool: True while the bars are moving (active or still decaying)
+        """
+        self.draw_waveform(dt)
+        return self.is_active or any(height > 0.11 for height in self.waveform.bar_heights)
     
     def set_active(self, active=True):
         """Set active state (animates waveform)"""
         self.is_active = active
+        if self.levels is not None:
+            # Only spend CPU on metering while the levels are shown
+            self.levels.enabled = active
+        if active:
+            self.clock.wake()
 
 
 class GlassPanel(ctk.CTkFrame):
@@ -201,18 +246,38 @@ class StatusLabel(ctk.CTkLabel):
             font=("Segoe UI", 18, "bold"),
             **kwargs
         )
+        self._text = kwargs.get("text")
+        self._color = Config.COLOR_PRIMARY
     
     def set_status(self, text, color=None):
-        """Update status text and color"""
-        self.configure(text=text)
-        if color:
-            self.configure(text_color=color)
+        """Update status text and color (one configure, skipped if nothing changed)"""
+        changes = {}
+        if text != self._text:
+            changes["text"] = self._text = text
+        if color and color != self._color:
+            changes["text_color"] = self._color = color
+        if changes:
+            self.configure(**changes)
 
 
 class ConversationText(ctk.CTkTextbox):
-    """Scrollable conversation display"""
+    """
+    Scrollable conversation display
     
-    def __init__(self, parent, **kwargs):
+    Only the newest messages are kept in the Tk widget, older ones are trimmed
+    in batches into a bounded in-memory store and loaded back a batch at a time
+    when the user scrolls to the top, so insert / see cost stays flat in long
+    sessions.
+    """
+    
+    def __init__(self, parent, view_messages=None, trim_batch=None, store_messages=None, **kwargs):
+        """
+        Args:
+            parent: Parent widget
+            view_messages: Messages kept in the widget while following the end
+            trim_batch: Messages trimmed or loaded at once
+            store_messages: Messages remembered in total (oldest are forgotten)
+        """
         super().__init__(
             parent,
             fg_color=Config.COLOR_BACKGROUND,
@@ -223,24 +288,92 @@ class ConversationText(ctk.CTkTextbox):
             border_color=Config.COLOR_PRIMARY,
             **kwargs
         )
+        self.view_messages = view_messages or Config.CONVERSATION_VIEW_MESSAGES
+        self.trim_batch = trim_batch or Config.CONVERSATION_TRIM_BATCH
+        self.store_messages = max(store_messages or Config.CONVERSATION_STORE_MESSAGES,
+                                  self.view_messages + self.trim_batch)
+        self._store = []  # message texts, oldest first; the last _shown are in the widget
+        self._shown = 0
+        self._loading = False
+        self._textbox.configure(yscrollcommand=self._on_yscroll)
         self.configure(state="disabled")
     
     def add_message(self, speaker, text, color=None):
         """Add a message to the conversation"""
-        self.configure(state="normal")
+        self.write([(self.format_message(speaker, text), True)])
+    
+    @staticmethod
+    def format_message(speaker, text):
+        return f"\n{speaker}: {text}\n"
+    
+    def append_text(self, text):
+        """Append text to the newest message (e.g. a streamed chunk)"""
+        self.write([(text, False)])
+    
+    def write(self, items):
+        """
+        Add a batch of text with a single insert and scroll
         
-        # Format message
-        if color is None:
-            color = Config.COLOR_PRIMARY if speaker == "JARVIS" else Config.COLOR_TEXT
+        Args:
+            items: List of (text, starts_new_message) tuples
+        """
+        text = "".join(part for part, _ in items)
+        if not text:
+            return
+        following = self._textbox.yview()[1] >= 0.999
+        for part, starts in items:
+            if starts or not self._store:
+                self._store.append(part)
+                self._shown += 1
+            else:
+                self._store[-1] += part
         
-        message = f"\n{speaker}: {text}\n"
+        self.configure(state="normal")
+        self.insert("end", text)
+        # Trim while the user follows the end, or regardless once the widget holds half the store
+        excess = self._shown - self.view_messages
+        if excess >= self.trim_batch and (following or self._shown > self.store_messages // 2):
+            self._trim(excess)
+        if following:
+            self.see("end")
+        self.configure(state="disabled")
         
-        self.insert("end", message)
-        self.see("end")
+        # Forget the oldest messages that are not shown, in batches
+        if len(self._store) > self.store_messages + self.trim_batch:
+            del self._store[:len(self._store) - self.store_messages]
+    
+    def _trim(self, count):
+        """Remove the oldest ``count`` messages from the widget (they stay in the store)"""
+        first = len(self._store) - self._shown
+        lines = sum(message.count("\n") for message in self._store[first:first + count])
+        self.delete("1.0", f"{lines + 1}.0")
+        self._shown -= count
+    
+    def _on_yscroll(self, first, last):
+        self._y_scrollbar.set(first, last)
+        if float(first) <= 0.0 and float(last) < 1.0 and not self._loading and len(self._store) > self._shown:
+            self._loading = True
+            self.after_idle(self._load_older)
+    
+    def _load_older(self):
+        """Insert the previous batch of stored messages above the view, keeping the view in place"""
+        self._loading = False
+        hidden = len(self._store) - self._shown
+        if hidden <= 0:
+            return
+        count = min(self.trim_batch, hidden)
+        text = "".join(self._store[hidden - count:hidden])
+        self.configure(state="normal")
+        self.insert("1.0", text)
         self.configure(state="disabled")
+        self._shown += count
+        lines = text.count("\n")
+        self._textbox.yview(f"{lines + 1}.0")
     
     def clear(self):
         """Clear all messages"""
         self.configure(state="normal")
         self.delete("1.0", "end")
         self.configure(state="disabled")
+        self._store = []
+        self._shown = 0
@@ -0,0 +1 @@
+"""Voice package initialization"""
\ No newline at end of file
@@ -0,0 +1,106 @@
+"""
+JARVIS Barge-in Detection
+Watches the microphone while JARVIS is talking and interrupts playback as soon
+as the user starts speaking
+"""
+
+import threading
+import time
+from config import Config
+from voice.stats import LatencyStats
+from voice.vad import VoiceActivityDetector
+
+
+class BargeInMonitor:
+    """Echo-aware VAD that runs on the capture stream during TTS playback"""
+    
+    def __init__(self, capture, speaker, on_barge_in=None):
+        """
+        Args:
+            capture: Running AudioCaptureService
+            speaker: voice.tts.Speaker to interrupt
+            on_barge_in: Called with the seconds of audio since speech onset,
+                         after playback has been stopped
+        """
+        self.capture = capture
+        self.speaker = speaker
+        self.on_barge_in = on_barge_in
+        self.vad = VoiceActivityDetector(sample_rate=capture.sample_rate)
+        self.frame_seconds = self.vad.frame_len / capture.sample_rate
+        self.latency = LatencyStats()  # speech onset -> playback silent
+        
+        self.echo_level = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+    
+    def start(self):
+        """Start watching (call when playback starts)"""
+        self.stop()
+        self._stop.clear()
+        self.echo_level = 0.0
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        """Stop watching (call when playback ends)"""
+        self._stop.set()
+        thread, self._thread = self._thread, None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=1.0)
+    
+    def threshold(self):
+        """Speech threshold: above the room noise and above our own echo"""
+        return max(
+            self.vad.noise_tracker.energy_threshold,
+            self.echo_level * Config.BARGEIN_ECHO_MARGIN
+        )
+    
+    def _run(self):
+        frame_bytes = self.vad.frame_bytes
+        batch = frame_bytes * Config.VAD_BATCH_FRAMES
+        warmup_frames = int(Config.BARGEIN_ECHO_WARMUP / self.frame_seconds)
+        pos = self.capture.position - self.capture.position % frame_bytes
+        frames_seen = 0
+        speech_run = 0
+        
+        # TTS echo is not room noise - keep it out of the noise floor
+        self.capture.add_listener()
+        try:
+            while not self._stop.is_set():
+                if not self.capture.wait_for(pos + batch, timeout=0.2):
+                    continue
+                pos = max(pos, self.capture.ring.oldest_pos())
+                available = self.capture.position - pos
+                end = pos + available - available % frame_bytes
+                flags, energy = self.vad.classify(self.capture.read(pos, end), self.threshold())
+                
+                for index, is_speech in enumerate(flags):
+                    frames_seen += 1
+                    if frames_seen <= warmup_frames or not is_speech:
+                        # Learn how loud our own playback is at the microphone
+                        self.echo_level += 0.1 * (energy[index] - self.echo_level)
+                        speech_run = 0
+                        continue
+                    speech_run += 1
+                    if speech_run >= Config.BARGEIN_ONSET_FRAMES:
+                        onset_pos = pos + (index + 1 - speech_run) * frame_bytes
+                        self._barge_in(onset_pos)
+                        return
+                pos = end
+        finally:
+            self.capture.remove_listener()
+    
+    def _barge_in(self, onset_pos):
+        """Stop playback and hand over to listening"""
+        since_onset = (self.capture.position - onset_pos) / self.capture.bytes_per_second
+        onset_time = time.monotonic() - since_onset
+        
+        self.speaker.cancel()
+        self.speaker.wait_idle(timeout=2.0)
+        silent_time = self.speaker.last_stopped or time.monotonic()
+        latency = max(0.0, silent_time - onset_time)
+        self.latency.record(latency)
+        print(f"⚡ Barge-in: playback stopped {latency * 1000:.0f} ms after speech onset")
+        
+        if self.on_barge_in:
+            self.on_barge_in(time.monotonic() - onset_time)
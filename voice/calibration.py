@@ -0,0 +1,174 @@
+"""
+JARVIS Ambient Noise Calibration
+Tracks the room noise floor from idle audio and persists it across sessions,
+so listening never has to pause for adjust_for_ambient_noise
+"""
+
+import atexit
+import json
+import threading
+from collections import deque
+import time
+from datetime import datetime
+from pathlib import Path
+import numpy as np
+from config import Config
+
+
+class NoiseFloorTracker:
+    """Continuously tracked noise floor and the derived speech energy threshold"""
+    
+    def __init__(self, profile_path=None):
+        """
+        Args:
+            profile_path: JSON file the noise profile is persisted to
+        """
+        self.profile_path = Path(profile_path or Config.NOISE_PROFILE_PATH)
+        self.ratio = Config.NOISE_THRESHOLD_RATIO
+        self.alpha = Config.NOISE_SMOOTHING
+        self.noise_rms = None
+        self.energy_threshold = Config.NOISE_DEFAULT_THRESHOLD
+        self.is_calibrated = False
+        
+        self._recent = deque(maxlen=Config.NOISE_RISE_WINDOW)  # rms of recent idle frames
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._last_save = 0.0
+        self._save_timer = None
+        
+        self.load()
+    
+    def observe(self, frame, sample_width=2):
+        """
+        Feed one frame of idle (non-speech) audio
+        
+        Runs on the PortAudio callback, so the profile is written from a
+        background timer rather than here.
+        
+        Args:
+            frame: Raw little-endian PCM bytes (or memoryview)
+            sample_width: Bytes per sample (1 = unsigned 8-bit, 2 or 4 = signed)
+        
+        Returns:
+            float: Updated energy threshold
+        
+        Raises:
+            ValueError: For any other sample width
+        """
+        samples = self._to_int16_scale(frame, sample_width)
+        if samples.size == 0:
+            return self.energy_threshold
+        rms = float(np.sqrt(np.mean(samples * samples)))
+        
+        with self._lock:
+            self._recent.append(rms)
+            if self.is_calibrated and rms > self.energy_threshold:
+                # Loud frames are speech, not room noise - unless even the quiet moments
+                # are that loud now, i.e. the room got louder (e.g. a saved quiet profile)
+                rms = self._louder_floor()
+                if rms is None:
+                    return self.energy_threshold
+            if self.noise_rms is None:
+                self.noise_rms = rms
+            else:
+                self.noise_rms += self.alpha * (rms - self.noise_rms)
+            self._set_threshold(self.noise_rms * self.ratio)
+            self._save_later()
+        return self.energy_threshold
+    
+    def _louder_floor(self):
+        """Noise level of a room that got louder than the threshold, or None (lock held by caller)"""
+        if len(self._recent) < self._recent.maxlen:
+            return None
+        floor = float(np.percentile(self._recent, Config.NOISE_RISE_PERCENTILE))
+        return floor if floor > self.energy_threshold else None
+    
+    @staticmethod
+    def _to_int16_scale(frame, sample_width):
+        """PCM samples as float32 on the 16-bit scale the thresholds use"""
+        if sample_width == 1:
+            samples = np.frombuffer(frame, dtype=np.uint8).astype(np.float32)
+            return (samples - 128) * 256
+        if sample_width == 2:
+            return np.frombuffer(frame, dtype="<i2").astype(np.float32)
+        if sample_width == 4:
+            return np.frombuffer(frame, dtype="<i4").astype(np.float32) / 65536
+        raise ValueError(f"Unsupported sample width: {sample_width} bytes (expected 1, 2 or 4)")
+    
+    def _save_later(self):
+        """Schedule a save once the save interval allows one (lock held by caller)"""
+        if self._save_timer is not None:
+            return
+        delay = max(0.0, self._last_save + Config.NOISE_SAVE_INTERVAL - time.monotonic())
+        self._save_timer = threading.Timer(delay, self._save_due)
+        self._save_timer.daemon = True
+        self._save_timer.start()
+    
+    def _save_due(self):
+        with self._lock:
+            self._save_timer = None
+        self.save()
+    
+    def apply(self, recognizer):
+        """Prime a speech_recognition.Recognizer with the tracked threshold"""
+        recognizer.energy_threshold = self.energy_threshold
+        # Keep adapting from the idle audio heard while waiting for speech
+        recognizer.dynamic_energy_threshold = True
+        recognizer.dynamic_energy_ratio = self.ratio
+    
+    def sync(self, recognizer):
+        """Adopt the threshold a recognizer adapted to during its last listen"""
+        with self._lock:
+            self._set_threshold(recognizer.energy_threshold)
+            self.noise_rms = self.energy_threshold / self.ratio
+        self.save()
+    
+    def _set_threshold(self, threshold):
+        """Clamp and store a new threshold (lock held by caller)"""
+        self.energy_threshold = min(
+            Config.NOISE_MAX_THRESHOLD,
+            max(Config.NOISE_MIN_THRESHOLD, float(threshold))
+        )
+        self.is_calibrated = True
+        self._dirty = True
+    
+    def load(self):
+        """Load a persisted noise profile, if any"""
+        try:
+            profile = json.loads(self.profile_path.read_text())
+            self.noise_rms = profile.get("noise_rms")
+            self.energy_threshold = float(profile["energy_threshold"])
+            self.is_calibrated = True
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+    
+    def save(self, force=False):
+        """Persist the noise profile (rate limited unless forced)"""
+        now = time.monotonic()
+        if not self._dirty or (not force and now - self._last_save < Config.NOISE_SAVE_INTERVAL):
+            return
+        with self._lock:
+            profile = {
+                "noise_rms": self.noise_rms,
+                "energy_threshold": self.energy_threshold,
+                "updated": datetime.now().isoformat(timespec="seconds"),
+            }
+            self._dirty = False
+            self._last_save = now
+        try:
+            self.profile_path.parent.mkdir(parents=True, exist_ok=True)
+            self.profile_path.write_text(json.dumps(profile, indent=2))
+        except OSError as e:
+            print(f"⚠️  Could not save noise profile: {e}")
+
+
+_tracker = None
+
+
+def get_noise_tracker():
+    """Get the shared noise floor tracker"""
+    global _tracker
+    if _tracker is None:
+        _tracker = NoiseFloorTracker()
+        atexit.register(_tracker.save, force=True)
+    return _tracker
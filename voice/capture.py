@@ -0,0 +1,282 @@
+"""
+JARVIS Audio Capture Service
+Keeps one microphone stream open for the whole session and records into a
+fixed-size ring buffer, so listeners get pre-roll audio from before they started
+"""
+
+import threading
+import time
+from config import Config
+from voice.calibration import get_noise_tracker
+
+# Try importing audio backends
+try:
+    import pyaudio
+    PYAUDIO_AVAILABLE = True
+except ImportError:
+    PYAUDIO_AVAILABLE = False
+
+try:
+    import speech_recognition as sr
+    AudioSourceBase = sr.AudioSource
+except ImportError:
+    AudioSourceBase = object
+
+
+class RingBuffer:
+    """Fixed-size byte ring buffer addressed by absolute stream positions"""
+    
+    def __init__(self, capacity, frame_size=2):
+        """
+        Args:
+            capacity: Buffer size in bytes (rounded down to whole frames)
+            frame_size: Bytes per audio frame (sample width * channels)
+        """
+        self.frame_size = frame_size
+        self.capacity = capacity - capacity % frame_size
+        self._buffer = bytearray(self.capacity)
+        self._view = memoryview(self._buffer)
+        self.write_pos = 0  # total bytes ever written
+    
+    def write(self, data):
+        """Append audio, overwriting the oldest bytes once full (single writer)"""
+        data = memoryview(data).cast("B")
+        size = len(data)
+        if size > self.capacity:
+            self.write_pos += size - self.capacity
+            data = data[-self.capacity:]
+            size = self.capacity
+        
+        start = self.write_pos % self.capacity
+        first = min(size, self.capacity - start)
+        self._view[start:start + first] = data[:first]
+        if first < size:
+            self._view[:size - first] = data[first:]
+        self.write_pos += size
+    
+    def oldest_pos(self):
+        """Oldest absolute position still held in the buffer"""
+        return max(0, self.write_pos - self.capacity)
+    
+    def read(self, start, end=None):
+        """
+        Get zero-copy views of a range of the stream
+        
+        Args:
+            start: Absolute start position (clamped to the oldest retained byte)
+            end: Absolute end position (defaults to the current write position)
+        
+        Returns:
+            List of one or two memoryview slices covering [start, end).
+            Views alias the ring, so consume them before the writer laps them.
+        """
+        end = self.write_pos if end is None else min(end, self.write_pos)
+        start = max(start, self.oldest_pos())
+        if start >= end:
+            return []
+        
+        offset = start % self.capacity
+        size = end - start
+        first = min(size, self.capacity - offset)
+        views = [self._view[offset:offset + first]]
+        if first < size:
+            views.append(self._view[:size - first])
+        return views
+    
+    def read_bytes(self, start, end=None):
+        """Copy a range of the stream into a new bytes object"""
+        return b"".join(self.read(start, end))
+
+
+class AudioCaptureService:
+    """Long-lived microphone capture shared by every listener in the process"""
+    
+    def __init__(self, sample_rate=None, chunk=None, buffer_seconds=None, device_index=None):
+        self.sample_rate = sample_rate or Config.CAPTURE_SAMPLE_RATE
+        self.chunk = chunk or Config.CAPTURE_CHUNK
+        self.sample_width = 2  # 16-bit mono
+        self.device_index = device_index
+        self.bytes_per_second = self.sample_rate * self.sample_width
+        self.ring = RingBuffer(
+            int((buffer_seconds or Config.CAPTURE_BUFFER_SECONDS) * self.bytes_per_second),
+            frame_size=self.sample_width
+        )
+        self.noise_tracker = get_noise_tracker()
+        
+        self._audio = None
+        self._stream = None
+        self._data_ready = threading.Condition()
+        self._active_listeners = 0
+        self.is_running = False
+        self.levels = None  # optional LevelMeter fed with every chunk
+    
+    def start(self):
+        """Open the input stream (idempotent)"""
+        if self.is_running:
+            return self
+        if not PYAUDIO_AVAILABLE:
+            raise ImportError("PyAudio not installed. Run: pip install pyaudio")
+        
+        self._audio = pyaudio.PyAudio()
+        try:
+            self._stream = self._audio.open(
+                format=pyaudio.paInt16,
+                channels=1,
+                rate=self.sample_rate,
+                input=True,
+                input_device_index=self.device_index,
+                frames_per_buffer=self.chunk,
+                stream_callback=self._on_audio
+            )
+        except Exception:
+            self._audio.terminate()
+            self._audio = None
+            raise
+        self.is_running = True
+        return self
+    
+    def stop(self):
+        """Close the input stream"""
+        self.is_running = False
+        try:
+            if self._stream is not None:
+                self._stream.stop_stream()
+                self._stream.close()
+        finally:
+            self._stream = None
+            if self._audio is not None:
+                self._audio.terminate()
+                self._audio = None
+        with self._data_ready:
+            self._data_ready.notify_all()
+    
+    def _on_audio(self, in_data, frame_count, time_info, status):
+        """PortAudio callback - runs on the audio thread"""
+        self.feed(in_data)
+        return (None, pyaudio.paContinue)
+    
+    def feed(self, data):
+        """Write captured audio into the ring and wake up waiting listeners"""
+        self.ring.write(data)
+        if self.levels is not None:
+            self.levels.feed(data)
+        if self._active_listeners == 0:
+            # Nobody is listening, so this is idle room audio
+            self.noise_tracker.observe(data, self.sample_width)
+        with self._data_ready:
+            self._data_ready.notify_all()
+    
+    @property
+    def position(self):
+        """Current absolute write position in bytes"""
+        return self.ring.write_pos
+    
+    def seconds_to_bytes(self, seconds):
+        """Convert a duration to a frame-aligned byte count"""
+        size = int(seconds * self.bytes_per_second)
+        return size - size % self.sample_width
+    
+    def wait_for(self, position, timeout=None):
+        """
+        Block until the stream has been written up to a position
+        
+        Returns:
+            bool: True if the data is available
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._data_ready:
+            while self.ring.write_pos < position:
+                if not self.is_running:
+                    return False
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._data_ready.wait(remaining)
+        return True
+    
+    def read(self, start, end=None):
+        """Zero-copy memoryview slices of [start, end) - see RingBuffer.read"""
+        return self.ring.read(start, end)
+    
+    def source(self, pre_roll=None):
+        """
+        Get a speech_recognition-compatible source reading from the ring
+        
+        Args:
+            pre_roll: Seconds of already captured audio to start with
+        
+        Returns:
+            RingBufferSource: Use as ``with service.source() as source:``
+        """
+        return RingBufferSource(self, Config.CAPTURE_PRE_ROLL if pre_roll is None else pre_roll)
+    
+    def add_listener(self):
+        """Mark captured audio as non-idle (pauses noise floor tracking)"""
+        with self._data_ready:
+            self._active_listeners += 1
+    
+    def remove_listener(self):
+        """Undo add_listener()"""
+        with self._data_ready:
+            self._active_listeners = max(0, self._active_listeners - 1)
+
+
+class RingBufferStream:
+    """File-like reader over the capture ring, starting at a fixed position"""
+    
+    def __init__(self, service, position):
+        self.service = service
+        self.position = position
+    
+    def read(self, num_frames):
+        """Read the next ``num_frames`` samples, blocking until they are captured"""
+        size = num_frames * self.service.sample_width
+        if not self.service.wait_for(self.position + size):
+            return b""  # capture stopped - end of stream
+        # Skip ahead if a slow reader was lapped by the writer
+        self.position = max(self.position, self.service.ring.oldest_pos())
+        data = self.service.ring.read_bytes(self.position, self.position + size)
+        self.position += len(data)
+        return data
+    
+    def close(self):
+        pass
+
+
+class RingBufferSource(AudioSourceBase):
+    """speech_recognition AudioSource backed by the shared capture service"""
+    
+    def __init__(self, service, pre_roll):
+        self.service = service
+        self.pre_roll = pre_roll
+        self.SAMPLE_RATE = service.sample_rate
+        self.SAMPLE_WIDTH = service.sample_width
+        self.CHUNK = service.chunk
+        self.stream = None
+    
+    def __enter__(self):
+        self.service.start()
+        self.service.add_listener()
+        start = max(
+            self.service.ring.oldest_pos(),
+            self.service.position - self.service.seconds_to_bytes(self.pre_roll)
+        )
+        self.stream = RingBufferStream(self.service, start)
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.service.remove_listener()
+        self.stream = None
+
+
+_capture_service = None
+_capture_lock = threading.Lock()
+
+
+def get_capture_service():
+    """Get the shared (started) capture service"""
+    global _capture_service
+    with _capture_lock:
+        if _capture_service is None:
+            _capture_service = AudioCaptureService()
+        return _capture_service.start()
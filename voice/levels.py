@@ -0,0 +1,146 @@
+"""
+JARVIS Audio Level Metering
+Per-band levels and RMS / peak of live audio, computed with NumPy on the
+audio thread and published through a fixed-size slot ring that the UI reads
+without locks or copies
+"""
+
+import threading
+import time
+import numpy as np
+from config import Config
+
+
+class LevelBuffer:
+    """
+    Single-writer, lock-free ring of level snapshots
+    
+    The writer fills the slot after the newest one and then bumps ``seq``, so
+    a reader always sees a completely written slot. A view returned by
+    latest() stays valid until the writer has published ``slots - 1`` more
+    snapshots, far longer than one UI frame takes to draw.
+    """
+    
+    def __init__(self, num_bands, slots=4):
+        self.bands = np.zeros((slots, num_bands), dtype=np.float32)
+        self.scalars = np.zeros((slots, 3), dtype=np.float64)  # rms, peak, monotonic time
+        self.slots = slots
+        self.seq = 0
+    
+    def publish(self, bands, rms, peak):
+        slot = (self.seq + 1) % self.slots
+        self.bands[slot] = bands
+        self.scalars[slot] = (rms, peak, time.monotonic())
+        self.seq += 1  # only the writer thread changes seq
+    
+    def latest(self):
+        """
+        Newest snapshot
+        
+        Returns:
+            tuple: (seq, band levels 0..1 view, rms 0..1, peak 0..1, age in seconds)
+        """
+        seq = self.seq
+        slot = seq % self.slots
+        rms, peak, stamp = self.scalars[slot]
+        age = time.monotonic() - stamp if seq else float("inf")
+        return seq, self.bands[slot], rms, peak, age
+
+
+class LevelMeter:
+    """Log-spaced band levels (dBFS mapped to 0..1) of 16-bit mono audio"""
+    
+    def __init__(self, num_bands=None, sample_rate=None, fft_size=512, budget_ms=None):
+        """
+        Args:
+            num_bands: Number of frequency bands (defaults to Config.LEVELS_BANDS)
+            sample_rate: Input rate (defaults to Config.CAPTURE_SAMPLE_RATE)
+            fft_size: Analysis window in samples
+            budget_ms: CPU time allowed per update before chunks get skipped
+        """
+        self.num_bands = num_bands or Config.LEVELS_BANDS
+        self.sample_rate = sample_rate or Config.CAPTURE_SAMPLE_RATE
+        self.fft_size = fft_size
+        self.budget = (budget_ms or Config.LEVELS_BUDGET_MS) / 1000.0
+        self.buffer = LevelBuffer(self.num_bands)
+        self.enabled = False  # turned on by whoever displays the levels
+        
+        self._window = np.hanning(fft_size).astype(np.float32)
+        # Full-scale sine -> power 1.0 in its bin
+        self._power_scale = 1.0 / (self._window.sum() / 2) ** 2
+        freqs = np.fft.rfftfreq(fft_size, 1.0 / self.sample_rate)
+        edges = np.geomspace(Config.LEVELS_MIN_HZ, self.sample_rate / 2, self.num_bands + 1)
+        starts = np.searchsorted(freqs, edges[:-1])
+        # Every band gets at least one FFT bin (the low bands are narrower than a bin)
+        starts = np.maximum(starts, starts[0] + np.arange(self.num_bands))
+        self._starts = np.minimum(starts, freqs.size - 1)
+        self._counts = np.diff(np.append(self._starts, freqs.size)).astype(np.float32)
+        self._floor = Config.LEVELS_FLOOR_DB
+        
+        self._tail = np.zeros(fft_size, dtype=np.float32)
+        self._stride = 1  # analyse every n-th chunk when over budget
+        self._skip = 0
+        self._cost = 0.0  # smoothed seconds per update
+    
+    def feed(self, data):
+        """
+        Analyse a chunk of 16-bit mono PCM (one writer thread per meter)
+        
+        Args:
+            data: bytes-like little-endian int16 samples
+        """
+        if not self.enabled:
+            return
+        self._skip += 1
+        if self._skip < self._stride:
+            return
+        self._skip = 0
+        started = time.perf_counter()
+        self._analyse(np.frombuffer(data, dtype=np.int16))
+        self._account(time.perf_counter() - started)
+    
+    def _analyse(self, samples):
+        x = samples.astype(np.float32) * (1.0 / 32768.0)
+        count = min(x.size, self.fft_size)
+        if count == 0:
+            return
+        # Slide the analysis window along
+        self._tail[:-count] = self._tail[count:]
+        self._tail[-count:] = x[-count:]
+        
+        spectrum = np.fft.rfft(self._tail * self._window)
+        power = (spectrum.real ** 2 + spectrum.imag ** 2) * self._power_scale
+        bands = np.add.reduceat(power, self._starts) / self._counts
+        db = 10.0 * np.log10(bands + 1e-12)
+        levels = np.clip((db - self._floor) / -self._floor, 0.0, 1.0)
+        
+        rms = float(np.sqrt(np.mean(x * x)))
+        peak = float(np.max(np.abs(x)))
+        self.buffer.publish(levels, rms, peak)
+    
+    def _account(self, elapsed):
+        """Back off (analyse fewer chunks) when updates cost more than the budget"""
+        self._cost = 0.9 * self._cost + 0.1 * elapsed if self._cost else elapsed
+        if self._cost > self.budget:
+            self._stride = min(self._stride + 1, 8)
+        elif self._cost < self.budget / 2 and self._stride > 1:
+            self._stride -= 1
+    
+    def latest(self):
+        """See LevelBuffer.latest"""
+        return self.buffer.latest()
+    
+    def stats(self):
+        return {"cost_ms": self._cost * 1000, "stride": self._stride, "updates": self.buffer.seq}
+
+
+_meters = {}
+_meters_lock = threading.Lock()
+
+
+def get_level_meter(source="mic"):
+    """Get the shared meter of an audio source (the capture service feeds "mic")"""
+    with _meters_lock:
+        if source not in _meters:
+            _meters[source] = LevelMeter()
+        return _meters[source]
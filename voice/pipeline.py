@@ -0,0 +1,412 @@
+"""
+JARVIS Voice Pipeline
+Capture -> ASR -> intent/LLM -> TTS as overlapping stages with bounded queues,
+so the microphone keeps capturing while earlier turns are still being handled
+"""
+
+import itertools
+import queue
+import threading
+import time
+from config import Config
+from voice.stats import LatencyStats
+from voice.recognizers import UnknownSpeechError
+from voice.preprocess import get_preprocessor
+from tracing import get_tracer, NULL_SPAN
+from metrics import QUEUE_DEPTH
+
+
+def _ms(seconds):
+    """Format seconds as a millisecond column"""
+    return f"{seconds * 1000:8.1f}" if seconds is not None else f"{'-':>8}"
+
+
+class Turn:
+    """One user utterance travelling through the pipeline"""
+    
+    _ids = itertools.count(1)
+    
+    def __init__(self, audio=None, text=None, span=None):
+        self.id = next(self._ids)
+        self.audio = audio  # Utterance or AudioData
+        self.text = text
+        self.span = span or NULL_SPAN  # root span of the turn's trace
+        self.response = None
+        self.created = time.monotonic()
+        self.enqueued = None
+        self.finished = None
+        self.timings = {}  # stage name -> seconds spent in the stage
+        self.waits = {}  # stage name -> seconds spent queued before the stage
+    
+    def audio_data(self):
+        """AudioData for the recognizer"""
+        if hasattr(self.audio, "audio_data"):
+            return self.audio.audio_data()
+        return self.audio
+
+
+class Stage:
+    """A worker thread fed by a bounded queue"""
+    
+    def __init__(self, name, handler, maxsize, on_error=None, on_done=None):
+        """
+        Args:
+            name: Stage name used in stats
+            handler: Callable(turn) -> turn to forward, or None to stop here
+            maxsize: Input queue bound
+            on_error: Callable(stage_name, turn, exception)
+            on_done: Callable(turn) for turns that end at this stage
+        """
+        self.name = name
+        self.handler = handler
+        self.on_error = on_error
+        self.on_done = on_done
+        self.queue = queue.Queue(maxsize)
+        QUEUE_DEPTH.track(self.queue, f"pipeline_{name}")
+        self.next_stage = None
+        self.latency = LatencyStats()
+        self.wait = LatencyStats()
+        self.processed = 0
+        self.dropped = 0
+        self.errors = 0
+        self._stopped = False
+        self._thread = None
+    
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name=f"pipeline-{self.name}", daemon=True)
+        self._thread.start()
+    
+    def put(self, turn, block=True):
+        """
+        Queue a turn for this stage
+        
+        Args:
+            block: Wait for room (back-pressure); otherwise drop the oldest queued turn
+        """
+        turn.enqueued = time.monotonic()
+        if self._stopped:
+            self._drop(turn)  # it would never run
+            return
+        if block:
+            self.queue.put(turn)
+            return
+        while True:
+            try:
+                self.queue.put_nowait(turn)
+                return
+            except queue.Full:
+                if not self._evict():
+                    self._drop(turn)
+                    return
+    
+    def _evict(self):
+        """
+        Drop the oldest queued turn to make room
+        
+        Returns:
+            bool: False if a pending stop was found instead (it stays queued)
+        """
+        try:
+            turn = self.queue.get_nowait()
+        except queue.Empty:
+            return True
+        if turn is None:
+            self.queue.put(None)
+            return False
+        self._drop(turn)
+        return True
+    
+    def _drop(self, turn):
+        """End a turn that will never be handled"""
+        self.dropped += 1
+        turn.span.set(outcome="dropped")
+        if self.on_done:
+            self.on_done(turn)
+    
+    def clear(self):
+        """
+        Take every queued turn off the queue (a pending stop stays queued)
+        
+        Returns:
+            list: The removed turns, oldest first
+        """
+        cleared = []
+        while True:
+            try:
+                turn = self.queue.get_nowait()
+            except queue.Empty:
+                return cleared
+            if turn is None:
+                self.queue.put(None)
+                return cleared
+            cleared.append(turn)
+    
+    def _run(self):
+        while True:
+            turn = self.queue.get()
+            if turn is None:
+                break
+            started = time.monotonic()
+            turn.waits[self.name] = started - turn.enqueued
+            self.wait.record(turn.waits[self.name])
+            result = None
+            try:
+                with turn.span.child(self.name, queued_ms=round(turn.waits[self.name] * 1000, 3)):
+                    result = self.handler(turn)
+                self.processed += 1
+            except Exception as e:
+                self.errors += 1
+                if self.on_error:
+                    self.on_error(self.name, turn, e)
+            finally:
+                elapsed = time.monotonic() - started
+                turn.timings[self.name] = elapsed
+                self.latency.record(elapsed)
+            if result is not None and self.next_stage is not None:
+                self.next_stage.put(result)
+            elif self.on_done:
+                self.on_done(turn)
+    
+    def stop(self):
+        """
+        Let the worker finish after the turns already queued
+        
+        Never blocks, so a stage callback may stop the pipeline from the
+        worker thread itself; a full queue loses its oldest turn.
+        """
+        if self._stopped:
+            return
+        self._stopped = True
+        while True:
+            try:
+                self.queue.put_nowait(None)
+                return
+            except queue.Full:
+                if not self._evict():
+                    return
+    
+    def stats(self):
+        """Queue depth and latency view of this stage"""
+        return {
+            "name": self.name,
+            "depth": self.queue.qsize(),
+            "maxsize": self.queue.maxsize,
+            "processed": self.processed,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "latency": self.latency.summary(),
+            "wait": self.wait.summary(),
+        }
+
+
+class VoicePipeline:
+    """Staged voice loop shared by the UI and the command line assistant"""
+    
+    def __init__(self, recognizer, respond, speak, utterances=None, on_event=None, preprocessor=None):
+        """
+        Args:
+            recognizer: BaseRecognizer used by the ASR stage
+            respond: Callable(text) -> reply text, or (reply, ...) like JarvisAI.process_command
+            speak: Callable(text) that plays a reply (blocking)
+            utterances: Iterable of captured utterances for continuous capture;
+                        None when audio is pushed with submit()
+            on_event: Callable(event, turn, detail) for "recognized", "responded",
+                      "spoken", "echo", "error" and "done" (turn finished) notifications
+            preprocessor: AudioPreprocessor run before recognition (defaults to
+                          the shared one, None if PREPROCESS_ENABLED is off; not
+                          used for recognizers that preprocess themselves)
+        """
+        self.recognizer = recognizer
+        self.respond = respond
+        self.speak = speak
+        self.utterances = utterances
+        self.on_event = on_event or (lambda event, turn, detail=None: None)
+        self.preprocessor = None
+        if not getattr(recognizer, "preprocesses", False):  # e.g. the ASR worker process
+            self.preprocessor = preprocessor or get_preprocessor()
+        self.tracer = get_tracer()
+        
+        size = Config.PIPELINE_QUEUE_SIZE
+        self.asr = Stage("asr", self._recognize, size, self._stage_error, self._finish)
+        self.intent = Stage("intent", self._respond, size, self._stage_error, self._finish)
+        self.tts = Stage("tts", self._speak, size, self._stage_error, self._finish)
+        self.asr.next_stage = self.intent
+        self.intent.next_stage = self.tts
+        self.stages = [self.asr, self.intent, self.tts]
+        
+        self.captured = 0
+        self.echo_dropped = 0
+        self._playback = (0.0, 0.0)  # (started, ended) of the latest reply
+        self._barge_in_at = None
+        self._capture_thread = None
+        self._stopped = threading.Event()
+    
+    def start(self):
+        """Start the stage workers (and the capture loop, if continuous)"""
+        for stage in self.stages:
+            stage.start()
+        if self.utterances is not None:
+            self._capture_thread = threading.Thread(target=self._capture_loop, name="pipeline-capture", daemon=True)
+            self._capture_thread.start()
+        return self
+    
+    def run(self):
+        """Start and block until stop() is called"""
+        self.start()
+        self._stopped.wait()
+    
+    def stop(self):
+        """Stop all workers"""
+        self._stopped.set()
+        for stage in self.stages:
+            stage.stop()
+    
+    def submit(self, audio, span=None):
+        """
+        Queue a captured utterance for recognition (never blocks capture)
+        
+        Args:
+            audio: Utterance or AudioData
+            span: Root span of the turn, if the caller already started its trace
+        """
+        turn = Turn(audio=audio, span=span or self.tracer.start_trace("voice_turn"))
+        self.asr.put(turn, block=False)
+        return turn
+    
+    def submit_text(self, text):
+        """Queue an already recognized command"""
+        turn = Turn(text=text, span=self.tracer.start_trace("text_turn"))
+        self.intent.put(turn, block=False)
+        return turn
+    
+    def say(self, text):
+        """Queue text straight to the TTS stage"""
+        turn = Turn(span=self.tracer.start_trace("say"))
+        turn.response = text
+        self.tts.put(turn, block=False)
+        return turn
+    
+    def cancel_speech(self):
+        """
+        Drop the replies still waiting for the TTS stage
+        
+        Stopping the reply that is playing right now is up to the caller
+        (speaker.cancel()) - call this first, so the stage can't start the next one.
+        
+        Returns:
+            int: Number of replies dropped
+        """
+        cancelled = self.tts.clear()
+        for turn in cancelled:
+            turn.span.set(outcome="cancelled")
+            self._finish(turn)
+        return len(cancelled)
+    
+    def mark_barge_in(self, onset_time):
+        """
+        Keep the utterance that interrupted the current reply, even though it overlaps playback
+        
+        Args:
+            onset_time: time.monotonic() when the user started talking over JARVIS
+        """
+        self._barge_in_at = onset_time
+    
+    def _capture_loop(self):
+        for utterance in self.utterances:
+            if self._stopped.is_set():
+                break
+            self.captured += 1
+            if self._is_echo(utterance):
+                self.echo_dropped += 1
+                self.on_event("echo", Turn(audio=utterance), None)
+                continue
+            # The trace starts when the user started talking
+            start = utterance.start_time
+            span = self.tracer.start_trace("voice_turn", start=start, source="vad")
+            span.child("capture", start=start).end()
+            self.submit(utterance, span)
+    
+    def _is_echo(self, utterance):
+        """Did this utterance start while JARVIS itself was talking (and not to interrupt it)?"""
+        start = getattr(utterance, "start_time", None)
+        if start is None:
+            return False
+        started, ended = self._playback
+        if not started <= start <= ended + Config.PIPELINE_ECHO_TAIL:
+            return False
+        # Only a barge-in on this reply counts - an old one must not let later echoes through
+        barge_in = self._barge_in_at
+        return not (barge_in is not None and barge_in >= started and start >= barge_in - Config.CAPTURE_PRE_ROLL)
+    
+    def _prepare(self, turn):
+        """Audio for the recognizer, cleaned up by the preprocessor if enabled"""
+        if self.preprocessor is None:
+            return turn.audio_data()
+        return self.preprocessor.process(turn.audio)
+    
+    def _recognize(self, turn):
+        try:
+            turn.text = self.recognizer.recognize(self._prepare(turn))
+        except UnknownSpeechError as e:
+            turn.span.set(outcome="not_understood")
+            self.on_event("error", turn, e)
+            return None
+        self.on_event("recognized", turn, None)
+        return turn
+    
+    def _respond(self, turn):
+        reply = self.respond(turn.text)
+        if isinstance(reply, tuple):
+            reply = reply[0]
+        if not reply:
+            return None
+        turn.response = reply
+        self.on_event("responded", turn, None)
+        return turn
+    
+    def _speak(self, turn):
+        started = time.monotonic()
+        self._playback = (started, float("inf"))
+        try:
+            self.speak(turn.response)
+        finally:
+            self._playback = (started, time.monotonic())
+        self.on_event("spoken", turn, None)
+        return None
+    
+    def _finish(self, turn):
+        turn.finished = time.monotonic()
+        turn.span.end()
+        self.on_event("done", turn, None)
+    
+    def _stage_error(self, stage_name, turn, error):
+        print(f"Pipeline {stage_name} error: {error}")
+        turn.span.set(error=f"{stage_name}: {error}")
+        self.on_event("error", turn, error)
+    
+    def stats(self):
+        """
+        Per-stage queue depth and latency view
+        
+        Returns:
+            dict: capture counters and one entry per stage
+        """
+        return {
+            "captured": self.captured,
+            "echo_dropped": self.echo_dropped,
+            "stages": [stage.stats() for stage in self.stages],
+        }
+    
+    def format_stats(self):
+        """Human readable stats table"""
+        lines = [
+            f"captured {self.captured} utterance(s), {self.echo_dropped} dropped as echo",
+            f"{'stage':<8}{'depth':>7}{'done':>6}{'drop':>6}{'err':>5}{'wait p50':>10}{'p50 ms':>9}{'p95 ms':>9}",
+        ]
+        for stage in self.stats()["stages"]:
+            lines.append(
+                f"{stage['name']:<8}{stage['depth']:>4}/{stage['maxsize']:<2}{stage['processed']:>6}"
+                f"{stage['dropped']:>6}{stage['errors']:>5}  {_ms(stage['wait']['p50'])}"
+                f" {_ms(stage['latency']['p50'])} {_ms(stage['latency']['p95'])}"
+            )
+        return "\n".join(lines)
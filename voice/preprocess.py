@@ -0,0 +1,233 @@
+"""
+JARVIS Audio Preprocessing
+Vectorized clean-up of captured speech before it is sent to the recognizer:
+DC removal, noise gate, silence trimming, automatic gain control and
+resampling to 16 kHz mono
+"""
+
+import threading
+import time
+import numpy as np
+from config import Config
+from voice.calibration import get_noise_tracker
+from voice.stats import LatencyStats
+from metrics import CACHE_REQUESTS
+
+try:
+    import speech_recognition as sr
+    SR_AVAILABLE = True
+except ImportError:
+    SR_AVAILABLE = False
+
+
+def _lowpass_kernel(cutoff, taps=63):
+    """Hann-windowed sinc low-pass filter (cutoff as a fraction of the sample rate)"""
+    n = np.arange(taps) - (taps - 1) / 2
+    kernel = np.sinc(2 * cutoff * n) * np.hanning(taps)
+    return (kernel / kernel.sum()).astype(np.float32)
+
+
+class AudioPreprocessor:
+    """Whole-frame NumPy preprocessing with a reusable float workspace"""
+    
+    def __init__(self, target_rate=None, frame_ms=None, noise_threshold=None):
+        """
+        Args:
+            target_rate: Output sample rate (defaults to ASR_SAMPLE_RATE)
+            frame_ms: Analysis frame length for the gate / trimming
+            noise_threshold: Callable returning the current speech energy threshold
+        """
+        self.target_rate = target_rate or Config.ASR_SAMPLE_RATE
+        self.frame_ms = frame_ms or Config.PREPROCESS_FRAME_MS
+        if noise_threshold is None:
+            tracker = get_noise_tracker()
+            noise_threshold = lambda: tracker.energy_threshold
+        self.noise_threshold = noise_threshold
+        
+        self.latency = LatencyStats()
+        self.audio_seconds = 0.0
+        self.cpu_seconds = 0.0
+        self._workspace = np.zeros(0, dtype=np.float32)
+        self._kernels = {}
+        self._lock = threading.Lock()  # the workspace is shared between callers
+    
+    @property
+    def real_time_factor(self):
+        """Processing time per second of audio processed so far"""
+        return self.cpu_seconds / self.audio_seconds if self.audio_seconds else 0.0
+    
+    def _scratch(self, size):
+        """Float32 work area of at least ``size`` samples, reused between calls"""
+        if self._workspace.size < size:
+            self._workspace = np.zeros(max(size, int(self._workspace.size * 1.5)), dtype=np.float32)
+        return self._workspace[:size]
+    
+    def _condition(self, x, sample_rate):
+        """
+        DC removal, noise gate, trimming and gain, in place on a float buffer
+        
+        Args:
+            x: Writable float32 samples
+            sample_rate: Rate of ``x``
+        
+        Returns:
+            tuple: (start, end) sample range that holds the speech
+        """
+        x -= x.mean()
+        
+        frame_len = max(1, int(sample_rate * self.frame_ms / 1000))
+        count = x.size // frame_len
+        if count == 0:
+            return 0, x.size
+        frames = x[:count * frame_len].reshape(count, frame_len)
+        power = np.einsum("ij,ij->i", frames, frames) / frame_len
+        voiced = power > self.noise_threshold() ** 2
+        
+        if voiced.any():
+            # Gate: fade frames below the noise threshold, ramping between frame centres
+            gains = np.where(voiced, 1.0, Config.PREPROCESS_GATE_FLOOR).astype(np.float32)
+            centres = (np.arange(count, dtype=np.float32) + 0.5) * frame_len
+            x *= np.interp(np.arange(x.size, dtype=np.float32), centres, gains).astype(np.float32)
+            
+            # Trim silence, keeping a little padding around the speech
+            index = np.flatnonzero(voiced)
+            pad = int(Config.PREPROCESS_TRIM_PAD * sample_rate / frame_len)
+            start = max(0, index[0] - pad) * frame_len
+            end = x.size if index[-1] + 1 + pad >= count else (index[-1] + 1 + pad) * frame_len
+            speech_rms = np.sqrt(power[voiced].mean())
+        else:
+            start, end = 0, x.size
+            speech_rms = np.sqrt(power.mean())
+        
+        # AGC: bring the speech to the target level without clipping the peaks
+        region = x[start:end]
+        peak = np.abs(region).max() if region.size else 0.0
+        if speech_rms > 0 and peak > 0:
+            gain = min(Config.PREPROCESS_TARGET_RMS / speech_rms, Config.PREPROCESS_MAX_GAIN, 32000.0 / peak)
+            region *= gain
+        return start, end
+    
+    def _resample(self, x, sample_rate):
+        """Band-limit and resample float samples to the target rate"""
+        if sample_rate == self.target_rate:
+            return x
+        if self.target_rate < sample_rate:
+            kernel = self._kernels.get(sample_rate)
+            if kernel is None:
+                CACHE_REQUESTS.inc(cache="resample_kernel", result="miss")
+                kernel = self._kernels[sample_rate] = _lowpass_kernel(0.45 * self.target_rate / sample_rate)
+            else:
+                CACHE_REQUESTS.inc(cache="resample_kernel", result="hit")
+            # Centred on the input - mode="same" would return len(kernel) samples for short inputs
+            offset = (kernel.size - 1) // 2
+            x = np.convolve(x, kernel)[offset:offset + x.size]
+        if sample_rate % self.target_rate == 0:
+            return x[::sample_rate // self.target_rate]
+        count = int(x.size * self.target_rate / sample_rate)
+        positions = np.arange(count, dtype=np.float64) * (sample_rate / self.target_rate)
+        return np.interp(positions, np.arange(x.size), x).astype(np.float32)
+    
+    def _record(self, started, num_samples, sample_rate):
+        elapsed = time.perf_counter() - started
+        self.latency.record(elapsed)
+        self.cpu_seconds += elapsed
+        self.audio_seconds += num_samples / sample_rate
+    
+    def process_samples(self, samples, sample_rate, channels=1):
+        """
+        Preprocess a block of interleaved int16 samples
+        
+        Args:
+            samples: int16 NumPy array (interleaved if ``channels`` > 1)
+            sample_rate: Input sample rate
+            channels: Number of interleaved channels
+        
+        Returns:
+            np.ndarray: int16 mono samples at the target rate
+        """
+        with self._lock:
+            return self._process_samples(samples, sample_rate, channels)
+    
+    def _process_samples(self, samples, sample_rate, channels):
+        started = time.perf_counter()
+        samples = np.asarray(samples)
+        frames = samples.size // channels
+        x = self._scratch(frames)
+        if channels > 1:
+            np.mean(samples[:frames * channels].reshape(frames, channels), axis=1, out=x)
+        else:
+            x[:] = samples
+        
+        start, end = self._condition(x, sample_rate)
+        out = self._resample(x[start:end], sample_rate)
+        np.rint(out, out=out)
+        result = np.clip(out, -32768, 32767).astype(np.int16)
+        self._record(started, frames, sample_rate)
+        return result
+    
+    def process_buffer(self, buffer, sample_rate=None):
+        """
+        Preprocess 16-bit mono audio in place (e.g. an utterance copied out of
+        the capture ring, or a ring buffer view), without resampling
+        
+        Args:
+            buffer: Writable bytes-like object (bytearray, writable memoryview)
+            sample_rate: Rate of the audio (defaults to the target rate)
+        
+        Returns:
+            memoryview: Slice of ``buffer`` holding the trimmed speech
+        """
+        with self._lock:
+            return self._process_buffer(buffer, sample_rate)
+    
+    def _process_buffer(self, buffer, sample_rate):
+        started = time.perf_counter()
+        sample_rate = sample_rate or self.target_rate
+        view = memoryview(buffer).cast("B")
+        samples = np.frombuffer(view, dtype=np.int16)
+        x = self._scratch(samples.size)
+        x[:] = samples
+        
+        start, end = self._condition(x, sample_rate)
+        np.rint(x, out=x)
+        np.clip(x, -32768, 32767, out=x)
+        samples[:] = x  # unsafe cast back into the caller's buffer
+        self._record(started, samples.size, sample_rate)
+        return view[start * 2:end * 2]
+    
+    def process(self, audio):
+        """
+        Preprocess captured speech for the recognizer
+        
+        Args:
+            audio: speech_recognition.AudioData, or an Utterance from the VAD
+                   (its buffer is cleaned up in place)
+        
+        Returns:
+            speech_recognition.AudioData: 16-bit mono audio at the target rate
+        """
+        if not SR_AVAILABLE:
+            raise ImportError("SpeechRecognition not installed. Run: pip install SpeechRecognition")
+        
+        if hasattr(audio, "audio_data"):
+            if isinstance(audio.data, bytearray) and audio.sample_rate == self.target_rate:
+                speech = self.process_buffer(audio.data, audio.sample_rate)
+                return sr.AudioData(bytes(speech), audio.sample_rate, 2)
+            audio = audio.audio_data()
+        
+        raw = audio.get_raw_data(convert_width=2)
+        samples = self.process_samples(np.frombuffer(raw, dtype=np.int16), audio.sample_rate)
+        return sr.AudioData(samples.tobytes(), self.target_rate, 2)
+
+
+_preprocessor = None
+
+
+def get_preprocessor():
+    """Get the shared preprocessor (None when PREPROCESS_ENABLED is off)"""
+    global _preprocessor
+    if not Config.PREPROCESS_ENABLED:
+        return None
+    if _preprocessor is None:
+        _preprocessor = AudioPreprocessor()
+    return _preprocessor
@@ -0,0 +1,204 @@
+"""
+JARVIS Speech Recognition Backends
+Pluggable speech-to-text with an on-device (Vosk) backend, Google Web Speech and a test stub
+"""
+
+import json
+import time
+from pathlib import Path
+from config import Config
+from voice.stats import LatencyStats
+from metrics import ASR_LATENCY
+
+# Try importing ASR backends
+try:
+    import speech_recognition as sr
+    SR_AVAILABLE = True
+except ImportError:
+    SR_AVAILABLE = False
+
+
+class UnknownSpeechError(Exception):
+    """Raised when the audio did not contain recognizable speech"""
+
+
+class RecognitionServiceError(Exception):
+    """Raised when the recognition backend itself failed"""
+
+
+class BaseRecognizer:
+    """Common interface for speech recognition backends"""
+    
+    name = "base"
+    
+    def __init__(self):
+        self.latency = LatencyStats()
+        self.is_loaded = False
+    
+    def load(self):
+        """Load models / clients (called once at startup)"""
+        if not self.is_loaded:
+            self._load()
+            self.is_loaded = True
+        return self
+    
+    def recognize(self, audio):
+        """
+        Transcribe an utterance
+        
+        Args:
+            audio: speech_recognition.AudioData (or anything with get_raw_data)
+        
+        Returns:
+            str: Recognized text
+        
+        Raises:
+            UnknownSpeechError: If no speech could be recognized
+            RecognitionServiceError: If the backend failed
+        """
+        self.load()
+        start = time.perf_counter()
+        try:
+            return self._transcribe(audio)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.latency.record(elapsed)
+            ASR_LATENCY.observe(elapsed, backend=self.name)
+    
+    def _load(self):
+        """Backend specific loading"""
+    
+    def _transcribe(self, audio):
+        """Backend specific transcription"""
+        raise NotImplementedError
+
+
+class GoogleRecognizer(BaseRecognizer):
+    """Google Web Speech API (network round-trip per utterance)"""
+    
+    name = "google"
+    
+    def _load(self):
+        if not SR_AVAILABLE:
+            raise ImportError("SpeechRecognition not installed. Run: pip install SpeechRecognition")
+        self._recognizer = sr.Recognizer()
+    
+    def _transcribe(self, audio):
+        try:
+            return self._recognizer.recognize_google(audio)
+        except sr.UnknownValueError as e:
+            raise UnknownSpeechError("Could not understand audio") from e
+        except sr.RequestError as e:
+            raise RecognitionServiceError(f"Google speech service error: {e}") from e
+
+
+class VoskRecognizer(BaseRecognizer):
+    """Offline Vosk (Kaldi) recognizer running on CPU"""
+    
+    name = "vosk"
+    
+    def __init__(self, model_path=None, sample_rate=None):
+        super().__init__()
+        self.model_path = Path(model_path or Config.ASR_MODEL_PATH)
+        if not self.model_path.is_absolute():
+            self.model_path = Config.get_project_root() / self.model_path
+        self.sample_rate = sample_rate or Config.ASR_SAMPLE_RATE
+        self.model = None
+    
+    def _load(self):
+        try:
+            import vosk  # loads the Kaldi library, so only when this backend is used
+        except ImportError:
+            raise ImportError("Vosk not installed. Run: pip install vosk")
+        if not self.model_path.exists():
+            raise FileNotFoundError(
+                f"Vosk model not found at {self.model_path}. "
+                "Download one from https://alphacephei.com/vosk/models"
+            )
+        vosk.SetLogLevel(-1)
+        self._vosk = vosk
+        self.model = vosk.Model(str(self.model_path))
+    
+    def _transcribe(self, audio):
+        raw = audio.get_raw_data(convert_rate=self.sample_rate, convert_width=2)
+        try:
+            recognizer = self._vosk.KaldiRecognizer(self.model, self.sample_rate)
+            recognizer.AcceptWaveform(raw)
+            result = json.loads(recognizer.FinalResult())
+        except Exception as e:
+            raise RecognitionServiceError(f"Vosk recognition error: {e}") from e
+        
+        text = result.get("text", "").strip()
+        if not text:
+            raise UnknownSpeechError("Could not understand audio")
+        return text
+
+
+class StubRecognizer(BaseRecognizer):
+    """Deterministic recognizer for tests - returns scripted transcripts in order"""
+    
+    name = "stub"
+    
+    def __init__(self, transcripts=None, default=None, work_ms=None):
+        """
+        Args:
+            transcripts: Transcripts returned one per call, in order
+                         (an empty entry stands for audio that was not understood)
+            default: Transcript returned once the script is exhausted
+                     (None raises UnknownSpeechError instead)
+            work_ms: CPU work per call, holding the GIL in ~10 ms steps like
+                     native model code would (defaults to Config.ASR_STUB_WORK_MS)
+        """
+        super().__init__()
+        self.transcripts = list(transcripts or [])
+        self.default = Config.ASR_STUB_TEXT if default is None and not transcripts else default
+        self.work_ms = Config.ASR_STUB_WORK_MS if work_ms is None else work_ms
+        self.calls = 0
+    
+    def _transcribe(self, audio):
+        self.calls += 1
+        if self.work_ms > 0:
+            deadline = time.perf_counter() + self.work_ms / 1000
+            while time.perf_counter() < deadline:
+                sum(range(500000))  # one C call - no GIL switch until it returns
+        if self.transcripts:
+            text = self.transcripts.pop(0)
+            if not text:
+                raise UnknownSpeechError("Scripted unrecognizable utterance")
+            return text
+        if self.default:
+            return self.default
+        raise UnknownSpeechError("Stub recognizer has no transcript left")
+
+
+BACKENDS = {
+    "google": GoogleRecognizer,
+    "vosk": VoskRecognizer,
+    "stub": StubRecognizer,
+}
+
+_recognizer = None
+
+
+def create_recognizer(backend=None):
+    """
+    Create (and load) a recognizer backend
+    
+    Args:
+        backend: Backend name, defaults to Config.ASR_BACKEND
+    
+    Returns:
+        BaseRecognizer: Loaded recognizer
+    """
+    backend = (backend or Config.ASR_BACKEND).lower()
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown ASR backend: {backend}")
+    return BACKENDS[backend]().load()
+
+
+def get_recognizer():
+    """Get the shared recognizer, loading its model on first use"""
+    global _recognizer
+    if _recognizer is None:
+        _recognizer = create_recognizer()
+    return _recognizer
@@ -0,0 +1,510 @@
+"""
+JARVIS Session Record / Replay
+Records live voice sessions to disk and replays WAV files through the same
+capture -> VAD -> ASR -> JarvisAI -> TTS pipeline the UI and jarvis_test.py
+use, with stub recognition, a silent speaker and the offline fake provider,
+reporting per-stage timings for every utterance
+
+Replay a recording (transcripts are read from session.txt next to it, if present,
+and matched to the replayed utterances by when they were spoken):
+    python -m voice.replay run session.wav --json report.json
+Record the microphone for later replay:
+    python -m voice.replay record --seconds 60
+Live sessions are also recorded when SESSION_RECORD_DIR is set.
+"""
+
+import argparse
+import json
+import tempfile
+import threading
+import time
+import wave
+from datetime import datetime
+from pathlib import Path
+import numpy as np
+from config import Config
+from voice.calibration import NoiseFloorTracker
+from voice.capture import AudioCaptureService
+from voice.pipeline import VoicePipeline
+from voice.recognizers import StubRecognizer, UnknownSpeechError, create_recognizer
+from voice.vad import VoiceActivityDetector, ContinuousListener
+
+try:
+    import speech_recognition as sr
+    SR_AVAILABLE = True
+except ImportError:
+    SR_AVAILABLE = False
+
+
+class SessionRecorder:
+    """Writes the microphone stream and the recognized transcripts to disk"""
+    
+    def __init__(self, capture, directory=None):
+        """
+        Args:
+            capture: Running AudioCaptureService
+            directory: Output directory (defaults to SESSION_RECORD_DIR)
+        """
+        self.capture = capture
+        directory = Path(directory or Config.SESSION_RECORD_DIR or ".")
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        self.path = directory / f"session-{stamp}.wav"
+        self.transcript_path = self.path.with_suffix(".txt")
+        self._wav = None
+        self._transcripts = None
+        self._origin = 0  # capture position of the first recorded byte
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+    
+    def start(self):
+        """Start writing everything captured from now on"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._wav = wave.open(str(self.path), "wb")
+        self._wav.setnchannels(1)
+        self._wav.setsampwidth(self.capture.sample_width)
+        self._wav.setframerate(self.capture.sample_rate)
+        self._transcripts = open(self.transcript_path, "w", encoding="utf-8")
+        self._origin = self.capture.position
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        print(f"⏺️  Recording session to {self.path}")
+        return self
+    
+    def _run(self):
+        chunk = self.capture.seconds_to_bytes(0.1)
+        pos = self._origin
+        while not self._stop.is_set():
+            if not self.capture.wait_for(pos + chunk, timeout=0.5):
+                if not self.capture.is_running:
+                    break
+                continue
+            oldest = self.capture.ring.oldest_pos()
+            end = self.capture.position
+            with self._lock:
+                if oldest > pos:
+                    # Lapped by the writer - pad with silence so transcript times stay aligned
+                    self._wav.writeframes(bytes(oldest - pos))
+                    pos = oldest
+                for view in self.capture.read(pos, end):
+                    self._wav.writeframes(view)
+            pos = end
+    
+    def note(self, text, start_pos=None, end_pos=None):
+        """
+        Record the transcript of an utterance (empty if not understood)
+        
+        Args:
+            text: Recognized text
+            start_pos: Capture position where the utterance started
+            end_pos: Capture position where it ended (without both, replay
+                     hands the transcript out in order instead of by time)
+        """
+        text = text.replace("\n", " ").replace("\t", " ")
+        with self._lock:
+            if self._transcripts is None:
+                return
+            if start_pos is not None and end_pos is not None:
+                start, end = ((pos - self._origin) / self.capture.bytes_per_second for pos in (start_pos, end_pos))
+                text = f"{start:.3f}\t{end:.3f}\t{text}"
+            self._transcripts.write(text + "\n")
+            self._transcripts.flush()
+    
+    def _locate(self, turn):
+        """(start, end) capture positions of a turn's audio, or (None, None)"""
+        audio = turn.audio
+        if hasattr(audio, "start_pos"):
+            return audio.start_pos, audio.end_pos
+        data = getattr(audio, "frame_data", None)
+        if data is None:
+            return None, None
+        # A listen-button recording ended just before it was submitted
+        end = self.capture.position - self.capture.seconds_to_bytes(time.monotonic() - turn.created)
+        return end - len(data), end
+    
+    def on_event(self, event, turn, detail):
+        """VoicePipeline event hook"""
+        if event == "recognized":
+            self.note(turn.text, *self._locate(turn))
+        elif event == "error" and isinstance(detail, UnknownSpeechError):
+            self.note("", *self._locate(turn))
+    
+    def stop(self):
+        """Stop recording and close the files"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        with self._lock:
+            if self._wav is not None:
+                self._wav.close()
+                self._transcripts.close()
+                self._wav = self._transcripts = None
+                print(f"✅ Session saved: {self.path}")
+
+
+class ReplayCapture(AudioCaptureService):
+    """Capture service fed from recordings instead of the microphone"""
+    
+    def __init__(self, noise_tracker, sample_rate=None):
+        super().__init__(sample_rate=sample_rate)
+        self.noise_tracker = noise_tracker
+    
+    def start(self):
+        self.is_running = True
+        return self
+    
+    def play(self, samples, speed=1.0):
+        """
+        Feed int16 samples in capture-sized chunks
+        
+        Args:
+            samples: int16 mono samples at the capture rate
+            speed: Playback speed relative to real time
+        """
+        data = samples.tobytes()
+        chunk = self.chunk * self.sample_width
+        started = time.monotonic()
+        for offset in range(0, len(data), chunk):
+            self.feed(data[offset:offset + chunk])
+            due = started + (offset + chunk) / self.bytes_per_second / speed
+            delay = due - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
+
+def load_wav(path, sample_rate=None):
+    """
+    Read a 16-bit WAV as mono samples at the capture rate
+    
+    Returns:
+        np.ndarray: int16 samples
+    """
+    sample_rate = sample_rate or Config.CAPTURE_SAMPLE_RATE
+    with wave.open(str(path), "rb") as wav:
+        channels = wav.getnchannels()
+        width = wav.getsampwidth()
+        rate = wav.getframerate()
+        raw = wav.readframes(wav.getnframes())
+    if width != 2:
+        raise ValueError(f"{path}: expected a 16-bit WAV")
+    samples = np.frombuffer(raw, dtype=np.int16)
+    if channels > 1:
+        samples = samples[:samples.size - samples.size % channels]
+        samples = samples.reshape(-1, channels).mean(axis=1).astype(np.int16)
+    if rate != sample_rate:
+        if not SR_AVAILABLE:
+            raise ImportError("SpeechRecognition not installed. Run: pip install SpeechRecognition")
+        converted = sr.AudioData(samples.tobytes(), rate, 2).get_raw_data(convert_rate=sample_rate)
+        samples = np.frombuffer(converted, dtype=np.int16)
+    return samples
+
+
+class TranscriptTrack:
+    """Recorded transcripts, matched to the replayed utterances by where they occur in the stream"""
+    
+    def __init__(self):
+        self.timed = []  # [start s, end s, text, used]
+        self.untimed = []  # transcripts without times, handed out in order
+    
+    def add_lines(self, lines, offset=0.0):
+        """
+        Add transcript lines ("start<TAB>end<TAB>text" or just "text")
+        
+        Args:
+            lines: Lines of a transcript file
+            offset: Stream time (s) at which the recording they belong to starts
+        """
+        for line in lines:
+            parts = line.split("\t", 2)
+            try:
+                start, end = float(parts[0]), float(parts[1])
+            except (IndexError, ValueError):
+                self.untimed.append(line)
+                continue
+            self.timed.append([offset + start, offset + end, parts[2] if len(parts) > 2 else "", False])
+    
+    def __bool__(self):
+        return bool(self.timed or self.untimed)
+    
+    def match(self, start, end):
+        """
+        Transcript of the utterance spoken between two stream times
+        
+        Returns:
+            str: The unused transcript overlapping it most ("" if none does)
+        """
+        slack = Config.CAPTURE_PRE_ROLL
+        best, overlap = None, 0.0
+        for entry in self.timed:
+            shared = min(end, entry[1]) + slack - max(start, entry[0])
+            if not entry[3] and shared > overlap:
+                best, overlap = entry, shared
+        if best is not None:
+            best[3] = True
+            return best[2]
+        return self.untimed.pop(0) if self.untimed else ""
+
+
+def load_transcripts(files, bytes_per_second):
+    """
+    Transcripts from the .txt files next to the recordings
+    
+    Args:
+        files: List of (path, start byte, end byte) in the replayed stream
+        bytes_per_second: Byte rate of the replayed stream
+    
+    Returns:
+        TranscriptTrack: None if no recording has one
+    """
+    track = TranscriptTrack()
+    found = False
+    for path, start, _ in files:
+        sidecar = Path(path).with_suffix(".txt")
+        if sidecar.exists():
+            found = True
+            track.add_lines(sidecar.read_text(encoding="utf-8").splitlines(), start / bytes_per_second)
+    return track if found else None
+
+
+class ReplayPipeline(VoicePipeline):
+    """VoicePipeline whose stub recognizer returns the transcript recorded where each utterance was spoken"""
+    
+    def __init__(self, track, *args, **kwargs):
+        """
+        Args:
+            track: TranscriptTrack to take the transcripts from
+            *args, **kwargs: VoicePipeline arguments (the recognizer must be a StubRecognizer)
+        """
+        super().__init__(*args, **kwargs)
+        self.track = track
+    
+    def _recognize(self, turn):
+        utterance = turn.audio
+        rate = utterance.sample_rate * utterance.sample_width
+        # The ASR stage is one thread, so the script always belongs to this turn
+        self.recognizer.transcripts = [self.track.match(utterance.start_pos / rate, utterance.end_pos / rate)]
+        return super()._recognize(turn)
+
+
+class ReplayReport:
+    """Per-utterance stage timings of one replay run"""
+    
+    STAGES = ("asr", "intent", "tts")
+    
+    def __init__(self, files):
+        """
+        Args:
+            files: List of (path, start byte, end byte) in the replayed stream
+        """
+        self.files = files
+        self.turns = []
+        self._lock = threading.Lock()
+    
+    def add(self, turn):
+        """Record a finished turn"""
+        with self._lock:
+            self.turns.append(turn)
+    
+    def _locate(self, position, sample_rate, sample_width):
+        """(file name, seconds into the file) of a stream position"""
+        for path, start, end in self.files:
+            if start <= position < end:
+                return Path(path).name, (position - start) / (sample_rate * sample_width)
+        return "-", 0.0
+    
+    def rows(self):
+        """One dict per utterance, in stream order"""
+        rows = []
+        for turn in sorted(self.turns, key=lambda t: getattr(t.audio, "start_pos", 0)):
+            utterance = turn.audio
+            name, offset = self._locate(utterance.start_pos, utterance.sample_rate, utterance.sample_width)
+            row = {
+                "turn": turn.id,
+                "file": name,
+                "at": round(offset, 3),
+                "duration": round(utterance.duration, 3),
+                "text": turn.text,
+                "response": turn.response,
+                "total_ms": round((turn.finished - turn.created) * 1000, 2),
+            }
+            for stage in self.STAGES:
+                wait = turn.waits.get(stage)
+                spent = turn.timings.get(stage)
+                row[f"{stage}_wait_ms"] = None if wait is None else round(wait * 1000, 2)
+                row[f"{stage}_ms"] = None if spent is None else round(spent * 1000, 2)
+            rows.append(row)
+        return rows
+    
+    def format(self):
+        """Human readable table"""
+        cell = lambda value: f"{'-':>8}" if value is None else f"{value:8.1f}"
+        lines = [
+            f"{'file':<20}{'at s':>7}{'dur s':>7}{'asr':>8}{'intent':>8}{'tts':>8}{'queued':>8}{'total':>8}  text"
+        ]
+        for row in self.rows():
+            queued = sum(row[f"{stage}_wait_ms"] or 0 for stage in self.STAGES)
+            lines.append(
+                f"{row['file'][:19]:<20}{row['at']:7.2f}{row['duration']:7.2f}"
+                f"{cell(row['asr_ms'])}{cell(row['intent_ms'])}{cell(row['tts_ms'])}"
+                f"{cell(queued)}{cell(row['total_ms'])}  {row['text'] or '(not understood)'}"
+            )
+        return "\n".join(lines)
+
+
+def replay(paths, transcripts=None, asr="stub", speed=1.0, tts_speed=0.0, execute_commands=False):
+    """
+    Run recordings through the voice pipeline
+    
+    Args:
+        paths: WAV files, replayed back to back
+        transcripts: Transcript lines for the stub recognizer (default: the
+                     .txt next to each WAV, matched to the utterances by time)
+        asr: Recognizer backend ("stub", "vosk", "google")
+        speed: Feed speed relative to real time
+        tts_speed: NullEngine speed (0 = replies take no time to speak)
+        execute_commands: Let JarvisAI open apps / websites
+    
+    Returns:
+        tuple: (ReplayReport, pipeline stats dict)
+    """
+    from ai_brain import JarvisAI
+    from voice.preprocess import AudioPreprocessor
+    from voice.tts import Speaker, NullEngine
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        # Private noise floor, so replays never touch the saved room profile
+        tracker = NoiseFloorTracker(Path(tmp) / "noise_profile.json")
+        capture = ReplayCapture(tracker).start()
+        listener = ContinuousListener(capture, VoiceActivityDetector(capture.sample_rate, noise_tracker=tracker))
+        
+        brain = JarvisAI()
+        if not execute_commands:
+            brain._execute_system_command = lambda command: False
+        speaker = Speaker(engine=NullEngine(tts_speed))
+        preprocessor = None
+        if Config.PREPROCESS_ENABLED:
+            preprocessor = AudioPreprocessor(noise_threshold=lambda: tracker.energy_threshold)
+        
+        files = []
+        clips = []
+        position = 0
+        tail = np.zeros(int(Config.REPLAY_TAIL_SILENCE * capture.sample_rate), dtype=np.int16)
+        for path in paths:
+            samples = np.concatenate([load_wav(path, capture.sample_rate), tail])
+            size = samples.size * capture.sample_width
+            files.append((str(path), position, position + size))
+            clips.append(samples)
+            position += size
+        
+        track = None
+        if asr == "stub":
+            if transcripts is not None:
+                track = TranscriptTrack()
+                track.add_lines(transcripts)
+            else:
+                track = load_transcripts(files, capture.bytes_per_second)
+        recognizer = StubRecognizer() if asr == "stub" else create_recognizer(asr)
+        
+        report = ReplayReport(files)
+        done = threading.Semaphore(0)
+        
+        def on_event(event, turn, detail):
+            if event == "done":
+                report.add(turn)
+                done.release()
+            elif event == "echo":
+                done.release()
+        
+        options = dict(utterances=listener.utterances(), on_event=on_event, preprocessor=preprocessor)
+        if track:
+            pipeline = ReplayPipeline(track, recognizer, brain.process_command, speaker.speak, **options)
+        else:
+            pipeline = VoicePipeline(recognizer, brain.process_command, speaker.speak, **options)
+        pipeline.start()
+        time.sleep(0.2)  # let the capture loop attach to the stream
+        
+        for samples in clips:
+            capture.play(samples, speed)
+        
+        # Wait for the last utterance to be segmented and every turn to finish
+        time.sleep(Config.VAD_MAX_HANGOVER / speed)
+        handled = 0
+        while handled < pipeline.captured:
+            if not done.acquire(timeout=30):
+                print("⚠️  Timed out waiting for the pipeline to finish")
+                break
+            handled += 1
+        
+        listener.stop()
+        capture.stop()
+        pipeline.stop()
+        return report, pipeline.stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JARVIS session record / replay")
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    run = commands.add_parser("run", help="Replay recordings through the voice pipeline")
+    run.add_argument("wavs", nargs="+", help="16-bit WAV recordings")
+    run.add_argument("--transcripts", help="Text file with one transcript per utterance, in order "
+                                           "(default: the .txt next to each WAV, matched by time)")
+    run.add_argument("--asr", default="stub", help="Recognizer backend (stub, vosk, google)")
+    run.add_argument("--provider", default="fake", help="AI provider (fake, ollama, gemini)")
+    run.add_argument("--speed", type=float, default=1.0, help="Feed speed relative to real time")
+    run.add_argument("--tts-speed", type=float, default=0.0,
+                     help="Simulated speech speed (1.0 = as long as real speech, 0 = instant)")
+    run.add_argument("--execute-commands", action="store_true", help="Really open apps / websites")
+    run.add_argument("--json", help="Write the report to this file")
+    
+    record = commands.add_parser("record", help="Record the microphone for later replay")
+    record.add_argument("--dir", default=Config.SESSION_RECORD_DIR or "sessions", help="Output directory")
+    record.add_argument("--seconds", type=float, default=0, help="Stop after N seconds (default: Ctrl+C)")
+    args = parser.parse_args()
+    
+    if args.command == "record":
+        from voice.capture import get_capture_service
+        recorder = SessionRecorder(get_capture_service(), args.dir).start()
+        try:
+            if args.seconds:
+                time.sleep(args.seconds)
+            else:
+                threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
+        recorder.stop()
+        return
+    
+    if args.speed <= 0:
+        parser.error("--speed must be positive")
+    Config.AI_PROVIDER = args.provider
+    transcripts = None
+    if args.transcripts:
+        transcripts = Path(args.transcripts).read_text(encoding="utf-8").splitlines()
+    
+    report, stats = replay(
+        args.wavs,
+        transcripts=transcripts,
+        asr=args.asr,
+        speed=args.speed,
+        tts_speed=args.tts_speed,
+        execute_commands=args.execute_commands
+    )
+    print(report.format())
+    print(f"\n{len(report.turns)} turn(s), {stats['echo_dropped']} utterance(s) dropped as echo")
+    
+    if args.json:
+        Path(args.json).write_text(json.dumps({
+            "files": args.wavs,
+            "asr": args.asr,
+            "provider": args.provider,
+            "turns": report.rows(),
+            "pipeline": stats,
+        }, indent=2))
+        print(f"✅ Report written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
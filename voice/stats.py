@@ -0,0 +1,74 @@
+"""
+JARVIS Latency Statistics
+Small rolling latency tracker shared by the voice components
+"""
+
+import threading
+from collections import deque
+
+
+class LatencyStats:
+    """Rolling latency statistics (seconds) over the most recent samples"""
+    
+    def __init__(self, window=500):
+        """
+        Args:
+            window: Number of recent samples kept for percentiles
+        """
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total = 0.0
+        self.last = None
+    
+    def record(self, seconds):
+        """Record one latency sample"""
+        with self._lock:
+            self._samples.append(seconds)
+            self.count += 1
+            self.total += seconds
+            self.last = seconds
+    
+    def percentile(self, pct):
+        """
+        Get a percentile of the recent samples
+        
+        Args:
+            pct: Percentile between 0 and 100
+        
+        Returns:
+            float: Latency in seconds, or None if nothing was recorded
+        """
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        index = min(len(samples) - 1, int(round(pct / 100.0 * (len(samples) - 1))))
+        return samples[index]
+    
+    def samples(self):
+        """Copy of the recent samples (seconds), oldest first"""
+        with self._lock:
+            return list(self._samples)
+    
+    def summary(self):
+        """
+        Get a summary of recorded latencies
+        
+        Returns:
+            dict: count, mean, p50, p95, p99, max and last (seconds)
+        """
+        with self._lock:
+            samples = list(self._samples)
+            count = self.count
+            total = self.total
+            last = self.last
+        return {
+            "count": count,
+            "mean": total / count if count else None,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "max": max(samples) if samples else None,
+            "last": last,
+        }
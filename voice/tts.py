@@ -0,0 +1,152 @@
+"""
+JARVIS Text-to-Speech
+Interruptible pyttsx3 speaker that plays responses sentence by sentence
+"""
+
+import re
+import threading
+import time
+from config import Config
+from tracing import get_tracer
+from metrics import TTS_LATENCY
+
+try:
+    import pyttsx3
+    PYTTSX3_AVAILABLE = True
+except ImportError:
+    PYTTSX3_AVAILABLE = False
+
+
+def split_sentences(text):
+    """Split a response into sentences so playback can be cut between them"""
+    parts = re.split(r"(?<=[.!?;:])\s+|\n+", text.strip())
+    return [part for part in parts if part.strip()]
+
+
+class NullEngine:
+    """pyttsx3 stand-in for replay / headless runs - plays nothing, but can take
+    as long as speaking would"""
+    
+    def __init__(self, speed=0.0):
+        """
+        Args:
+            speed: 1.0 to take as long as real speech at TTS_RATE, 0 to return at once
+        """
+        self.speed = speed
+        self.rate = Config.TTS_RATE
+        self.spoken = []
+        self._pending = []
+        self._callbacks = {}
+        self._stop = threading.Event()
+    
+    def setProperty(self, name, value):
+        if name == "rate":
+            self.rate = value
+    
+    def connect(self, topic, callback):
+        self._callbacks.setdefault(topic, []).append(callback)
+    
+    def say(self, text):
+        self._pending.append(text)
+    
+    def runAndWait(self):
+        text = " ".join(self._pending)
+        self._pending = []
+        self.spoken.append(text)
+        for callback in self._callbacks.get("started-utterance", []):
+            callback(None)
+        if self.speed > 0:
+            self._stop.clear()
+            self._stop.wait(len(text.split()) / self.rate * 60 / self.speed)
+    
+    def stop(self):
+        self._stop.set()
+
+
+class Speaker:
+    """Plays text through pyttsx3 with a cancellable sentence queue"""
+    
+    def __init__(self, engine=None):
+        """
+        Args:
+            engine: Existing pyttsx3 engine (a new one is created otherwise)
+        """
+        if engine is None:
+            if not PYTTSX3_AVAILABLE:
+                raise ImportError("pyttsx3 not installed. Run: pip install pyttsx3")
+            engine = pyttsx3.init()
+            engine.setProperty('rate', Config.TTS_RATE)
+        self.engine = engine
+        self.queue = []
+        self.is_speaking = False
+        self.last_stopped = None  # monotonic time playback last ended
+        self._cancelled = threading.Event()
+        self._idle = threading.Event()
+        self._idle.set()
+        self._lock = threading.Lock()
+        # First audio is marked when the engine really starts, not when a sentence is queued
+        self._first_audio_span = None
+        if hasattr(engine, "connect"):
+            engine.connect("started-utterance", self._on_started_utterance)
+    
+    def speak(self, text):
+        """
+        Speak text, blocking until it finished or was cancelled
+        
+        Returns:
+            bool: True if everything was spoken
+        """
+        with self._lock:
+            self.queue = split_sentences(text)
+            self._cancelled.clear()
+            self._idle.clear()
+            self.is_speaking = True
+        span = self._first_audio_span = get_tracer().span("speak", sentences=len(self.queue))
+        started = time.monotonic()
+        try:
+            while True:
+                with self._lock:
+                    if self._cancelled.is_set() or not self.queue:
+                        break
+                    sentence = self.queue.pop(0)
+                self._play(sentence)
+            return not self._cancelled.is_set()
+        finally:
+            self._first_audio_span = None
+            span.end(cancelled=self._cancelled.is_set())
+            TTS_LATENCY.observe(time.monotonic() - started)
+            with self._lock:
+                self.queue = []
+                self.is_speaking = False
+                self.last_stopped = time.monotonic()
+            self._idle.set()
+    
+    def _on_started_utterance(self, name):
+        """pyttsx3 callback: the engine began producing audio"""
+        span, self._first_audio_span = self._first_audio_span, None
+        if span is not None:
+            span.mark("first_audio")
+    
+    def _play(self, sentence):
+        """Play one sentence"""
+        self.engine.say(sentence)
+        self.engine.runAndWait()
+    
+    def cancel(self):
+        """Stop playback now and drop the rest of the queue"""
+        with self._lock:
+            self._cancelled.set()
+            self.queue = []
+        try:
+            self.engine.stop()
+        except Exception:
+            pass
+    
+    def wait_idle(self, timeout=None):
+        """
+        Wait until playback has stopped
+        
+        Returns:
+            bool: True if the speaker is idle
+        """
+        return self._idle.wait(timeout)
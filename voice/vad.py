@@ -0,0 +1,250 @@
+"""
+JARVIS Voice Activity Detection
+Streaming energy-based VAD and utterance segmentation over the capture ring buffer
+"""
+
+import threading
+import time
+import numpy as np
+from config import Config
+from voice.calibration import get_noise_tracker
+
+try:
+    import speech_recognition as sr
+    SR_AVAILABLE = True
+except ImportError:
+    SR_AVAILABLE = False
+
+
+class VoiceActivityDetector:
+    """Classifies fixed-length frames as speech / non-speech against the noise floor"""
+    
+    def __init__(self, sample_rate=None, frame_ms=None, noise_tracker=None):
+        self.sample_rate = sample_rate or Config.CAPTURE_SAMPLE_RATE
+        self.frame_len = int(self.sample_rate * (frame_ms or Config.VAD_FRAME_MS) / 1000)
+        self.frame_bytes = self.frame_len * 2
+        self.noise_tracker = noise_tracker or get_noise_tracker()
+    
+    def frame_energy(self, samples):
+        """
+        RMS energy of every whole frame in a block
+        
+        Args:
+            samples: int16 NumPy array holding whole frames
+        
+        Returns:
+            np.ndarray: One RMS value per frame
+        """
+        count = samples.size // self.frame_len
+        frames = samples[:count * self.frame_len].reshape(count, self.frame_len).astype(np.float32)
+        return np.sqrt(np.einsum("ij,ij->i", frames, frames) / self.frame_len)
+    
+    def classify(self, views, threshold=None):
+        """
+        Classify a block of audio
+        
+        Args:
+            views: Buffers (e.g. ring buffer memoryviews) holding whole frames
+            threshold: Energy threshold, defaults to the tracked noise threshold
+        
+        Returns:
+            tuple: (speech flags, frame energies) as NumPy arrays
+        """
+        if len(views) == 1:
+            samples = np.frombuffer(views[0], dtype=np.int16)
+        else:
+            samples = np.concatenate([np.frombuffer(v, dtype=np.int16) for v in views])
+        energy = self.frame_energy(samples)
+        if threshold is None:
+            threshold = self.noise_tracker.energy_threshold
+        return energy > threshold, energy
+
+
+class UtteranceSegmenter:
+    """Turns per-frame speech flags into utterance boundaries with an adaptive hangover"""
+    
+    def __init__(self, frame_seconds):
+        """
+        Args:
+            frame_seconds: Duration of one VAD frame
+        """
+        self.frame_seconds = frame_seconds
+        self.onset_frames = Config.VAD_ONSET_FRAMES
+        self.min_frames = int(Config.VAD_MIN_UTTERANCE / frame_seconds)
+        self.max_frames = int(Config.VAD_MAX_UTTERANCE / frame_seconds)
+        # Typical pause inside an utterance - the hangover adapts to it
+        self.gap_estimate = Config.VAD_MIN_HANGOVER / Config.VAD_HANGOVER_FACTOR
+        self.reset()
+    
+    def reset(self):
+        """Forget any partial utterance"""
+        self.in_speech = False
+        self.speech_run = 0
+        self.silence_run = 0
+        self.start_frame = None
+        self.frame_index = 0
+    
+    @property
+    def hangover(self):
+        """Seconds of silence that end an utterance"""
+        return min(
+            Config.VAD_MAX_HANGOVER,
+            max(Config.VAD_MIN_HANGOVER, self.gap_estimate * Config.VAD_HANGOVER_FACTOR)
+        )
+    
+    def push(self, flags):
+        """
+        Feed speech flags for consecutive frames
+        
+        Args:
+            flags: Boolean per frame (speech / non-speech)
+        
+        Returns:
+            List of (start_frame, end_frame) utterances completed in this block
+        """
+        utterances = []
+        if not self.in_speech and not flags.any():
+            # Silence while idle - nothing to track
+            self.speech_run = 0
+            self.frame_index += len(flags)
+            return utterances
+        
+        hangover_frames = int(self.hangover / self.frame_seconds)
+        for is_speech in flags:
+            index = self.frame_index
+            self.frame_index += 1
+            
+            if not self.in_speech:
+                self.speech_run = self.speech_run + 1 if is_speech else 0
+                if self.speech_run >= self.onset_frames:
+                    self.in_speech = True
+                    self.start_frame = index - self.speech_run + 1
+                    self.silence_run = 0
+                continue
+            
+            if is_speech:
+                if self.silence_run:
+                    # A pause inside the utterance - learn how long people pause
+                    pause = self.silence_run * self.frame_seconds
+                    self.gap_estimate += 0.2 * (pause - self.gap_estimate)
+                    hangover_frames = int(self.hangover / self.frame_seconds)
+                self.silence_run = 0
+            else:
+                self.silence_run += 1
+            
+            length = index + 1 - self.start_frame
+            if self.silence_run >= hangover_frames or length >= self.max_frames:
+                end_frame = index + 1 - self.silence_run
+                if end_frame - self.start_frame >= self.min_frames:
+                    utterances.append((self.start_frame, end_frame))
+                self.in_speech = False
+                self.speech_run = 0
+                self.silence_run = 0
+                self.start_frame = None
+        return utterances
+
+
+class Utterance:
+    """One segmented utterance copied out of the capture ring"""
+    
+    def __init__(self, data, sample_rate, sample_width=2, start_pos=0, start_time=None, end_time=None,
+                 end_pos=None):
+        """
+        Args:
+            data: 16-bit PCM (including any pre-roll)
+            start_pos: Absolute capture position of the speech onset
+            end_pos: Absolute capture position where the speech ended (defaults to the end of ``data``)
+            start_time: time.monotonic() when the speech started
+            end_time: time.monotonic() when the speech ended (before the hangover)
+        """
+        self.data = data
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+        self.start_pos = start_pos
+        self.end_pos = start_pos + len(data) if end_pos is None else end_pos
+        self.end_time = time.monotonic() if end_time is None else end_time
+        self.start_time = self.end_time - self.duration if start_time is None else start_time
+    
+    @property
+    def duration(self):
+        """Length in seconds"""
+        return len(self.data) / (self.sample_rate * self.sample_width)
+    
+    def audio_data(self):
+        """Convert to speech_recognition.AudioData for the recognizers"""
+        if not SR_AVAILABLE:
+            raise ImportError("SpeechRecognition not installed. Run: pip install SpeechRecognition")
+        return sr.AudioData(bytes(self.data), self.sample_rate, self.sample_width)
+
+
+class ContinuousListener:
+    """Streams utterances from the capture service as soon as speech ends"""
+    
+    def __init__(self, capture, vad=None):
+        """
+        Args:
+            capture: Running AudioCaptureService
+            vad: VoiceActivityDetector (defaults to one matching the capture rate)
+        """
+        self.capture = capture
+        self.vad = vad or VoiceActivityDetector(sample_rate=capture.sample_rate)
+        self.segmenter = UtteranceSegmenter(self.vad.frame_len / capture.sample_rate)
+        self.batch_bytes = self.vad.frame_bytes * Config.VAD_BATCH_FRAMES
+        self._stop = threading.Event()
+        self._resync = True
+    
+    def resync(self):
+        """Skip everything captured so far (e.g. JARVIS' own speech)"""
+        self._resync = True
+    
+    def stop(self):
+        """Stop the utterances() generator"""
+        self._stop.set()
+    
+    def utterances(self):
+        """
+        Yield utterances until stopped
+        
+        Blocks on the capture service between batches, so a silent room costs
+        one vectorized energy computation per batch and nothing else.
+        """
+        frame_bytes = self.vad.frame_bytes
+        pre_roll = self.capture.seconds_to_bytes(Config.CAPTURE_PRE_ROLL)
+        base = pos = 0
+        self._resync = True
+        
+        while not self._stop.is_set():
+            if self._resync:
+                self._resync = False
+                base = pos = self.capture.position - self.capture.position % frame_bytes
+                self.segmenter.reset()
+            
+            if not self.capture.wait_for(pos + self.batch_bytes, timeout=0.5):
+                if not self.capture.is_running:
+                    return
+                continue
+            
+            # Fell behind by more than the ring holds - start over from now
+            if pos < self.capture.ring.oldest_pos():
+                self._resync = True
+                continue
+            
+            available = self.capture.position - pos
+            end = pos + available - available % frame_bytes
+            flags, _ = self.vad.classify(self.capture.read(pos, end))
+            pos = end
+            
+            for start_frame, end_frame in self.segmenter.push(flags):
+                start = base + start_frame * frame_bytes
+                stop = base + end_frame * frame_bytes
+                # Writable copy, so preprocessing can clean it up in place
+                data = bytearray().join(self.capture.read(max(base, start - pre_roll), stop))
+                # Wall times from the capture positions, not from when the hangover ran out
+                now, position = time.monotonic(), self.capture.position
+                bytes_per_second = self.capture.bytes_per_second
+                yield Utterance(
+                    data, self.capture.sample_rate, self.capture.sample_width, start,
+                    start_time=now - (position - start) / bytes_per_second,
+                    end_time=now - (position - stop) / bytes_per_second,
+                    end_pos=stop
+                )
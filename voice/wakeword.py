@@ -0,0 +1,335 @@
+"""
+JARVIS Wake Word Detection
+On-device "hey jarvis" spotting with NumPy log-mel features and enrolled templates
+
+Enroll a model from a few recordings of the wake phrase:
+    python -m voice.wakeword enroll models/wakeword/hey_jarvis.npz hey1.wav hey2.wav hey3.wav
+or record them from the microphone:
+    python -m voice.wakeword enroll models/wakeword/hey_jarvis.npz --record 3
+"""
+
+import argparse
+import threading
+import wave
+from pathlib import Path
+import numpy as np
+from config import Config
+from voice.vad import VoiceActivityDetector
+
+
+class LogMelFeatures:
+    """Vectorized log-mel filterbank features (25 ms window, 10 ms hop)"""
+    
+    def __init__(self, sample_rate=16000, n_mels=24, n_fft=512):
+        self.sample_rate = sample_rate
+        self.win_len = int(0.025 * sample_rate)
+        self.hop = int(0.010 * sample_rate)
+        self.n_fft = n_fft
+        self.window = np.hanning(self.win_len).astype(np.float32)
+        self.mel_matrix = self._mel_filterbank(n_mels, 60.0, sample_rate / 2)
+    
+    def _mel_filterbank(self, n_mels, fmin, fmax):
+        """Triangular mel filters as a (bins, mels) matrix"""
+        to_mel = lambda f: 2595.0 * np.log10(1.0 + f / 700.0)
+        to_hz = lambda m: 700.0 * (10 ** (m / 2595.0) - 1.0)
+        edges = to_hz(np.linspace(to_mel(fmin), to_mel(fmax), n_mels + 2))
+        bins = np.fft.rfftfreq(self.n_fft, 1.0 / self.sample_rate)
+        
+        lower, center, upper = edges[:-2, None], edges[1:-1, None], edges[2:, None]
+        rising = (bins - lower) / (center - lower)
+        falling = (upper - bins) / (upper - center)
+        return np.maximum(0.0, np.minimum(rising, falling)).T.astype(np.float32)
+    
+    def num_frames(self, num_samples):
+        """Number of feature frames for a sample count"""
+        return max(0, 1 + (num_samples - self.win_len) // self.hop)
+    
+    def compute(self, samples):
+        """
+        Compute features for a block of audio
+        
+        Args:
+            samples: 1-D int16 or float NumPy array
+        
+        Returns:
+            np.ndarray: (frames, n_mels) log-mel energies
+        """
+        samples = np.asarray(samples, dtype=np.float32)
+        count = self.num_frames(samples.size)
+        if count == 0:
+            return np.zeros((0, self.mel_matrix.shape[1]), dtype=np.float32)
+        frames = np.lib.stride_tricks.as_strided(
+            samples,
+            shape=(count, self.win_len),
+            strides=(samples.strides[0] * self.hop, samples.strides[0])
+        ) * self.window
+        power = np.abs(np.fft.rfft(frames, n=self.n_fft)) ** 2
+        return np.log(power @ self.mel_matrix + 1e-3)
+
+
+def _normalize(windows):
+    """Mean/variance normalize flattened feature windows (rows)"""
+    flat = windows.reshape(windows.shape[0], -1)
+    flat = flat - flat.mean(axis=1, keepdims=True)
+    return flat / (np.linalg.norm(flat, axis=1, keepdims=True) + 1e-9)
+
+
+class WakeWordModel:
+    """Enrolled templates of the wake phrase, time-normalized to a fixed length"""
+    
+    TEMPLATE_FRAMES = 40
+    
+    def __init__(self, templates, durations, threshold=None):
+        """
+        Args:
+            templates: (K, TEMPLATE_FRAMES, n_mels) feature templates
+            durations: Original length of each template in feature frames
+            threshold: Cosine similarity needed to trigger
+        """
+        self.templates = np.asarray(templates, dtype=np.float32)
+        self.durations = np.asarray(durations, dtype=np.int32)
+        self.threshold = float(threshold if threshold is not None else Config.WAKEWORD_THRESHOLD)
+        self.normalized = _normalize(self.templates)
+    
+    @classmethod
+    def resample(cls, features):
+        """Stretch/squeeze a (frames, mels) matrix to TEMPLATE_FRAMES frames"""
+        index = np.linspace(0, len(features) - 1, cls.TEMPLATE_FRAMES).round().astype(np.int32)
+        return features[index]
+    
+    @classmethod
+    def enroll(cls, clips, sample_rate=16000):
+        """
+        Build a model from recordings of the wake phrase
+        
+        Args:
+            clips: List of int16 sample arrays, one per recording
+        
+        Returns:
+            WakeWordModel
+        """
+        extractor = LogMelFeatures(sample_rate)
+        templates, durations = [], []
+        for samples in clips:
+            features = extractor.compute(samples)
+            # Trim leading / trailing silence by frame energy
+            energy = features.max(axis=1)
+            voiced = np.flatnonzero(energy > energy.min() + 0.5 * (energy.max() - energy.min()))
+            if voiced.size == 0:
+                continue
+            features = features[voiced[0]:voiced[-1] + 1]
+            templates.append(cls.resample(features))
+            durations.append(len(features))
+        if not templates:
+            raise ValueError("No usable wake word recordings")
+        
+        model = cls(templates, durations)
+        if len(templates) > 1:
+            # Trigger a bit below how similar the recordings are to each other
+            similarity = model.normalized @ model.normalized.T
+            off_diagonal = similarity[~np.eye(len(templates), dtype=bool)]
+            model.threshold = float(min(Config.WAKEWORD_THRESHOLD, off_diagonal.mean() * 0.9))
+        return model
+    
+    @classmethod
+    def load(cls, path):
+        """Load a model saved with save()"""
+        data = np.load(path)
+        return cls(data["templates"], data["durations"], float(data["threshold"]))
+    
+    def save(self, path):
+        """Save templates and threshold to an .npz file"""
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        np.savez(path, templates=self.templates, durations=self.durations, threshold=self.threshold)
+
+
+class WakeWordSpotter:
+    """Streaming spotter - feed audio blocks, get told when the wake word was said"""
+    
+    def __init__(self, model, sample_rate=16000, noise_threshold=None):
+        """
+        Args:
+            model: WakeWordModel
+            sample_rate: Audio sample rate
+            noise_threshold: Callable returning the current speech energy threshold
+        """
+        self.model = model
+        self.features = LogMelFeatures(sample_rate)
+        self.vad = VoiceActivityDetector(sample_rate=sample_rate)
+        self.noise_threshold = noise_threshold or (lambda: self.vad.noise_tracker.energy_threshold)
+        self.step = int(Config.WAKEWORD_STEP * sample_rate)
+        self.cooldown = int(Config.WAKEWORD_COOLDOWN * sample_rate)
+        
+        # Candidate window lengths around the enrolled durations
+        shortest = int(model.durations.min() * 0.8)
+        longest = int(np.ceil(model.durations.max() * 1.2))
+        lengths = np.unique(np.linspace(shortest, longest, 6).round().astype(np.int32))
+        hop_frames = self.step // self.features.hop
+        offsets = np.arange(0, max(1, hop_frames), 3)
+        self.window_frames = int(longest + offsets.max())
+        self.window_samples = (self.window_frames - 1) * self.features.hop + self.features.win_len
+        
+        # Gather index for every (end offset, length) candidate, precomputed once
+        rows = []
+        for offset in offsets:
+            end = self.window_frames - offset
+            for length in lengths:
+                rows.append(end - length + WakeWordModel.resample(np.arange(length)))
+        self.gather = np.array(rows, dtype=np.int32)
+        
+        self.buffer = np.zeros(self.window_samples, dtype=np.float32)
+        self.since_eval = 0
+        self.since_speech = self.window_samples
+        self.since_trigger = self.cooldown
+        self.last_score = 0.0
+    
+    def score(self, samples):
+        """
+        Best template similarity over all candidate windows ending in ``samples``
+        
+        Args:
+            samples: The most recent window_samples of audio
+        
+        Returns:
+            float: Cosine similarity (higher is more wake-word-like)
+        """
+        features = self.features.compute(samples)
+        windows = features[self.gather]
+        similarity = _normalize(windows) @ self.model.normalized.T
+        return float(similarity.max())
+    
+    def process(self, block):
+        """
+        Feed the next block of int16 samples
+        
+        Returns:
+            bool: True if the wake word ended inside this block
+        """
+        block = np.asarray(block)
+        size = block.size
+        if size >= self.window_samples:
+            self.buffer[:] = block[-self.window_samples:]
+        else:
+            self.buffer[:-size] = self.buffer[size:]
+            self.buffer[-size:] = block
+        
+        self.since_eval += size
+        self.since_trigger += size
+        energy = self.vad.frame_energy(block)
+        if energy.size and energy.max() > self.noise_threshold():
+            self.since_speech = 0
+        else:
+            self.since_speech += size
+        
+        # Only run the spectral model while there is recent speech to look at
+        if self.since_speech >= self.window_samples or self.since_eval < self.step:
+            return False
+        self.since_eval = 0
+        
+        self.last_score = self.score(self.buffer)
+        if self.last_score >= self.model.threshold and self.since_trigger >= self.cooldown:
+            self.since_trigger = 0
+            return True
+        return False
+
+
+class WakeWordListener:
+    """Always-on wake word stage reading from the shared capture service"""
+    
+    def __init__(self, capture, model):
+        self.capture = capture
+        self.spotter = WakeWordSpotter(model, capture.sample_rate)
+        self.batch_bytes = self.spotter.vad.frame_bytes * Config.VAD_BATCH_FRAMES
+        self._stop = threading.Event()
+    
+    def stop(self):
+        """Make wait() return False"""
+        self._stop.set()
+    
+    def wait(self):
+        """
+        Block until the wake word is heard
+        
+        Returns:
+            bool: True on a trigger, False if stopped or capture ended
+        """
+        pos = self.capture.position - self.capture.position % self.spotter.vad.frame_bytes
+        while not self._stop.is_set():
+            if not self.capture.wait_for(pos + self.batch_bytes, timeout=0.5):
+                if not self.capture.is_running:
+                    return False
+                continue
+            pos = max(pos, self.capture.ring.oldest_pos())
+            end = self.capture.position
+            views = self.capture.read(pos, end)
+            block = np.concatenate([np.frombuffer(v, dtype=np.int16) for v in views])
+            pos = end
+            if self.spotter.process(block):
+                return True
+        return False
+
+
+def load_wake_word_listener(capture, path=None):
+    """
+    Create a wake word listener if an enrolled model exists
+    
+    Returns:
+        WakeWordListener or None
+    """
+    path = Path(path or Config.WAKEWORD_MODEL_PATH)
+    if not path.is_absolute():
+        path = Config.get_project_root() / path
+    if not path.exists():
+        return None
+    return WakeWordListener(capture, WakeWordModel.load(path))
+
+
+def read_wav(path):
+    """Read a 16-bit mono WAV file as (samples, sample_rate)"""
+    with wave.open(str(path), "rb") as wav:
+        if wav.getsampwidth() != 2 or wav.getnchannels() != 1:
+            raise ValueError(f"{path}: expected 16-bit mono WAV")
+        samples = np.frombuffer(wav.readframes(wav.getnframes()), dtype=np.int16)
+        return samples, wav.getframerate()
+
+
+def _record_clips(count):
+    """Record wake phrase samples from the microphone"""
+    from voice.capture import get_capture_service
+    from voice.vad import ContinuousListener
+    
+    listener = ContinuousListener(get_capture_service())
+    clips = []
+    print(f"Say the wake phrase {count} time(s), pausing in between...")
+    for utterance in listener.utterances():
+        clips.append(np.frombuffer(utterance.data, dtype=np.int16))
+        print(f"  ✅ sample {len(clips)} ({utterance.duration:.2f}s)")
+        if len(clips) >= count:
+            break
+    return clips
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JARVIS wake word tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+    enroll = commands.add_parser("enroll", help="Build a wake word model")
+    enroll.add_argument("output", help="Model file to write (.npz)")
+    enroll.add_argument("wavs", nargs="*", help="16 kHz mono recordings of the wake phrase")
+    enroll.add_argument("--record", type=int, default=0, help="Record N samples from the microphone")
+    args = parser.parse_args()
+    
+    clips = []
+    for path in args.wavs:
+        samples, sample_rate = read_wav(path)
+        if sample_rate != Config.CAPTURE_SAMPLE_RATE:
+            parser.error(f"{path}: expected {Config.CAPTURE_SAMPLE_RATE} Hz audio, got {sample_rate} Hz")
+        clips.append(samples)
+    if args.record:
+        clips += _record_clips(args.record)
+    model = WakeWordModel.enroll(clips)
+    model.save(args.output)
+    print(f"✅ Saved {len(model.templates)} template(s) to {args.output} (threshold {model.threshold:.2f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,445 @@
+"""
+JARVIS Voice Workers
+Speech recognition and speech output in their own processes, so they never
+compete with the UI for its interpreter and GIL. Utterance audio is handed over
+through shared memory, control messages through small multiprocessing queues,
+and a supervisor thread restarts workers that crash
+"""
+
+import atexit
+import itertools
+import multiprocessing
+import queue
+import signal
+import sys
+import threading
+import time
+from multiprocessing import shared_memory
+from config import Config
+from tracing import get_tracer
+from metrics import TTS_LATENCY, WORKER_RESTARTS
+from voice.recognizers import BaseRecognizer, UnknownSpeechError, RecognitionServiceError
+
+# Spawned, not forked: the parent has Tk, audio and model threads running
+_CONTEXT = multiprocessing.get_context("spawn")
+
+# Exit code of a worker that cannot start at all (missing model / engine) - not restarted
+_EXIT_FATAL = 3
+
+# Replies are (request_id, status, detail); request id 0 is the worker announcing itself
+_ANNOUNCE = 0
+
+
+class WorkerError(RuntimeError):
+    """Raised when a worker process died, timed out or is unavailable"""
+
+
+def _init_worker():
+    """Common setup at the start of every worker process"""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # Ctrl+C is handled by the parent
+    Config.TRACE_ENABLED = False  # the parent traces the calls; one writer per trace file
+
+
+def _asr_worker(requests, replies, backend):
+    """
+    ASR worker process: preprocess and transcribe utterances from shared memory
+    
+    Requests:
+        ("transcribe", request_id, segment name, byte count, sample rate, sample width)
+    """
+    _init_worker()
+    try:
+        import speech_recognition as sr
+        from voice.recognizers import create_recognizer
+        from voice.preprocess import get_preprocessor
+        recognizer = create_recognizer(backend)
+        preprocessor = get_preprocessor()
+    except Exception as e:
+        print(f"❌ ASR worker could not start: {e}")
+        replies.put((_ANNOUNCE, "failed", f"{type(e).__name__}: {e}"))
+        sys.exit(_EXIT_FATAL)
+    replies.put((_ANNOUNCE, "ready", recognizer.name))
+    
+    segment = None
+    try:
+        for _, request_id, name, size, sample_rate, sample_width in iter(requests.get, None):
+            if segment is None or segment.name != name:
+                if segment:
+                    segment.close()
+                segment = shared_memory.SharedMemory(name=name)  # the parent grew its buffer
+            audio = sr.AudioData(bytes(segment.buf[:size]), sample_rate, sample_width)
+            try:
+                if preprocessor:
+                    audio = preprocessor.process(audio)
+                replies.put((request_id, "ok", recognizer.recognize(audio)))
+            except UnknownSpeechError as e:
+                replies.put((request_id, "unknown", str(e)))
+            except Exception as e:
+                replies.put((request_id, "error", f"{type(e).__name__}: {e}"))
+    finally:
+        if segment:
+            segment.close()
+
+
+def _tts_worker(requests, replies):
+    """
+    TTS worker process: speak texts one at a time, cancellable at any moment
+    
+    Requests:
+        ("speak", request_id, text)
+        ("cancel", 0) - stop playback and drop texts not yet started
+    """
+    _init_worker()
+    try:
+        from voice.tts import Speaker
+        speaker = Speaker()
+    except Exception as e:
+        print(f"❌ TTS worker could not start: {e}")
+        replies.put((_ANNOUNCE, "failed", f"{type(e).__name__}: {e}"))
+        sys.exit(_EXIT_FATAL)
+    replies.put((_ANNOUNCE, "ready", None))
+    
+    # Playback runs on its own thread so a cancel is handled while a text is spoken
+    texts = queue.Queue()
+    
+    def play():
+        for request_id, text in iter(texts.get, None):
+            try:
+                replies.put((request_id, "ok", speaker.speak(text)))
+            except Exception as e:
+                replies.put((request_id, "error", f"{type(e).__name__}: {e}"))
+    player = threading.Thread(target=play, name="tts-worker-play", daemon=True)
+    player.start()
+    
+    for kind, request_id, *payload in iter(requests.get, None):
+        if kind == "speak":
+            texts.put((request_id, payload[0]))
+        elif kind == "cancel":
+            while True:
+                try:
+                    dropped_id, _ = texts.get_nowait()
+                except queue.Empty:
+                    break
+                replies.put((dropped_id, "ok", False))
+            speaker.cancel()
+    speaker.cancel()
+    texts.put(None)
+    player.join(timeout=2.0)
+
+
+class WorkerProcess:
+    """One restartable worker process with a request queue and a reply queue"""
+    
+    def __init__(self, name, target, args=()):
+        """
+        Args:
+            name: Short name for logs and metrics ("asr", "tts")
+            target: Module-level worker function taking (requests, replies, *args)
+            args: Extra picklable arguments for the worker function
+        """
+        self.name = name
+        self.target = target
+        self.args = tuple(args)
+        self.process = None
+        self.requests = None
+        self.replies = None
+        self.restarts = 0
+        self.crashes = []  # monotonic times of recent crashes
+        self.failed = None  # reason the worker was given up on
+        self.stopped = False
+        self._ids = itertools.count(1)
+        self._call_lock = threading.Lock()  # one request in flight at a time
+    
+    def start(self):
+        """Start (or restart) the process with fresh queues"""
+        with self._call_lock:
+            self.requests = _CONTEXT.Queue()
+            self.replies = _CONTEXT.Queue()
+            self.process = _CONTEXT.Process(
+                target=self.target,
+                args=(self.requests, self.replies, *self.args),
+                name=f"jarvis-{self.name}-worker",
+                daemon=True
+            )
+            self.process.start()
+        return self
+    
+    @property
+    def is_alive(self):
+        return self.process is not None and self.process.is_alive()
+    
+    def send(self, kind, *payload):
+        """Send a message without waiting for a reply (e.g. a cancel during a call)"""
+        if self.is_alive:
+            self.requests.put((kind, _ANNOUNCE, *payload))
+    
+    def call(self, kind, *payload, timeout=None):
+        """
+        Send a request and wait for its reply
+        
+        Args:
+            kind: Request type
+            timeout: Seconds before the worker is killed (restarted by the
+                     supervisor) and the call fails; None waits while it is alive
+        
+        Returns:
+            tuple: (status, detail) from the worker
+        
+        Raises:
+            WorkerError: If the worker is unavailable, dies or times out
+        """
+        with self._call_lock:
+            if self.failed:
+                raise WorkerError(f"{self.name} worker unavailable: {self.failed}")
+            if not self.is_alive:
+                raise WorkerError(f"{self.name} worker is not running")
+            process, replies = self.process, self.replies
+            request_id = next(self._ids)
+            self.requests.put((kind, request_id, *payload))
+            
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while True:
+                try:
+                    reply_id, status, detail = replies.get(timeout=0.1)
+                except (OSError, ValueError):
+                    raise WorkerError(f"{self.name} worker was stopped")
+                except queue.Empty:
+                    if not process.is_alive():
+                        raise WorkerError(f"{self.name} worker exited (code {process.exitcode})")
+                    if deadline is not None and time.monotonic() > deadline:
+                        process.terminate()
+                        raise WorkerError(f"{self.name} worker timed out after {timeout:.0f}s")
+                    continue
+                if reply_id == request_id:
+                    return status, detail
+                if status == "failed":
+                    raise WorkerError(f"{self.name} worker failed to start: {detail}")
+                # Anything else is the start-up announcement or a reply nobody waits for any more
+    
+    def stop(self, timeout=2.0):
+        """Ask the process to exit, killing it if it does not"""
+        self.stopped = True
+        if self.process is None:
+            return
+        if self.process.is_alive():
+            try:
+                self.requests.put(None)
+            except (OSError, ValueError):
+                pass
+            self.process.join(timeout)
+            if self.process.is_alive():
+                self.process.terminate()
+                self.process.join(timeout)
+        for q in (self.requests, self.replies):
+            q.close()
+            q.cancel_join_thread()
+
+
+class WorkerSupervisor:
+    """Restarts crashed workers, giving up on one that keeps crashing"""
+    
+    def __init__(self, interval=None, max_restarts=None):
+        """
+        Args:
+            interval: Seconds between liveness checks
+            max_restarts: Crashes within a minute after which a worker stays down
+        """
+        self.interval = interval or Config.WORKER_CHECK_INTERVAL
+        self.max_restarts = max_restarts or Config.WORKER_MAX_RESTARTS
+        self.workers = []
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+    
+    def add(self, worker):
+        """Supervise a started worker"""
+        with self._lock:
+            self.workers.append(worker)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="worker-supervisor", daemon=True)
+                self._thread.start()
+        return worker
+    
+    def remove(self, worker):
+        with self._lock:
+            if worker in self.workers:
+                self.workers.remove(worker)
+    
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            with self._lock:
+                workers = list(self.workers)
+            for worker in workers:
+                try:
+                    self.check(worker)
+                except Exception as e:
+                    print(f"⚠️  Worker supervisor error ({worker.name}): {e}")
+    
+    def check(self, worker):
+        """
+        Restart the worker if its process died
+        
+        Returns:
+            bool: True if it was restarted
+        """
+        if worker.stopped or worker.failed or worker.process is None or worker.is_alive:
+            return False
+        code = worker.process.exitcode
+        if code == _EXIT_FATAL:
+            worker.failed = "could not start"
+            print(f"❌ {worker.name.upper()} worker will not be restarted")
+            return False
+        now = time.monotonic()
+        worker.crashes = [t for t in worker.crashes if now - t < 60] + [now]
+        if len(worker.crashes) > self.max_restarts:
+            worker.failed = f"crashed {len(worker.crashes)} times in a minute"
+            print(f"❌ {worker.name.upper()} worker {worker.failed}, giving up")
+            return False
+        print(f"⚠️  {worker.name.upper()} worker exited (code {code}), restarting")
+        worker.start()
+        worker.restarts += 1
+        WORKER_RESTARTS.inc(worker=worker.name)
+        return True
+    
+    def stop(self):
+        """Stop supervising and shut every worker down"""
+        self._stopped.set()
+        with self._lock:
+            workers, self.workers = self.workers, []
+        for worker in workers:
+            worker.stop()
+
+
+_supervisor = None
+
+
+def get_worker_supervisor():
+    """Get the shared worker supervisor"""
+    global _supervisor
+    if _supervisor is None:
+        _supervisor = WorkerSupervisor()
+        atexit.register(_supervisor.stop)
+    return _supervisor
+
+
+class RemoteRecognizer(BaseRecognizer):
+    """Recognizer backend running in the ASR worker process (preprocessing included)"""
+    
+    preprocesses = True  # the pipeline hands over raw audio
+    
+    def __init__(self, backend=None, timeout=None):
+        """
+        Args:
+            backend: Backend name for the worker, defaults to Config.ASR_BACKEND
+            timeout: Seconds per utterance before the worker is restarted
+        """
+        super().__init__()
+        self.backend = (backend or Config.ASR_BACKEND).lower()
+        self.name = self.backend  # same latency series as the in-process backend
+        self.timeout = timeout or Config.WORKER_ASR_TIMEOUT
+        self.worker = WorkerProcess("asr", _asr_worker, (self.backend,))
+        self._buffer = None
+        self._lock = threading.Lock()
+    
+    def _load(self):
+        get_worker_supervisor().add(self.worker.start())
+    
+    def _buffer_for(self, size):
+        """Shared memory block of at least ``size`` bytes, grown when an utterance needs it"""
+        if self._buffer is None or self._buffer.size < size:
+            old = self._buffer
+            minimum = Config.VAD_MAX_UTTERANCE * Config.CAPTURE_SAMPLE_RATE * 2
+            self._buffer = shared_memory.SharedMemory(create=True, size=max(size, minimum))
+            if old:
+                old.close()
+                old.unlink()
+        return self._buffer
+    
+    def _transcribe(self, audio):
+        data = audio.get_raw_data()
+        with self._lock:
+            buffer = self._buffer_for(len(data))
+            buffer.buf[:len(data)] = data
+            try:
+                status, detail = self.worker.call(
+                    "transcribe", buffer.name, len(data), audio.sample_rate, audio.sample_width,
+                    timeout=self.timeout
+                )
+            except WorkerError as e:
+                raise RecognitionServiceError(str(e)) from e
+        if status == "unknown":
+            raise UnknownSpeechError(detail)
+        if status != "ok":
+            raise RecognitionServiceError(detail)
+        return detail
+    
+    def close(self):
+        """Stop the worker and free the shared memory"""
+        get_worker_supervisor().remove(self.worker)
+        self.worker.stop()
+        with self._lock:
+            if self._buffer:
+                self._buffer.close()
+                self._buffer.unlink()
+                self._buffer = None
+
+
+class RemoteSpeaker:
+    """voice.tts.Speaker interface backed by the TTS worker process"""
+    
+    def __init__(self):
+        self.worker = WorkerProcess("tts", _tts_worker)
+        self.is_speaking = False
+        self.last_stopped = None  # monotonic time playback last ended
+        self._idle = threading.Event()
+        self._idle.set()
+    
+    def start(self):
+        get_worker_supervisor().add(self.worker.start())
+        return self
+    
+    def speak(self, text):
+        """
+        Speak text in the worker, blocking until it finished or was cancelled
+        
+        Returns:
+            bool: True if everything was spoken
+        """
+        self._idle.clear()
+        self.is_speaking = True
+        span = get_tracer().span("speak", worker=self.worker.name)
+        started = time.monotonic()
+        completed = False
+        try:
+            status, detail = self.worker.call("speak", text)
+            if status != "ok":
+                print(f"⚠️  TTS error: {detail}")
+            completed = status == "ok" and bool(detail)
+            return completed
+        except WorkerError as e:
+            print(f"⚠️  {e}")
+            return False
+        finally:
+            span.end(cancelled=not completed)
+            TTS_LATENCY.observe(time.monotonic() - started)
+            self.is_speaking = False
+            self.last_stopped = time.monotonic()
+            self._idle.set()
+    
+    def cancel(self):
+        """Stop playback now and drop texts the worker has not started"""
+        self.worker.send("cancel")
+    
+    def wait_idle(self, timeout=None):
+        """
+        Wait until playback has stopped
+        
+        Returns:
+            bool: True if the speaker is idle
+        """
+        return self._idle.wait(timeout)
+    
+    def close(self):
+        """Stop the worker"""
+        get_worker_supervisor().remove(self.worker)
+        self.worker.stop()